@@ -0,0 +1,79 @@
+#!/usr/bin/env node
+// vue-ssr-render.mjs
+//
+// Render a single Vue SFC to static HTML for accessibility audits.
+// Usage: node vue-ssr-render.mjs <component.vue> <props.json> <out.html>
+// Run with the Vue project as the working directory so its node_modules
+// (vue, @vue/compiler-sfc, typescript) are used.
+
+import { createRequire } from 'node:module'
+import { mkdir, mkdtemp, readFile, rm, writeFile } from 'node:fs/promises'
+import { createHash } from 'node:crypto'
+import path from 'node:path'
+import { pathToFileURL } from 'node:url'
+
+const [componentPath, propsPath, outPath] = process.argv.slice(2)
+if (!componentPath || !propsPath || !outPath) {
+  console.error('Usage: node vue-ssr-render.mjs <component.vue> <props.json> <out.html>')
+  process.exit(1)
+}
+
+const projectRequire = createRequire(path.join(process.cwd(), 'package.json'))
+const { parse, compileScript, compileTemplate } = projectRequire('@vue/compiler-sfc')
+
+const source = await readFile(componentPath, 'utf-8')
+const { descriptor, errors } = parse(source, { filename: componentPath })
+if (errors.length) {
+  console.error(errors.map(String).join('\n'))
+  process.exit(1)
+}
+
+const id = createHash('sha256').update(componentPath).digest('hex').slice(0, 8)
+let code = 'const __sfc__ = {}'
+let lang = 'js'
+
+if (descriptor.script || descriptor.scriptSetup) {
+  const script = compileScript(descriptor, { id, inlineTemplate: true, genDefaultAs: '__sfc__' })
+  code = script.content
+  lang = script.lang || 'js'
+}
+
+// <script setup> inlines its render function; plain <script> needs one attached
+if (descriptor.template && !descriptor.scriptSetup) {
+  const template = compileTemplate({
+    source: descriptor.template.content,
+    filename: componentPath,
+    id
+  })
+  code += `\n${template.code.replace('export function render', 'function render')}\n__sfc__.render = render`
+}
+code += '\nexport default __sfc__\n'
+
+if (lang === 'ts' || lang === 'tsx') {
+  const ts = projectRequire('typescript')
+  code = ts.transpileModule(code, {
+    compilerOptions: { module: ts.ModuleKind.ESNext, target: ts.ScriptTarget.ES2020 }
+  }).outputText
+}
+
+// Write modules inside node_modules so bare 'vue' imports resolve to the project's copy;
+// a fresh directory per run keeps concurrent audits of one component apart
+const workRoot = path.join(process.cwd(), 'node_modules', '.a11y-ssr')
+await mkdir(workRoot, { recursive: true })
+const workDir = await mkdtemp(path.join(workRoot, `${id}-`))
+const props = await readFile(propsPath, 'utf-8')
+await writeFile(path.join(workDir, 'component.mjs'), code)
+await writeFile(path.join(workDir, 'entry.mjs'), `
+import { createSSRApp, h } from 'vue'
+import { renderToString } from 'vue/server-renderer'
+import Component from './component.mjs'
+
+export default () => renderToString(createSSRApp({ render: () => h(Component, ${props}) }))
+`)
+
+try {
+  const { default: render } = await import(pathToFileURL(path.join(workDir, 'entry.mjs')).href)
+  await writeFile(outPath, await render())
+} finally {
+  await rm(workDir, { recursive: true, force: true })
+}
@@ -1,99 +1,281 @@
 import os
 import json
 import asyncio
-from playwright.sync_api import sync_playwright
+import hashlib
+import string
+import tempfile
+import aiofiles
+import orjson
+import requests
+from playwright.async_api import async_playwright
 from agent_controller import AgentController
 
+SSR_RENDER_SCRIPT = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts", "vue-ssr-render.mjs")
+)
+
+# Resolve the axe context in-page, dropping include selectors that no longer match
+AXE_SCOPE_JS = """(include) => {
+  const found = (include || []).filter(
+    target => typeof target[0] === 'string' && document.querySelector(target[0])
+  );
+  return found.length ? {include: found} : document.body;
+}"""
+
+# Harness pages are formatted per audit; only the $-placeholders change
+STATIC_HARNESS_TEMPLATE = string.Template("""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>$component_name Accessibility Test</title>
+  <link href="./vendor/tailwind.min.css" rel="stylesheet">
+</head>
+<body>
+  <div id="app" role="main"><div class="p-4">$markup</div></div>
+</body>
+</html>
+""")
+
+VUE_HARNESS_TEMPLATE = string.Template("""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>$component_name Accessibility Test</title>
+  <script src="./vendor/vue.global.js"></script>
+  <link href="./vendor/tailwind.min.css" rel="stylesheet">
+  <script>
+    // Settled by the app below; the agent awaits it in a single evaluate call
+    window.auditOutcome = new Promise(resolve => { window.reportAudit = resolve; });
+  </script>
+  <script type="module">
+    import { createApp } from 'vue'
+    import Component from './$component_file'
+
+    const app = createApp({
+      template: `<div class="p-4">
+        <Component v-bind="props" />
+      </div>`,
+      components: { Component },
+      data() {
+        return {
+          props: $props_str
+        }
+      },
+      mounted() {
+        // Run accessibility audit once the mounted DOM has painted and the page is idle
+        requestAnimationFrame(() => requestIdleCallback(() => {
+          axe.run(($axe_scope)($include), {
+            runOnly: $run_only
+          }).then(results => {
+            window.reportAudit({ results });
+          }).catch(err => {
+            console.error('Error running accessibility audit:', err);
+            window.reportAudit({ error: err.toString() });
+          });
+        }));
+      }
+    });
+
+    app.mount('#app');
+  </script>
+</head>
+<body>
+  <div id="app" role="main"></div>
+</body>
+</html>
+""")
+
 class AccessibilityAgent:
     """Agent for automated accessibility audits of Vue components"""
 
     WCAG_VERSIONS = ["wcag21a", "wcag21aa", "wcag22a", "wcag22aa"]
 
+    # Pinned third-party assets, downloaded once and served from disk
+    VENDOR_ASSETS = {
+        "vue.global.js": "https://unpkg.com/vue@3/dist/vue.global.js",
+        "tailwind.min.css": "https://unpkg.com/tailwindcss@2.2.19/dist/tailwind.min.css",
+        "axe.min.js": "https://cdnjs.cloudflare.com/ajax/libs/axe-core/4.7.0/axe.min.js"
+    }
+
+    # axe rule IDs (exact or prefix) a single-file LLM edit can realistically fix;
+    # rules like color-contrast or region need design or layout changes instead
+    FIXABLE_RULE_PREFIXES = (
+        "image-alt", "label", "button-name", "link-name", "aria-",
+        "html-has-lang", "document-title"
+    )
+
+    # Resources that don't influence axe results; stylesheets stay enabled for color-contrast
+    BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
     def __init__(self):
         """Initialize accessibility agent"""
         self.c = AgentController()
         self.project_dir = os.getenv("VUE_PROJECT_DIR", os.path.expanduser("~/vue-project"))
         self.results_dir = os.path.join(self.project_dir, "tests", "accessibility")
+        self.component_dir = os.path.join(self.project_dir, "src", "components")
         os.makedirs(self.results_dir, exist_ok=True)
+        self.cache_dir = os.path.join(self.results_dir, "cache")
+        self.report_cache_dir = os.path.join(self.cache_dir, "reports")
+        os.makedirs(self.report_cache_dir, exist_ok=True)
+        self._pending_reports = {}
+        self.vendor_dir = os.path.join(self.results_dir, "vendor")
+        self._ensure_vendor_assets()
+        self._playwright = None
+        self._browser = None
+        self._axe_source = None
+        self._browser_lock = asyncio.Lock()
+        # Bound concurrent browser contexts and in-flight LLM requests separately
+        self._browser_semaphore = asyncio.Semaphore(os.cpu_count() or 4)
+        self._llm_semaphore = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "4")))
+        # SSR renders each fork a node process; monitor_accessibility would otherwise start them all at once
+        self._render_semaphore = asyncio.Semaphore(os.cpu_count() or 4)
+
+    def _ensure_vendor_assets(self):
+        """Download pinned harness assets if they aren't cached yet"""
+        os.makedirs(self.vendor_dir, exist_ok=True)
+        for filename, url in self.VENDOR_ASSETS.items():
+            asset_path = os.path.join(self.vendor_dir, filename)
+            if os.path.exists(asset_path):
+                continue
+            print(f"Downloading {url}")
+            try:
+                response = requests.get(url, timeout=30)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                print(f"Could not download {filename}: {e}")
+                continue
+            with open(asset_path, "wb") as f:
+                f.write(response.content)
+
+    async def _ensure_browser(self):
+        """Launch the shared Chromium instance on first use"""
+        async with self._browser_lock:
+            if self._browser is None:
+                axe_path = os.path.join(self.vendor_dir, "axe.min.js")
+                if os.path.exists(axe_path):
+                    with open(axe_path, "r") as f:
+                        self._axe_source = f.read()
+                self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(
+                    args=["--disable-gpu", "--disable-dev-shm-usage", "--no-sandbox"]
+                )
+        return self._browser
+
+    async def _new_audit_context(self):
+        """Create an isolated browser context with axe-core available on every page"""
+        browser = await self._ensure_browser()
+        context = await browser.new_context()
+        if self._axe_source:
+            await context.add_init_script(script=self._axe_source)
+        return context
+
+    async def close(self):
+        """Shut down the shared browser"""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _block_static_assets(self, route):
+        """Abort requests for assets irrelevant to the audit"""
+        if route.request.resource_type in self.BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _audit_cache_path(self, component_file, props, axe_options):
+        """Cache file for an audit keyed by component source, props and axe scope"""
+        if not os.path.exists(component_file):
+            return None
+        digest = hashlib.sha256()
+        with open(component_file, "rb") as f:
+            digest.update(f.read())
+        digest.update(json.dumps(props or {}, sort_keys=True).encode())
+        digest.update(json.dumps(axe_options, sort_keys=True).encode())
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}.json")
+
+    async def _render_static_markup(self, component_name, component_path, props):
+        """Server-render the component to HTML via scripts/vue-ssr-render.mjs"""
+        async with self._render_semaphore:
+            return await self._run_ssr_render(component_name, component_path, props)
+
+    async def _run_ssr_render(self, component_name, component_path, props):
+        # Per-call files, so concurrent audits of one component don't overwrite each other
+        with tempfile.TemporaryDirectory(prefix=f"{component_name}_a11y_", dir=self.results_dir) as tmp_dir:
+            props_path = os.path.join(tmp_dir, "props.json")
+            out_path = os.path.join(tmp_dir, "ssr.html")
+            with open(props_path, "w") as f:
+                json.dump(props or {}, f)
 
-    async def audit_component(self, component_name, props=None, standard="wcag21aa"):
-        """Run accessibility audit on component"""
-        print(f"Auditing component: {component_name} against {standard}")
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    "node", SSR_RENDER_SCRIPT, component_path, props_path, out_path,
+                    cwd=self.project_dir,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            except FileNotFoundError:
+                print("Node.js not found, falling back to the Vue harness")
+                return None
+
+            _, stderr = await process.communicate()
+            if process.returncode != 0:
+                print(f"SSR render failed for {component_name}, falling back to the Vue harness: {stderr.decode().strip()}")
+                return None
+
+            with open(out_path, "r") as f:
+                return f.read()
+
+    async def audit_component(self, component_name, props=None, standard="wcag21aa", rules=None, include=None):
+        """Run accessibility audit on component, optionally limited to axe rule IDs and node targets"""
+        print(f"Auditing component: {component_name} against {rules or standard}")
 
         if standard not in self.WCAG_VERSIONS:
             print(f"Unsupported standard: {standard}. Using wcag21aa instead.")
             standard = "wcag21aa"
 
+        # Scope axe to the requested rules, or to every rule tagged with the standard
+        if rules:
+            run_only = {"type": "rule", "values": sorted(rules)}
+        else:
+            run_only = {"type": "tag", "values": [standard]}
+
         # Create test harness HTML for the component
         component_file = f"src/components/{component_name}.vue"
+        # component_file is relative to project_dir; reads and the SSR render need the real path
+        component_path = os.path.join(self.component_dir, f"{component_name}.vue")
 
-        # Generate component props
-        props_str = "{}"
-        if props:
-            props_str = "{"
-            for key, value in props.items():
-                if isinstance(value, str):
-                    props_str += f"{key}: '{value}', "
-                else:
-                    props_str += f"{key}: {value}, "
-            props_str += "}"
-
-        # Create HTML file with axe-core for accessibility testing
-        test_html = f"""
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-          <meta charset="UTF-8">
-          <meta name="viewport" content="width=device-width, initial-scale=1.0">
-          <title>{component_name} Accessibility Test</title>
-          <script src="https://unpkg.com/vue@3/dist/vue.global.js"></script>
-          <link href="https://unpkg.com/tailwindcss@2.2.19/dist/tailwind.min.css" rel="stylesheet">
-          <script src="https://cdnjs.cloudflare.com/ajax/libs/axe-core/4.7.0/axe.min.js"></script>
-          <script type="module">
-            import {{ createApp }} from 'vue'
-            import Component from './{component_file}'
-
-            window.auditResults = null;
-            window.auditComplete = false;
-
-            const app = createApp({{
-              template: `<div class="p-4">
-                <Component v-bind="props" />
-              </div>`,
-              components: {{ Component }},
-              data() {{
-                return {{
-                  props: {props_str}
-                }}
-              }},
-              mounted() {{
-                // Run accessibility audit after component is mounted
-                setTimeout(() => {{
-                  axe.run(document.body, {{
-                    runOnly: {{
-                      type: 'tag',
-                      values: ['{standard}']
-                    }}
-                  }}).then(results => {{
-                    window.auditResults = results;
-                    window.auditComplete = true;
-                  }}).catch(err => {{
-                    console.error('Error running accessibility audit:', err);
-                    window.auditError = err.toString();
-                    window.auditComplete = true;
-                  }});
-                }}, 500);
-              }}
-            }});
-
-            app.mount('#app');
-          </script>
-        </head>
-        <body>
-          <div id="app" role="main"></div>
-        </body>
-        </html>
-        """
+        # Reuse the previous audit if nothing about the input changed
+        cache_path = self._audit_cache_path(component_path, props, {"runOnly": run_only, "include": include})
+        if cache_path and os.path.exists(cache_path):
+            print(f"Using cached accessibility audit for {component_name}")
+            async with aiofiles.open(cache_path, "rb") as f:
+                return orjson.loads(await f.read())
+
+        # Generate component props (JSON is a valid JS object literal)
+        props_str = json.dumps(props or {}, ensure_ascii=False)
+
+        # Prefer a server-rendered snapshot so axe can run without booting Vue
+        markup = await self._render_static_markup(component_name, component_path, props)
+
+        if markup is not None:
+            test_html = STATIC_HARNESS_TEMPLATE.substitute(component_name=component_name, markup=markup)
+        else:
+            # Create HTML file with axe-core for accessibility testing
+            test_html = VUE_HARNESS_TEMPLATE.substitute(
+                component_name=component_name,
+                component_file=component_file,
+                props_str=props_str,
+                run_only=json.dumps(run_only),
+                axe_scope=AXE_SCOPE_JS,
+                include=json.dumps(include)
+            )
 
         # Write test file
         test_path = os.path.join(self.results_dir, f"{component_name}_a11y_test.html")
@@ -102,21 +284,28 @@ class AccessibilityAgent:
 
         results = {}
 
-        # Run accessibility audit with Playwright
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
+        # Run accessibility audit in a fresh context on the shared browser
+        async with self._browser_semaphore:
+            context = await self._new_audit_context()
+            page = await context.new_page()
+            await page.route("**/*", self._block_static_assets)
 
             # Navigate to test page
-            page.goto(f"file://{test_path}")
+            await page.goto(f"file://{test_path}")
 
-            # Wait for audit to complete
             try:
-                page.wait_for_function("window.auditComplete === true", timeout=30000)
-
-                # Get audit results
-                audit_results = page.evaluate("() => window.auditResults")
-                audit_error = page.evaluate("() => window.auditError")
+                if markup is not None:
+                    # Static DOM is ready as soon as the page loads
+                    audit_error = None
+                    audit_results = await page.evaluate(
+                        f"([runOnly, include]) => axe.run(({AXE_SCOPE_JS})(include), {{runOnly}})",
+                        [run_only, include]
+                    )
+                else:
+                    # Await the harness promise in one round-trip instead of polling
+                    outcome = await asyncio.wait_for(page.evaluate("() => window.auditOutcome"), timeout=15)
+                    audit_results = outcome.get("results")
+                    audit_error = outcome.get("error")
 
                 if audit_error:
                     results = {
@@ -131,19 +320,19 @@ class AccessibilityAgent:
                     "error": str(e),
                     "status": "error"
                 }
-
-            browser.close()
+            finally:
+                await context.close()
 
         # Save results
         result_path = os.path.join(self.results_dir, f"{component_name}_a11y_results.json")
-        with open(result_path, "w") as f:
-            json.dump(results, f, indent=2)
+        async with aiofiles.open(result_path, "wb") as f:
+            await f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
 
         # Generate accessibility report
-        report = await self._generate_accessibility_report(results)
+        report = await self._shared_accessibility_report(results)
 
         print(f"Accessibility audit complete for {component_name}")
-        return {
+        audit = {
             "results": results,
             "report": report,
             "result_path": result_path,
@@ -151,6 +340,39 @@ class AccessibilityAgent:
             "passes_count": len(results.get("passes", []))
         }
 
+        # Only cache successful runs so transient failures are retried
+        if cache_path and "error" not in results:
+            async with aiofiles.open(cache_path, "wb") as f:
+                await f.write(orjson.dumps(audit))
+
+        return audit
+
+    async def _shared_accessibility_report(self, audit_results):
+        """Reuse one AI report for every audit with the same set of violated rules"""
+        if "error" in audit_results:
+            return await self._generate_accessibility_report(audit_results)
+
+        rule_ids = sorted(violation.get("id", "") for violation in audit_results.get("violations", []))
+        fingerprint = hashlib.sha256(orjson.dumps(rule_ids)).hexdigest()
+        report_path = os.path.join(self.report_cache_dir, f"{fingerprint}.md")
+
+        if os.path.exists(report_path):
+            async with aiofiles.open(report_path, "r") as f:
+                return await f.read()
+
+        # Concurrent audits with the same fingerprint wait on a single LLM request
+        task = self._pending_reports.get(fingerprint)
+        if task is None:
+            task = asyncio.ensure_future(self._generate_accessibility_report(audit_results))
+            self._pending_reports[fingerprint] = task
+        try:
+            report = await task
+            async with aiofiles.open(report_path, "w") as f:
+                await f.write(report)
+        finally:
+            self._pending_reports.pop(fingerprint, None)
+        return report
+
     async def _generate_accessibility_report(self, audit_results):
         """Generate AI analysis of accessibility issues"""
         print("Generating accessibility report")
@@ -160,16 +382,17 @@ class AccessibilityAgent:
 
         # Format violations for the prompt
         violations = audit_results.get("violations", [])
-        violations_text = ""
+        parts = []
 
         for i, violation in enumerate(violations[:10]):  # Limit to 10 violations for prompt length
-            violations_text += f"{i+1}. {violation.get('id', 'Unknown')} - {violation.get('description', 'No description')}\n"
-            violations_text += f"   Impact: {violation.get('impact', 'unknown')}\n"
-            violations_text += f"   Help: {violation.get('help', 'No help available')}\n"
-            violations_text += f"   Occurrences: {len(violation.get('nodes', []))}\n\n"
+            parts.append(
+                f"{i+1}. {violation.get('id', 'Unknown')} - {violation.get('description', 'No description')}\n"
+                f"   Impact: {violation.get('impact', 'unknown')}\n"
+                f"   Help: {violation.get('help', 'No help available')}\n"
+                f"   Occurrences: {len(violation.get('nodes', []))}\n\n"
+            )
 
-        if not violations:
-            violations_text = "No accessibility violations detected."
+        violations_text = "".join(parts) if violations else "No accessibility violations detected."
 
         # Get pass count by category
         passes = audit_results.get("passes", [])
@@ -192,7 +415,8 @@ class AccessibilityAgent:
         4. Best practices for ensuring accessibility in Vue components
         """
 
-        report = await self.c.c.complete(prompt, max_tokens=1000)
+        async with self._llm_semaphore:
+            report = await self.c.c.complete(prompt, max_tokens=1000)
         return report
 
     async def generate_accessibility_report(self, component_name, audit_results):
@@ -233,8 +457,8 @@ class AccessibilityAgent:
 
         # Export report to JSON
         report_path = os.path.join(self.results_dir, f"{component_name}_accessibility_report.json")
-        with open(report_path, "w") as f:
-            json.dump(report, f, indent=2)
+        async with aiofiles.open(report_path, "wb") as f:
+            await f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
 
         print(f"Accessibility report generated: {report_path}")
         return report
@@ -264,20 +488,35 @@ class AccessibilityAgent:
                 "fixed_issues": 0
             }
 
+        # Skip the LLM call and re-audit when nothing is structurally fixable
+        if not any(violation.get("id", "").startswith(self.FIXABLE_RULE_PREFIXES) for violation in violations):
+            print(f"Remaining issues in {component_name} can't be fixed by editing the component")
+            return {
+                "status": "unfixable_by_llm",
+                "original_issues": original_issues,
+                "fixed_issues": 0,
+                "remaining_issues": original_issues,
+                "report": "No violations are of a rule type that can be fixed by editing the component."
+            }
+
         # Format violations for the prompt
-        violations_text = ""
+        parts = []
         for i, violation in enumerate(violations):
-            violations_text += f"{i+1}. {violation.get('id', 'Unknown')} - {violation.get('description', 'No description')}\n"
-            violations_text += f"   Impact: {violation.get('impact', 'unknown')}\n"
-            violations_text += f"   Help: {violation.get('help', 'No help available')}\n"
+            parts.append(
+                f"{i+1}. {violation.get('id', 'Unknown')} - {violation.get('description', 'No description')}\n"
+                f"   Impact: {violation.get('impact', 'unknown')}\n"
+                f"   Help: {violation.get('help', 'No help available')}\n"
+            )
 
             # Include specific element issues
             for j, node in enumerate(violation.get('nodes', [])[:3]):  # Limit to 3 examples per violation
-                violations_text += f"   Element {j+1}: {node.get('html', 'Unknown element')}\n"
+                parts.append(f"   Element {j+1}: {node.get('html', 'Unknown element')}\n")
                 if "failureSummary" in node:
-                    violations_text += f"   Failure: {node.get('failureSummary', '')}\n"
+                    parts.append(f"   Failure: {node.get('failureSummary', '')}\n")
 
-            violations_text += "\n"
+            parts.append("\n")
+
+        violations_text = "".join(parts)
 
         # Generate fixed code
         prompt = f"""
@@ -296,15 +535,27 @@ class AccessibilityAgent:
         Maintain all functionality and styling while making the component accessible.
         """
 
-        fixed_code = await self.c.c.complete(prompt, max_tokens=2500)
-
-        # Create temporary file for testing the fix
+        # Stream the fix into a temporary component while the browser warms up
         temp_component_path = f"src/components/{component_name}_a11y_fixed.vue"
-        with open(temp_component_path, "w") as f:
-            f.write(fixed_code)
-
-        # Re-run audit to verify fix
-        fixed_audit = await self.audit_component(f"{component_name}_a11y_fixed")
+        async with self._llm_semaphore:
+            fixed_code, _ = await asyncio.gather(
+                self._stream_completion_to_file(prompt, temp_component_path, max_tokens=2500),
+                self._ensure_browser()
+            )
+
+        # Re-run audit to verify fix, checking only the rules and nodes that failed before
+        failed_rules = {violation["id"] for violation in violations if "id" in violation}
+        failed_targets = [
+            node["target"]
+            for violation in violations
+            for node in violation.get("nodes", [])
+            if node.get("target")
+        ]
+        fixed_audit = await self.audit_component(
+            f"{component_name}_a11y_fixed",
+            rules=failed_rules or None,
+            include=failed_targets or None
+        )
         fixed_violations = fixed_audit["results"].get("violations", [])
         fixed_issues = original_issues - len(fixed_violations)
 
@@ -334,6 +585,19 @@ class AccessibilityAgent:
             "report": compliance_report
         }
 
+    async def _stream_completion_to_file(self, prompt, path, max_tokens):
+        """Write an LLM completion to disk as it arrives and return the full text"""
+        chunks = []
+        async with aiofiles.open(path, "w") as f:
+            if hasattr(self.c.c, "complete_stream"):
+                async for chunk in self.c.c.complete_stream(prompt, max_tokens=max_tokens):
+                    chunks.append(chunk)
+                    await f.write(chunk)
+            else:
+                chunks.append(await self.c.c.complete(prompt, max_tokens=max_tokens))
+                await f.write(chunks[0])
+        return "".join(chunks)
+
     async def _generate_compliance_report(self, original_issues, remaining_issues, component_name):
         """Generate AI compliance report"""
         print("Generating compliance report")
@@ -355,7 +619,8 @@ class AccessibilityAgent:
         4. Compliance status with WCAG standards
         """
 
-        report = await self.c.c.complete(prompt, max_tokens=800)
+        async with self._llm_semaphore:
+            report = await self.c.c.complete(prompt, max_tokens=800)
         return report
 
     async def monitor_accessibility(self):
@@ -363,40 +628,47 @@ class AccessibilityAgent:
         print("Starting accessibility monitoring")
 
         # Find all Vue components
-        component_dir = os.path.join(self.project_dir, "src", "components")
-        if not os.path.exists(component_dir):
-            print(f"Component directory not found: {component_dir}")
+        if not os.path.isdir(self.component_dir):
+            print(f"Component directory not found: {self.component_dir}")
             return {
                 "status": "error",
                 "message": "Component directory not found"
             }
 
-        components = [
-            os.path.basename(f).replace(".vue", "")
-            for f in os.listdir(component_dir)
-            if f.endswith(".vue")
-        ]
+        # scandir yields file types from the directory listing without extra stat calls
+        with os.scandir(self.component_dir) as entries:
+            components = [
+                entry.name[:-len(".vue")]
+                for entry in entries
+                if entry.name.endswith(".vue") and entry.is_file()
+            ]
 
         results = {}
         components_with_issues = []
 
-        # Audit each component
-        for component in components:
+        async def audit(component):
             print(f"Monitoring component: {component}")
-            audit = await self.audit_component(component)
+            return component, await self.audit_component(component)
+
+        # Audit components concurrently, each in its own browser context
+        audits = dict(await asyncio.gather(*[audit(component) for component in components]))
+        for component, audit_result in audits.items():
             results[component] = {
-                "violations_count": audit["violations_count"],
-                "passes_count": audit["passes_count"]
+                "violations_count": audit_result["violations_count"],
+                "passes_count": audit_result["passes_count"]
             }
 
-            if audit["violations_count"] > 0:
+            if audit_result["violations_count"] > 0:
                 components_with_issues.append(component)
 
         # Fix issues automatically
         if components_with_issues:
             print(f"Found {len(components_with_issues)} components with accessibility issues")
-            for component in components_with_issues:
-                await self.fix_accessibility_issues(component)
+            # Reuse the audits above so LLM fix requests go out together
+            await asyncio.gather(*[
+                self.fix_accessibility_issues(component, audits[component]["results"])
+                for component in components_with_issues
+            ])
 
         return {
             "status": "completed",
@@ -449,6 +721,12 @@ if __name__ == "__main__":
 
         command = sys.argv[1]
 
+        try:
+            await run_command(agent, command)
+        finally:
+            await agent.close()
+
+    async def run_command(agent, command):
         if command == "audit":
             if len(sys.argv) < 3:
                 print("Usage: python accessibility_agent.py audit [component_name]")
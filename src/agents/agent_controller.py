@@ -1,42 +1,155 @@
 import importlib
+import functools
+
+
+@functools.cache
+def _load_continue():
+    """Import the Continue client lazily so CLI startup and helper imports stay cheap"""
+    try:
+        return (
+            importlib.import_module("continue.api").Continue,
+            importlib.import_module("continue.plugins").CodebaseContext,
+        )
+    except ModuleNotFoundError:
+        class Continue:
+            async def complete(self, *args, **kwargs):
+                raise RuntimeError("Continue package is not installed")
+
+        class CodebaseContext:
+            def __init__(self, *args, **kwargs):
+                raise RuntimeError("Continue package is not installed")
+
+        return Continue, CodebaseContext
+
 
-try:
-    Continue = importlib.import_module("continue.api").Continue
-    CodebaseContext = importlib.import_module("continue.plugins").CodebaseContext
-except ModuleNotFoundError:
-    class Continue:
-        async def complete(self, *args, **kwargs):
-            raise RuntimeError("Continue package is not installed")
-
-    class CodebaseContext:
-        def __init__(self, *args, **kwargs):
-            raise RuntimeError("Continue package is not installed")
 from verification.orchestrator import VerificationPipeline
+from .rate_limiter import AsyncRateLimiter
+from .context_cache import CachedContext
 from .prompt_templates import (
+    COMPONENT_TEMPLATE,
     NEW_COMPONENT_TEMPLATE,
     PINIA_STORE_TEMPLATE,
     API_SERVICE_TEMPLATE,
     ROUTER_CONFIG_TEMPLATE,
     DEBUG_TEMPLATE,
+    FIX_API_TEMPLATE,
+    LINT_TEMPLATE,
+    REFACTOR_TEMPLATE,
+    STRICT_TYPESCRIPT_TEMPLATE,
+    INLINE_COMMENTS_TEMPLATE,
+    TSDOC_TEMPLATE,
+    SUMMARIZE_TEMPLATE,
 )
-import subprocess
 import os
-import requests
+import shlex
+import hashlib
+import sqlite3
+import orjson
 import json
 import asyncio
 
 class AgentController:
     def __init__(self):
         """Initialize agent controller with Continue API"""
+        Continue, CodebaseContext = _load_continue()
         self.c = Continue()
-        self.code_context = CodebaseContext(n_retrieve=10)
+        cache_dir = os.getenv("ALEPH_CACHE_DIR", ".aleph-cache")
+        # Retrievals are reused until the project's HEAD or working tree changes
+        self.code_context = CachedContext(
+            CodebaseContext(n_retrieve=10),
+            cache_dir=cache_dir,
+            project_dir=os.getenv("VUE_PROJECT_DIR", os.path.expanduser("~/vue-project"))
+        )
         self.verifier = VerificationPipeline()
         self.git_agents = {}  # repo_url: GitAgent
 
+        # Cap in-flight LLM requests (AGENT_LLM_CONCURRENCY). Pacing is off by default; set
+        # AGENT_LLM_RPM to the backend's requests-per-minute limit for rate-limited providers
+        self._llm_limiter = AsyncRateLimiter(
+            rpm=float(os.getenv("AGENT_LLM_RPM", "0")),
+            max_concurrency=int(os.getenv("AGENT_LLM_CONCURRENCY", "8"))
+        )
+
+        # Exact-match completion cache, persisted across runs
+        self._exact_cache = {}
+        self._cache_db = sqlite3.connect(os.path.join(cache_dir, "completions.sqlite"))
+        self._cache_db.execute(
+            "CREATE TABLE IF NOT EXISTS completions (key TEXT PRIMARY KEY, response TEXT)"
+        )
+
+    async def aclose(self):
+        """Close the completion cache and context cache"""
+        self._cache_db.close()
+        self.code_context.close()
+
+    async def _edit(self, **kwargs):
+        """Run a Continue edit under the LLM concurrency limit"""
+        async with self._llm_limiter:
+            return await self.c.edit(**kwargs)
+
+    async def _complete(self, prompt, **kwargs):
+        """Run a Continue completion under the LLM concurrency limit, reusing cached responses"""
+        return "".join([chunk async for chunk in self._stream_complete(prompt, **kwargs)])
+
+    async def _stream_complete(self, prompt, **kwargs):
+        """Yield completion chunks as they arrive; cached responses come back as one chunk"""
+        key = hashlib.blake2b(
+            prompt.encode() + json.dumps(kwargs, sort_keys=True).encode()
+        ).hexdigest()
+        if key in self._exact_cache:
+            yield self._exact_cache[key]
+            return
+        row = self._cache_db.execute(
+            "SELECT response FROM completions WHERE key = ?", (key,)
+        ).fetchone()
+        if row:
+            self._exact_cache[key] = row[0]
+            yield row[0]
+            return
+
+        chunks = []
+        async with self._llm_limiter:
+            if hasattr(self.c, "complete_stream"):
+                async for chunk in self.c.complete_stream(prompt, **kwargs):
+                    chunks.append(chunk)
+                    yield chunk
+            else:
+                chunks.append(await self.c.complete(prompt, **kwargs))
+                yield chunks[0]
+
+        response = "".join(chunks)
+        self._exact_cache[key] = response
+        self._cache_db.execute(
+            "INSERT OR REPLACE INTO completions (key, response) VALUES (?, ?)", (key, response)
+        )
+        self._cache_db.commit()
+
+    def _spec_prompt(self, template, spec):
+        """Fill a generation template's spec slot with the JSON-encoded per-call values"""
+        return template.format(spec=orjson.dumps(spec, default=str).decode())
+
+    async def generate_many(self, specs):
+        """Run several generate_* specs concurrently, e.g. [{"kind": "pinia_store", "name": ...}]"""
+        return await asyncio.gather(*(self._dispatch(spec) for spec in specs))
+
+    async def _dispatch(self, spec):
+        """Route a generation spec to the matching generator"""
+        generators = {
+            "component": self.generate_component,
+            "vue_component": self.generate_vue_component,
+            "pinia_store": self.generate_pinia_store,
+            "api_service": self.generate_api_service,
+            "router": self.configure_vue_router,
+        }
+        kind = spec.get("kind")
+        if kind not in generators:
+            raise ValueError(f"Unknown generation kind: {kind}")
+        return await generators[kind](**{key: value for key, value in spec.items() if key != "kind"})
+
     async def refactor_component(self, component_path):
         """Refactor Vue component to Composition API"""
         print(f"Refactoring component: {component_path}")
-        await self.c.edit(
+        await self._edit(
             filepath=component_path,
             prompt="Refactor this component to use Vue 3 Composition API with TypeScript",
             context=[self.code_context]
@@ -49,21 +162,9 @@ class AgentController:
         component_path = f"src/components/{component_name}.vue"
         os.makedirs(os.path.dirname(component_path), exist_ok=True)
 
-        props_str = ", ".join(props) if isinstance(props, list) else props
-
-        prompt = f"""
-        Create Vue3 component with:
-        - Composition API
-        - TypeScript
-        - Tailwind styling
-        - Props: {props_str}
-        - Emit events for user interactions
-        - Ensure <script> comes before <template>
-        - Avoid <style> unless absolutely necessary
-        - Place all type definitions in ./types folder
-        """
+        prompt = self._spec_prompt(COMPONENT_TEMPLATE, {"name": component_name, "props": props})
 
-        await self.c.edit(
+        await self._edit(
             filepath=component_path,
             prompt=prompt,
             context=[self.code_context]
@@ -77,15 +178,15 @@ class AgentController:
         component_path = f"src/components/{name}.vue"
         os.makedirs(os.path.dirname(component_path), exist_ok=True)
 
-        prompt = NEW_COMPONENT_TEMPLATE.format(
-            name=name,
-            props=props or {},
-            emits=emits or [],
-            slots=slots or [],
-            description=description,
-        )
+        prompt = self._spec_prompt(NEW_COMPONENT_TEMPLATE, {
+            "name": name,
+            "props": props or {},
+            "emits": emits or [],
+            "slots": slots or [],
+            "description": description,
+        })
 
-        await self.c.edit(
+        await self._edit(
             filepath=component_path,
             prompt=prompt,
             context=[self.code_context],
@@ -99,15 +200,15 @@ class AgentController:
         store_path = f"src/stores/{name}.ts"
         os.makedirs(os.path.dirname(store_path), exist_ok=True)
 
-        prompt = PINIA_STORE_TEMPLATE.format(
-            name=name,
-            store_type=store_type,
-            state=state_definition,
-            getters=getters or {},
-            actions=actions or {},
-        )
+        prompt = self._spec_prompt(PINIA_STORE_TEMPLATE, {
+            "name": name,
+            "store_type": store_type,
+            "state": state_definition,
+            "getters": getters or {},
+            "actions": actions or {},
+        })
 
-        await self.c.edit(
+        await self._edit(
             filepath=store_path,
             prompt=prompt,
             context=[self.code_context],
@@ -121,9 +222,9 @@ class AgentController:
         service_path = f"src/services/{service_name}.ts"
         os.makedirs(os.path.dirname(service_path), exist_ok=True)
 
-        prompt = API_SERVICE_TEMPLATE.format(name=service_name, endpoints=endpoints)
+        prompt = self._spec_prompt(API_SERVICE_TEMPLATE, {"name": service_name, "endpoints": endpoints})
 
-        await self.c.edit(
+        await self._edit(
             filepath=service_path,
             prompt=prompt,
             context=[self.code_context],
@@ -135,9 +236,9 @@ class AgentController:
     async def configure_vue_router(self, routes):
         """Update Vue Router configuration"""
         router_path = "src/router/index.ts"
-        prompt = ROUTER_CONFIG_TEMPLATE.format(routes=routes)
+        prompt = self._spec_prompt(ROUTER_CONFIG_TEMPLATE, {"routes": routes})
 
-        await self.c.edit(
+        await self._edit(
             filepath=router_path,
             prompt=prompt,
             context=[self.code_context],
@@ -149,57 +250,63 @@ class AgentController:
     async def debug_code(self, code_snippet, error_message="", context=""):
         """Use LLM to debug code snippet"""
         prompt = DEBUG_TEMPLATE.format(code=code_snippet, error=error_message, context=context)
-        return await self.c.complete(prompt, max_tokens=800)
+        return await self._complete(prompt, max_tokens=800)
+
+    async def debug_code_stream(self, code_snippet, error_message="", context=""):
+        """Stream an LLM debugging suggestion for a code snippet"""
+        prompt = DEBUG_TEMPLATE.format(code=code_snippet, error=error_message, context=context)
+        async for chunk in self._stream_complete(prompt, max_tokens=800):
+            yield chunk
 
     async def fix_api_issue(self, service_file_content, problem_description):
         """Diagnose and fix API service issues"""
-        prompt = f"""{problem_description}\n\n{service_file_content}\nProvide a corrected version."""
-        return await self.c.complete(prompt, max_tokens=1200)
+        prompt = FIX_API_TEMPLATE.format(problem=problem_description, code=service_file_content)
+        return await self._complete(prompt, max_tokens=1200)
 
     async def lint_and_fix(self, file_content):
         """Fix ESLint issues in provided code"""
-        prompt = f"Lint and fix the following code according to project ESLint rules:\n{file_content}"
-        return await self.c.complete(prompt, max_tokens=800)
+        prompt = LINT_TEMPLATE.format(code=file_content)
+        return await self._complete(prompt, max_tokens=800)
 
     async def refactor_code(self, code_snippet, refactor_goal=""):
         """Refactor code for readability and maintain strict typing"""
-        prompt = f"Refactor the following code to {refactor_goal} while keeping strict TypeScript:\n{code_snippet}"
-        return await self.c.complete(prompt, max_tokens=1200)
+        prompt = REFACTOR_TEMPLATE.format(goal=refactor_goal, code=code_snippet)
+        return await self._complete(prompt, max_tokens=1200)
 
     async def enforce_strict_typescript(self, code_snippet):
         """Convert JavaScript code to strict TypeScript"""
-        prompt = f"Convert this code to strict TypeScript without using 'any':\n{code_snippet}"
-        return await self.c.complete(prompt, max_tokens=1200)
+        prompt = STRICT_TYPESCRIPT_TEMPLATE.format(code=code_snippet)
+        return await self._complete(prompt, max_tokens=1200)
 
     async def add_inline_comments(self, code_snippet):
         """Add inline comments to code"""
-        prompt = f"Add concise inline comments to the following code:\n{code_snippet}"
-        return await self.c.complete(prompt, max_tokens=600)
+        prompt = INLINE_COMMENTS_TEMPLATE.format(code=code_snippet)
+        return await self._complete(prompt, max_tokens=600)
 
     async def generate_tsdoc(self, code_snippet, element_type):
         """Generate TSDoc comments"""
-        prompt = f"Generate TSDoc comments for this {element_type}:\n{code_snippet}"
-        return await self.c.complete(prompt, max_tokens=800)
+        prompt = TSDOC_TEMPLATE.format(element_type=element_type, code=code_snippet)
+        return await self._complete(prompt, max_tokens=800)
 
     async def generate_readme_section(self, section_name, project_context):
         """Generate README section"""
         prompt = f"Write the {section_name} section of the README using this context:\n{project_context}"
-        return await self.c.complete(prompt, max_tokens=1000)
+        return await self._complete(prompt, max_tokens=1000)
 
     async def explain_task_implementation(self, high_level_task, current_codebase_context):
         """Explain how to implement a high-level task"""
         prompt = f"Explain how to implement the following task in code:\n{high_level_task}\nContext:\n{current_codebase_context}"
-        return await self.c.complete(prompt, max_tokens=1000)
+        return await self._complete(prompt, max_tokens=1000)
 
     async def generate_task_code_snippet(self, feature_description, component_context=""):
         """Generate code snippet for a task"""
         prompt = f"Generate code to implement this feature:\n{feature_description}\nContext:\n{component_context}"
-        return await self.c.complete(prompt, max_tokens=1000)
+        return await self._complete(prompt, max_tokens=1000)
 
     async def summarize_code_for_task(self, code_snippet, purpose=""):
         """Summarize existing code for task updates"""
-        prompt = f"Summarize the following code for {purpose}:\n{code_snippet}"
-        return await self.c.complete(prompt, max_tokens=800)
+        prompt = SUMMARIZE_TEMPLATE.format(purpose=purpose, code=code_snippet)
+        return await self._complete(prompt, max_tokens=800)
 
     async def run_tests(self):
         """Run project tests"""
@@ -209,12 +316,12 @@ class AgentController:
     async def run_command(self, command):
         """Execute shell command"""
         print(f"Running command: {command}")
-        process = subprocess.Popen(
-            command.split(),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+        process = await asyncio.create_subprocess_exec(
+            *shlex.split(command),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
-        stdout, stderr = process.communicate()
+        stdout, stderr = await process.communicate()
         if process.returncode != 0:
             print(f"Command failed: {stderr.decode()}")
             raise Exception(f"Command failed: {stderr.decode()}")
@@ -223,16 +330,18 @@ class AgentController:
     async def setup_new_feature(self, feature_name):
         """End-to-end feature setup"""
         print(f"Setting up new feature: {feature_name}")
+        # Sequential: both take ref and index locks, so running them together can fail on .git/*.lock
+        await self.run_command("git fetch --prune")
         await self.run_command(f"git checkout -b feature/{feature_name}")
 
-        # Generate view component
-        await self.generate_component(f"{feature_name}View", ["user", "settings"])
-
-        # Update router
-        await self.c.edit(
-            filepath="src/router/index.ts",
-            prompt=f"Add route for /{feature_name.lower()} pointing to {feature_name}View",
-            context=[self.code_context]
+        # Generate view component and update router (independent edits)
+        await asyncio.gather(
+            self.generate_component(f"{feature_name}View", ["user", "settings"]),
+            self._edit(
+                filepath="src/router/index.ts",
+                prompt=f"Add route for /{feature_name.lower()} pointing to {feature_name}View",
+                context=[self.code_context]
+            )
         )
 
         # Run tests
@@ -250,27 +359,31 @@ class AgentController:
         """Run CI/CD pipeline"""
         print("Running CI/CD pipeline...")
         await self.run_command("npm install")
-        await self.run_tests()
-        await self.run_command("npm run build")
+        # Tests and build are independent once dependencies are installed
+        await asyncio.gather(self.run_tests(), self.run_command("npm run build"))
         await self.run_command("aws s3 sync dist/ s3://my-app-bucket")
         await self.c.commit("Production deployment", push=True)
         print("CI/CD pipeline completed successfully!")
 
     async def generate_verified_component(self, requirements):
         """Generate and verify component"""
-        # Step 1: Generate initial version
-        component_code = await self.generate_component(
-            requirements["name"],
-            requirements["props"],
-            requirements.get("styles")
+        # Step 1: Generate initial version while fetching similar components;
+        # the knowledge lookup only needs the component name
+        component_code, context = await asyncio.gather(
+            self.generate_component(
+                requirements["name"],
+                requirements["props"],
+                requirements.get("styles")
+            ),
+            asyncio.to_thread(
+                self.knowledge.query_codebase,
+                f"Vue components similar to {requirements['name']}"
+            )
         )
 
         # Step 2: Run verification pipeline
-        context = self.knowledge.query_codebase(
-            f"Vue components similar to {requirements['name']}"
-        )
 
-        result = self.verifier.iterative_correction(
+        result = await self.verifier.iterative_correction(
             component_code,
             requirements,
             context
@@ -320,10 +433,10 @@ class AgentController:
         return git_agent.ai_development_workflow(task_description)
 
 class DesignToComponentAgent:
-    def __init__(self):
-        """Initialize design-to-component agent"""
-        self.c = Continue()
-        self.agent_controller = AgentController()
+    def __init__(self, agent=None):
+        """Initialize design-to-component agent, sharing an AgentController when given"""
+        self.agent_controller = agent or AgentController()
+        self.c = self.agent_controller.c
 
     async def generate_from_figma(self, figma_url):
         """Convert Figma design to Vue component"""
@@ -345,7 +458,7 @@ class DesignToComponentAgent:
         )
 
         # Apply Tailwind classes
-        await self.c.edit(
+        await self.agent_controller._edit(
             filepath=f"src/components/{design_data['name']}.vue",
             prompt=f"Apply these Tailwind classes: {css_specs}"
         )
@@ -368,8 +481,14 @@ if __name__ == "__main__":
 
         command = sys.argv[1]
         agent = AgentController()
-        design_agent = DesignToComponentAgent()
+        design_agent = DesignToComponentAgent(agent)
+
+        try:
+            await run_command(agent, design_agent, command)
+        finally:
+            await agent.aclose()
 
+    async def run_command(agent, design_agent, command):
         if command == "refactor_component":
             if len(sys.argv) < 3:
                 print("Usage: python agent_controller.py refactor_component [component_path]")
@@ -413,6 +532,13 @@ if __name__ == "__main__":
             routes = json.loads(sys.argv[2])
             await agent.configure_vue_router(routes)
 
+        elif command == "generate_many":
+            if len(sys.argv) < 3:
+                print("Usage: python agent_controller.py generate_many [specs_json]")
+                sys.exit(1)
+            paths = await agent.generate_many(json.loads(sys.argv[2]))
+            print(f"Generated {len(paths)} files")
+
         elif command == "setup_feature":
             if len(sys.argv) < 3:
                 print("Usage: python agent_controller.py setup_feature [feature_name]")
@@ -428,6 +554,17 @@ if __name__ == "__main__":
         elif command == "ci_cd":
             await agent.ci_cd_pipeline()
 
+        elif command == "debug_code":
+            if len(sys.argv) < 3:
+                print("Usage: python agent_controller.py debug_code [file_path] [error_message]")
+                sys.exit(1)
+            with open(sys.argv[2]) as f:
+                code_snippet = f.read()
+            error_message = sys.argv[3] if len(sys.argv) > 3 else ""
+            async for chunk in agent.debug_code_stream(code_snippet, error_message):
+                print(chunk, end="", flush=True)
+            print()
+
         else:
             print(f"Unknown command: {command}")
             sys.exit(1)
@@ -0,0 +1,133 @@
+# Disk cache for CodebaseContext retrievals.
+# Top-K results barely move between consecutive generate_* calls on the same
+# tree, so they are keyed on the repo state (HEAD sha plus the mtimes of
+# dirty files, read at lookup time) and the query, and reused until it changes.
+
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import subprocess
+
+
+class CachedContext:
+    def __init__(self, context, cache_dir=".aleph-cache", project_dir="."):
+        """Wrap a CodebaseContext so retrieve() results are cached per repo state"""
+        self._context = context
+        self.project_dir = project_dir
+        self.hits = 0
+        self.misses = 0
+        # Last state retrievals were stored under; rows for any other state are dropped
+        self._stored_state = None
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(cache_dir, "ctx.sqlite"))
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS retrievals (key TEXT PRIMARY KEY, head_sha TEXT, chunks TEXT)"
+        )
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+    def _repo_state(self):
+        """HEAD sha plus dirty-file mtimes as one digest, or an empty string outside a git repo"""
+        # One porcelain v2 call reports both HEAD (branch.oid) and every changed path
+        try:
+            result = subprocess.run(
+                ["git", "status", "--porcelain=v2", "--branch", "-z"],
+                cwd=self.project_dir, capture_output=True, text=True
+            )
+        except OSError:
+            return ""  # Missing project directory or no git binary
+        if result.returncode != 0:
+            return ""
+
+        head, paths = "", []
+        entries = iter(result.stdout.split("\0"))
+        for entry in entries:
+            if entry.startswith("# branch.oid "):
+                head = entry[len("# branch.oid "):]
+            elif entry.startswith("1 "):
+                paths.append(entry.split(" ", 8)[8])
+            elif entry.startswith("2 "):
+                paths.append(entry.split(" ", 9)[9])
+                next(entries, None)  # Rename/copy source path
+            elif entry.startswith("u "):
+                paths.append(entry.split(" ", 10)[10])
+            elif entry.startswith("? "):
+                paths.append(entry[2:])
+        if not head or head == "(initial)":
+            return ""
+
+        digest = hashlib.blake2b(head.encode())
+        for path in sorted(paths):
+            try:
+                mtime = os.stat(os.path.join(self.project_dir, path)).st_mtime_ns
+            except OSError:
+                mtime = -1  # Deleted in the working tree
+            digest.update(f"\0{path}\0{mtime}".encode())
+        return digest.hexdigest()
+
+    def _key(self, state, query, args, kwargs):
+        payload = json.dumps([query, args, kwargs], sort_keys=True, default=str)
+        return hashlib.blake2b((state + payload).encode()).hexdigest()
+
+    def _lookup(self, key):
+        row = self._db.execute("SELECT chunks FROM retrievals WHERE key = ?", (key,)).fetchone()
+        if row:
+            self.hits += 1
+            return json.loads(row[0])
+        self.misses += 1
+        return None
+
+    def _store(self, state, key, chunks):
+        try:
+            serialized = json.dumps(chunks)
+        except TypeError:
+            return  # Retrieval returned objects we can't persist
+        if state != self._stored_state:
+            # Retrievals made against an earlier tree can't be hit again
+            self._db.execute("DELETE FROM retrievals WHERE head_sha != ?", (state,))
+            self._stored_state = state
+        self._db.execute(
+            "INSERT OR REPLACE INTO retrievals (key, head_sha, chunks) VALUES (?, ?, ?)",
+            (key, state, serialized)
+        )
+        self._db.commit()
+
+    def retrieve(self, query, *args, **kwargs):
+        """Return cached top-K chunks for the query, retrieving on a miss"""
+        # Read on every lookup, so commits and working-tree edits since the last call count
+        state = self._repo_state()
+        if not state:
+            return self._context.retrieve(query, *args, **kwargs)
+
+        key = self._key(state, query, args, kwargs)
+        if inspect.iscoroutinefunction(self._context.retrieve):
+            return self._retrieve_async(state, key, query, args, kwargs)
+
+        chunks = self._lookup(key)
+        if chunks is None:
+            chunks = self._context.retrieve(query, *args, **kwargs)
+            self._store(state, key, chunks)
+        return chunks
+
+    async def _retrieve_async(self, state, key, query, args, kwargs):
+        chunks = self._lookup(key)
+        if chunks is None:
+            chunks = await self._context.retrieve(query, *args, **kwargs)
+            self._store(state, key, chunks)
+        return chunks
+
+    def stats(self):
+        """Report cache hit/miss counts for tuning n_retrieve"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        self._db.close()
@@ -1,8 +1,84 @@
-import requests
+import httpx
+import asyncio
+import aiofiles
+import orjson
+import numpy as np
 import json
 import os
-from typing import Dict, List
+import re
+import time
+import shutil
+import bisect
+import itertools
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 from agent_controller import AgentController
+from rate_limiter import AsyncRateLimiter
+from prompt_templates import COMPONENT_TEMPLATE
+
+_PROP_RE = re.compile(r"{{(\w+)}}")
+
+# Tailwind v3 palette, shades 50-950 per family
+_TW_SHADES = (50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 950)
+_TW_FAMILIES = {
+    "slate": "f8fafc f1f5f9 e2e8f0 cbd5e1 94a3b8 64748b 475569 334155 1e293b 0f172a 020617",
+    "gray": "f9fafb f3f4f6 e5e7eb d1d5db 9ca3af 6b7280 4b5563 374151 1f2937 111827 030712",
+    "zinc": "fafafa f4f4f5 e4e4e7 d4d4d8 a1a1aa 71717a 52525b 3f3f46 27272a 18181b 09090b",
+    "neutral": "fafafa f5f5f5 e5e5e5 d4d4d4 a3a3a3 737373 525252 404040 262626 171717 0a0a0a",
+    "stone": "fafaf9 f5f5f4 e7e5e4 d6d3d1 a8a29e 78716c 57534e 44403c 292524 1c1917 0c0a09",
+    "red": "fef2f2 fee2e2 fecaca fca5a5 f87171 ef4444 dc2626 b91c1c 991b1b 7f1d1d 450a0a",
+    "orange": "fff7ed ffedd5 fed7aa fdba74 fb923c f97316 ea580c c2410c 9a3412 7c2d12 431407",
+    "amber": "fffbeb fef3c7 fde68a fcd34d fbbf24 f59e0b d97706 b45309 92400e 78350f 451a03",
+    "yellow": "fefce8 fef9c3 fef08a fde047 facc15 eab308 ca8a04 a16207 854d0e 713f12 422006",
+    "lime": "f7fee7 ecfccb d9f99d bef264 a3e635 84cc16 65a30d 4d7c0f 3f6212 365314 1a2e05",
+    "green": "f0fdf4 dcfce7 bbf7d0 86efac 4ade80 22c55e 16a34a 15803d 166534 14532d 052e16",
+    "emerald": "ecfdf5 d1fae5 a7f3d0 6ee7b7 34d399 10b981 059669 047857 065f46 064e3b 022c22",
+    "teal": "f0fdfa ccfbf1 99f6e4 5eead4 2dd4bf 14b8a6 0d9488 0f766e 115e59 134e4a 042f2e",
+    "cyan": "ecfeff cffafe a5f3fc 67e8f9 22d3ee 06b6d4 0891b2 0e7490 155e75 164e63 083344",
+    "sky": "f0f9ff e0f2fe bae6fd 7dd3fc 38bdf8 0ea5e9 0284c7 0369a1 075985 0c4a6e 082f49",
+    "blue": "eff6ff dbeafe bfdbfe 93c5fd 60a5fa 3b82f6 2563eb 1d4ed8 1e40af 1e3a8a 172554",
+    "indigo": "eef2ff e0e7ff c7d2fe a5b4fc 818cf8 6366f1 4f46e5 4338ca 3730a3 312e81 1e1b4b",
+    "violet": "f5f3ff ede9fe ddd6fe c4b5fd a78bfa 8b5cf6 7c3aed 6d28d9 5b21b6 4c1d95 2e1065",
+    "purple": "faf5ff f3e8ff e9d5ff d8b4fe c084fc a855f7 9333ea 7e22ce 6b21a8 581c87 3b0764",
+    "fuchsia": "fdf4ff fae8ff f5d0fe f0abfc e879f9 d946ef c026d3 a21caf 86198f 701a75 4a044e",
+    "pink": "fdf2f8 fce7f3 fbcfe8 f9a8d4 f472b6 ec4899 db2777 be185d 9d174d 831843 500724",
+    "rose": "fff1f2 ffe4e6 fecdd3 fda4af fb7185 f43f5e e11d48 be123c 9f1239 881337 4c0519",
+}
+_TW_NAMES = ["white", "black"]
+_TW_HEXES = ["ffffff", "000000"]
+for _family, _hexes in _TW_FAMILIES.items():
+    for _shade, _hex in zip(_TW_SHADES, _hexes.split()):
+        _TW_NAMES.append(f"{_family}-{_shade}")
+        _TW_HEXES.append(_hex)
+_TW_RGB = np.array([[int(h[i:i + 2], 16) for i in (0, 2, 4)] for h in _TW_HEXES], dtype=np.int32)
+
+# Upper bounds for each Tailwind step; values past the last bound map to the last name
+_FS_T = (12, 14, 16, 18, 20, 24)
+_FS_N = ("xs", "sm", "base", "lg", "xl", "2xl", "3xl")
+_FW_T = (400, 500, 600, 700)  # exclusive bounds
+_FW_N = ("light", "normal", "medium", "semibold", "bold")
+_BR_T = (2, 4, 8, 12)
+_BR_N = ("sm", "md", "lg", "xl", "2xl")
+
+
+def nearest_colors_bulk(rgb: np.ndarray) -> List[str]:
+    """Map an (M, 3) array of 0-255 RGB values to their nearest Tailwind color names"""
+    diff = rgb.astype(np.int32)[:, None, :] - _TW_RGB[None, :, :]
+    return [_TW_NAMES[i] for i in (diff * diff).sum(-1).argmin(1)]
+
+
+@dataclass
+class NodeTable:
+    """Struct-of-arrays view of a Figma node tree, one row per node in document order"""
+    names: List[str]
+    characters: List[Optional[str]]
+    in_text: np.ndarray  # bool, row sits below a text node
+    depths: np.ndarray  # int, nesting depth below the root
+    fills_rgb: np.ndarray  # (N, 3) int32, -1 where the node has no solid fill
+    font_sizes: np.ndarray  # float, NaN where unset
+    font_weights: np.ndarray  # float, NaN where unset
+    corner_radius: np.ndarray  # float, NaN where unset
 
 class FigmaParser:
     def __init__(self, access_token: str):
@@ -10,107 +86,192 @@ class FigmaParser:
         self.access_token = access_token
         self.base_url = "https://api.figma.com/v1"
         self.headers = {"X-Figma-Token": self.access_token}
+        # Pooled HTTP/2 client so node fetches share one keep-alive connection
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            http2=True,
+            timeout=30
+        )
+        # Node responses memoized in memory and on disk so reruns skip API calls
+        self.cache_dir = os.path.join(os.getenv("ALEPH_CACHE_DIR", ".aleph-cache"), "figma")
+        self.cache_ttl = float(os.getenv("FIGMA_CACHE_TTL", "3600"))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._node_cache = {}  # (file_key, node_id): node
+        self._limiter = AsyncRateLimiter(
+            rpm=float(os.getenv("FIGMA_API_RPM", "60")),
+            max_concurrency=int(os.getenv("FIGMA_API_CONCURRENCY", "4"))
+        )
 
-    def get_file(self, file_key: str) -> Dict:
+    async def aclose(self):
+        """Close pooled Figma API connections"""
+        await self._client.aclose()
+
+    async def get_file(self, file_key: str) -> Dict:
         """Fetch Figma file structure"""
-        response = requests.get(
-            f"{self.base_url}/files/{file_key}",
-            headers=self.headers
-        )
-        return response.json()
+        async with self._limiter:
+            response = await self._client.get(f"/files/{file_key}")
+        return orjson.loads(response.content)
 
-    def extract_component(self, node_id: str, file_key: str) -> Dict:
+    async def extract_component(self, node_id: str, file_key: str) -> Dict:
         """Extract component details"""
-        response = requests.get(
-            f"{self.base_url}/files/{file_key}/nodes?ids={node_id}",
-            headers=self.headers
+        nodes = await self.extract_components_bulk([node_id], file_key)
+        return nodes[node_id]
+
+    async def extract_components_bulk(self, node_ids: List[str], file_key: str) -> Dict[str, Dict]:
+        """Extract several components, fetching uncached ones with a single nodes request"""
+        nodes = {}
+        missing = []
+        for node_id in node_ids:
+            node = await self._load_cached_node(file_key, node_id)
+            if node is None:
+                missing.append(node_id)
+            else:
+                nodes[node_id] = node
+
+        if missing:
+            async with self._limiter:
+                response = await self._client.get(
+                    f"/files/{file_key}/nodes", params={"ids": ",".join(missing)}
+                )
+            fetched = orjson.loads(response.content)["nodes"]
+            for node_id in missing:
+                nodes[node_id] = fetched[node_id]
+                await self._store_cached_node(file_key, node_id, fetched[node_id])
+
+        return nodes
+
+    def _node_cache_path(self, file_key: str, node_id: str) -> str:
+        """Disk cache location for one node response"""
+        return os.path.join(self.cache_dir, f"{file_key}_{node_id.replace(':', '-')}.json")
+
+    async def _load_cached_node(self, file_key: str, node_id: str) -> Optional[Dict]:
+        """Return a memoized node from memory or a fresh disk entry"""
+        key = (file_key, node_id)
+        if key in self._node_cache:
+            return self._node_cache[key]
+
+        cache_path = self._node_cache_path(file_key, node_id)
+        if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < self.cache_ttl:
+            async with aiofiles.open(cache_path, "rb") as f:
+                self._node_cache[key] = orjson.loads(await f.read())
+            return self._node_cache[key]
+        return None
+
+    async def _store_cached_node(self, file_key: str, node_id: str, node: Dict):
+        """Memoize a node response in memory and on disk"""
+        self._node_cache[(file_key, node_id)] = node
+        async with aiofiles.open(self._node_cache_path(file_key, node_id), "wb") as f:
+            await f.write(orjson.dumps(node))
+
+    def clear_cache(self):
+        """Drop memoized node responses from memory and disk"""
+        self._node_cache.clear()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    async def extract_components(self, node_ids: List[str], file_key: str) -> List[Dict]:
+        """Extract several components concurrently"""
+        return await asyncio.gather(
+            *[self.extract_component(node_id, file_key) for node_id in node_ids]
         )
-        return response.json()["nodes"][node_id]
 
     def convert_to_component_spec(self, figma_data: Dict) -> Dict:
         """Convert Figma data to component specification"""
+        document = figma_data["document"]
+        table = self.build_table(document)
         return {
-            "name": figma_data["document"]["name"],
-            "props": self._extract_props(figma_data["document"]),
-            "styles": self._extract_styles(figma_data["document"]),
-            "layout": self._extract_layout(figma_data["document"]),
-            "content": self._extract_content(figma_data["document"])
+            "name": document["name"],
+            "props": self._props_from_table(table),
+            "styles": self._classes_from_table(table, np.array([0]))[0],
+            "layout": self._extract_layout(document),
+            "content": self._content_from_table(table)
         }
 
+    def build_table(self, root: Dict) -> NodeTable:
+        """Flatten a node tree into a NodeTable with a single iterative walk"""
+        names, characters, in_text, depths = [], [], [], []
+        fills, font_sizes, font_weights, radii = [], [], [], []
+        nan = float("nan")
+
+        stack = deque([(root, False, 0)])
+        while stack:
+            node, below_text, depth = stack.pop()
+            names.append(node.get("name", ""))
+            characters.append(node.get("characters"))
+            in_text.append(below_text)
+            depths.append(depth)
+
+            fill = node["fills"][0] if node.get("fills") else None
+            if fill and fill["type"] == "SOLID" and "color" in fill:
+                color = fill["color"]
+                fills.append((int(color.get("r", 0) * 255), int(color.get("g", 0) * 255), int(color.get("b", 0) * 255)))
+            else:
+                fills.append((-1, -1, -1))
+
+            style = node.get("style", {})
+            font_sizes.append(style.get("fontSize", nan))
+            font_weights.append(style.get("fontWeight", nan))
+            radii.append(node.get("cornerRadius", nan))
+
+            # Push children reversed so they pop in their original order
+            child_below_text = below_text or "characters" in node
+            stack.extend((child, child_below_text, depth + 1) for child in reversed(node.get("children", ())))
+
+        return NodeTable(
+            names=names,
+            characters=characters,
+            in_text=np.asarray(in_text, dtype=bool),
+            depths=np.asarray(depths, dtype=np.int32),
+            fills_rgb=np.asarray(fills, dtype=np.int32).reshape(-1, 3),
+            font_sizes=np.asarray(font_sizes, dtype=float),
+            font_weights=np.asarray(font_weights, dtype=float),
+            corner_radius=np.asarray(radii, dtype=float)
+        )
+
     def _extract_props(self, node: Dict) -> List[Dict]:
         """Identify component props from Figma properties"""
-        props = []
+        return self._props_from_table(self.build_table(node))
 
-        # Extract text content as potential props
-        if "characters" in node:
+    def _props_from_table(self, table: NodeTable) -> List[Dict]:
+        """Collect props in document order from layer names and text placeholders"""
+        props = []
+        for row, (name, text) in enumerate(zip(table.names, table.characters)):
+            # If layer name starts with "prop:", extract as prop
+            if row and name.startswith("prop:"):
+                props.append({"name": name[5:], "type": "Any"})
             # If text contains data placeholders like {{name}}, extract as prop
-            text = node.get("characters", "")
-            import re
-            prop_matches = re.findall(r'{{(\w+)}}', text)
-            for match in prop_matches:
-                props.append({
-                    "name": match,
-                    "type": "String"
-                })
-
-        # Extract layer names as potential props
-        if "children" in node:
-            for child in node["children"]:
-                child_name = child.get("name", "")
-                # If layer name starts with "prop:", extract as prop
-                if child_name.startswith("prop:"):
-                    prop_name = child_name.split(":")[1]
-                    props.append({
-                        "name": prop_name,
-                        "type": "Any"
-                    })
-                # Recursively check child nodes
-                child_props = self._extract_props(child)
-                props.extend(child_props)
-
+            if text:
+                props.extend({"name": match, "type": "String"} for match in _PROP_RE.findall(text))
         return props
 
-    def _extract_styles(self, node: Dict) -> Dict:
+    def _extract_styles(self, node: Dict) -> str:
         """Convert Figma styles to Tailwind classes"""
-        styles = {}
-
-        # Extract colors
-        if "fills" in node and node["fills"]:
-            fill = node["fills"][0]
-            if fill["type"] == "SOLID" and "color" in fill:
-                styles["background"] = self._rgb_to_hex(fill["color"])
-
-        # Extract typography
-        if "style" in node:
-            if "fontFamily" in node["style"]:
-                styles["font"] = node["style"]["fontFamily"]
-            if "fontSize" in node["style"]:
-                styles["font_size"] = node["style"]["fontSize"]
-            if "fontWeight" in node["style"]:
-                styles["font_weight"] = node["style"]["fontWeight"]
-
-        # Extract padding/margin
-        if "absoluteBoundingBox" in node and "padding" in node:
-            styles["padding"] = node["padding"]
-
-        # Extract border radius
-        if "cornerRadius" in node:
-            styles["border_radius"] = node["cornerRadius"]
-
-        # Convert to Tailwind classes
-        tailwind_map = {
-            "background": lambda x: f"bg-{self._nearest_tailwind_color(x)}",
-            "font_size": lambda x: f"text-{self._map_font_size(x)}",
-            "font_weight": lambda x: f"font-{self._map_font_weight(x)}",
-            "border_radius": lambda x: f"rounded-{self._map_border_radius(x)}"
-        }
-
-        tailwind_classes = []
-        for key, value in styles.items():
-            if key in tailwind_map:
-                tailwind_classes.append(tailwind_map[key](value))
+        return self._classes_from_table(self.build_table(node), np.array([0]))[0]
+
+    def _classes_from_table(self, table: NodeTable, rows: np.ndarray) -> List[str]:
+        """Map the style columns of the given rows to Tailwind class strings"""
+        classes = [[] for _ in rows]
+
+        fills = table.fills_rgb[rows]
+        has_fill = fills[:, 0] >= 0
+        if has_fill.any():
+            for i, color in zip(np.flatnonzero(has_fill), nearest_colors_bulk(fills[has_fill])):
+                classes[i].append(f"bg-{color}")
+
+        columns = (
+            ("text", table.font_sizes, self._map_font_sizes_bulk),
+            ("font", table.font_weights, self._map_font_weights_bulk),
+            ("rounded", table.corner_radius, self._map_border_radii_bulk)
+        )
+        for prefix, column, mapper in columns:
+            values = column[rows]
+            present = ~np.isnan(values)
+            if present.any():
+                for i, size in zip(np.flatnonzero(present), mapper(values[present])):
+                    classes[i].append(f"{prefix}-{size}")
 
-        return " ".join(tailwind_classes)
+        return [" ".join(row_classes) for row_classes in classes]
 
     def _extract_layout(self, node: Dict) -> Dict:
         """Extract layout dimensions"""
@@ -137,17 +298,32 @@ class FigmaParser:
 
     def _extract_content(self, node: Dict) -> str:
         """Extract text content"""
-        if "characters" in node:
-            return node["characters"]
-
-        content = ""
-        if "children" in node:
-            for child in node["children"]:
-                child_content = self._extract_content(child)
-                if child_content:
-                    content += child_content + "\n"
-
-        return content.strip()
+        return self._content_from_table(self.build_table(node))
+
+    def _content_from_table(self, table: NodeTable) -> str:
+        """Join the outermost non-empty text runs in document order, stripping each container's text"""
+        if table.characters[0] is not None:
+            return table.characters[0]
+
+        # Text parts of each container on the path to the current row; a container's
+        # stripped text joins its parent once a row at or above its depth is reached
+        open_depths, open_parts = [], []
+        rows = zip(table.characters, table.in_text, table.depths)
+        for text, below_text, depth in itertools.chain(rows, [(None, False, -1)]):
+            if below_text:
+                continue
+            while open_depths and open_depths[-1] >= depth:
+                open_depths.pop()
+                content = "\n".join(open_parts.pop()).strip()
+                if content and open_parts:
+                    open_parts[-1].append(content)
+            if text is None:
+                open_depths.append(depth)
+                open_parts.append([])
+            elif text:
+                open_parts[-1].append(text)
+
+        return content
 
     def _rgb_to_hex(self, color: Dict) -> str:
         """Convert RGB to hex color"""
@@ -157,114 +333,99 @@ class FigmaParser:
         return f"#{r:02x}{g:02x}{b:02x}"
 
     def _nearest_tailwind_color(self, hex_color: str) -> str:
-        """Approximate hex to Tailwind color name"""
-        # Simplified mapping - in practice use a color distance algorithm
-        color_map = {
-            "#ef4444": "red-500",
-            "#ec4899": "pink-500",
-            "#f97316": "orange-500",
-            "#eab308": "yellow-500",
-            "#22c55e": "green-500",
-            "#3b82f6": "blue-500",
-            "#8b5cf6": "violet-500",
-            "#d1d5db": "gray-300",
-            "#9ca3af": "gray-400",
-            "#6b7280": "gray-500",
-            "#4b5563": "gray-600",
-            "#1f2937": "gray-800",
-            "#111827": "gray-900",
-            "#ffffff": "white",
-            "#000000": "black"
-        }
-        # Default to gray-200 if no match
-        return color_map.get(hex_color.lower(), "gray-200")
+        """Approximate hex to the nearest Tailwind color name"""
+        hex_color = hex_color.lstrip("#")
+        rgb = np.array([[int(hex_color[i:i + 2], 16) for i in (0, 2, 4)]])
+        return nearest_colors_bulk(rgb)[0]
 
     def _map_font_size(self, size: float) -> str:
         """Map font size to Tailwind size"""
-        if size <= 12:
-            return "xs"
-        elif size <= 14:
-            return "sm"
-        elif size <= 16:
-            return "base"
-        elif size <= 18:
-            return "lg"
-        elif size <= 20:
-            return "xl"
-        elif size <= 24:
-            return "2xl"
-        else:
-            return "3xl"
+        return _FS_N[bisect.bisect_left(_FS_T, size)]
+
+    def _map_font_sizes_bulk(self, sizes: np.ndarray) -> np.ndarray:
+        """Map an array of font sizes to Tailwind sizes"""
+        return np.asarray(_FS_N)[np.searchsorted(_FS_T, sizes, side="left")]
 
     def _map_font_weight(self, weight: int) -> str:
         """Map font weight to Tailwind weight"""
-        if weight < 400:
-            return "light"
-        elif weight < 500:
-            return "normal"
-        elif weight < 600:
-            return "medium"
-        elif weight < 700:
-            return "semibold"
-        else:
-            return "bold"
+        return _FW_N[bisect.bisect_right(_FW_T, weight)]
+
+    def _map_font_weights_bulk(self, weights: np.ndarray) -> np.ndarray:
+        """Map an array of font weights to Tailwind weights"""
+        return np.asarray(_FW_N)[np.searchsorted(_FW_T, weights, side="right")]
 
     def _map_border_radius(self, radius: float) -> str:
         """Map border radius to Tailwind size"""
-        if radius <= 2:
-            return "sm"
-        elif radius <= 4:
-            return "md"
-        elif radius <= 8:
-            return "lg"
-        elif radius <= 12:
-            return "xl"
-        else:
-            return "2xl"
+        return _BR_N[bisect.bisect_left(_BR_T, radius)]
+
+    def _map_border_radii_bulk(self, radii: np.ndarray) -> np.ndarray:
+        """Map an array of border radii to Tailwind sizes"""
+        return np.asarray(_BR_N)[np.searchsorted(_BR_T, radii, side="left")]
 
 class FigmaToVueAgent:
-    def __init__(self, figma_token: str):
-        """Initialize Figma to Vue agent"""
+    def __init__(self, figma_token: str, agent: Optional[AgentController] = None):
+        """Initialize Figma to Vue agent, sharing an AgentController when given"""
         self.parser = FigmaParser(figma_token)
-        self.agent = AgentController()
+        self.agent = agent or AgentController()
+        # Cap how many Figma URLs are generated at once
+        self._semaphore = asyncio.Semaphore(int(os.getenv("FIGMA_MAX_CONCURRENCY", "4")))
 
     async def generate_component(self, figma_url: str):
         """Generate Vue component from Figma URL"""
         # Extract file key and node ID from URL
-        # Format: https://www.figma.com/file/FILE_KEY/...?node-id=NODE_ID
+        # Format: https://www.figma.com/file/FILE_KEY/...?node-id=NODE_ID[&node-id=NODE_ID...]
         try:
             file_key = figma_url.split("/file/")[1].split("/")[0]
-            node_id = figma_url.split("node-id=")[1].split("&")[0]
-
-            print(f"Extracting Figma data for file {file_key}, node {node_id}")
-
-            # Fetch and parse Figma data
-            figma_data = self.parser.extract_component(node_id, file_key)
-            component_spec = self.parser.convert_to_component_spec(figma_data)
+            node_ids = re.findall(r"node-id=([^&]+)", figma_url)
 
-            # Generate Vue component
-            await self.agent.generate_component(
-                component_spec["name"],
-                [prop["name"] for prop in component_spec["props"]]
-            )
+            print(f"Extracting Figma data for file {file_key}, nodes {', '.join(node_ids)}")
 
-            # Add Tailwind styles
-            tailwind_classes = component_spec["styles"]
-            layout_info = self._convert_layout_to_tailwind(component_spec["layout"])
+            # Fetch all nodes in one request when the URL lists several
+            if len(node_ids) > 1:
+                nodes = await self.parser.extract_components_bulk(node_ids, file_key)
+                specs = await asyncio.gather(
+                    *[self._generate_from_node(nodes[node_id]) for node_id in node_ids]
+                )
+                return list(specs)
 
-            # Update component with styles
-            await self.agent.c.edit(
-                filepath=f"src/components/{component_spec['name']}.vue",
-                prompt=f"Apply these Tailwind classes to the component: {tailwind_classes} {layout_info}. Ensure <script> comes before <template>, avoid <style> unless necessary, and place all type definitions in ./types folder."
-            )
-
-            print(f"Successfully generated component {component_spec['name']} from Figma")
-            return component_spec
+            figma_data = await self.parser.extract_component(node_ids[0], file_key)
+            return await self._generate_from_node(figma_data)
 
         except Exception as e:
             print(f"Error generating component from Figma: {str(e)}")
             raise
 
+    async def _generate_from_node(self, figma_data: Dict) -> Dict:
+        """Generate a styled Vue component from one Figma node"""
+        component_spec = self.parser.convert_to_component_spec(figma_data)
+        component_path = f"src/components/{component_spec['name']}.vue"
+        os.makedirs(os.path.dirname(component_path), exist_ok=True)
+
+        layout_info = self._convert_layout_to_tailwind(component_spec["layout"])
+
+        # Generate structure and styling in a single edit
+        prompt = self.agent._spec_prompt(COMPONENT_TEMPLATE, {
+            "name": component_spec["name"],
+            "props": [prop["name"] for prop in component_spec["props"]],
+            "tailwind_classes": f"{component_spec['styles']} {layout_info}".strip()
+        })
+        await self.agent._edit(
+            filepath=component_path,
+            prompt=prompt,
+            context=[self.agent.code_context]
+        )
+
+        print(f"Successfully generated component {component_spec['name']} from Figma")
+        return component_spec
+
+    async def generate_components(self, figma_urls: List[str]) -> List:
+        """Generate Vue components from several Figma URLs concurrently"""
+        async def generate(figma_url):
+            async with self._semaphore:
+                return await self.generate_component(figma_url)
+
+        return await asyncio.gather(*[generate(url) for url in figma_urls])
+
     def _convert_layout_to_tailwind(self, layout: Dict) -> str:
         """Convert layout specs to Tailwind classes"""
         classes = []
@@ -291,18 +452,21 @@ class FigmaToVueAgent:
         return " ".join(classes)
 
 if __name__ == "__main__":
-    import asyncio
     import sys
 
     async def main():
-        if len(sys.argv) != 3:
-            print("Usage: python figma_integration.py [figma_token] [figma_url]")
+        if len(sys.argv) < 3:
+            print("Usage: python figma_integration.py [figma_token] [figma_url...]")
             sys.exit(1)
 
         figma_token = sys.argv[1]
-        figma_url = sys.argv[2]
+        figma_urls = sys.argv[2:]
 
         agent = FigmaToVueAgent(figma_token)
-        await agent.generate_component(figma_url)
+        try:
+            await agent.generate_components(figma_urls)
+        finally:
+            await agent.parser.aclose()
+            await agent.agent.aclose()
 
     asyncio.run(main())
@@ -0,0 +1,17 @@
+# In-process cache for source files read repeatedly by the agents.
+# Entries are keyed on path, mtime and size, so a write naturally invalidates them.
+
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def _read_text(path, mtime_ns, size):
+    with open(path, "r") as f:
+        return f.read()
+
+
+def read_text(path):
+    """Read a text file, reusing the cached contents while the file is unchanged"""
+    stat = os.stat(path)
+    return _read_text(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
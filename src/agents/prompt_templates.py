@@ -3,41 +3,122 @@
 # and `.github/extra-prompts.md`.
 # They guide the Continue API to generate Vue 3 code following project rules.
 
-NEW_COMPONENT_TEMPLATE = """
-Create a Vue 3 component named `{name}` using <script setup lang='ts'>.
-Props: {props}
-Emits: {emits}
-Slots: {slots}
-{description}
-Follow project rules: <script> before <template>, use Tailwind CSS, place types in ./types and avoid <style> blocks.
-"""
-
-PINIA_STORE_TEMPLATE = """
-Generate a Pinia store named `{name}` with {store_type} syntax.
-State definition: {state}
-Getters: {getters}
-Actions: {actions}
-Use strict TypeScript and output to src/stores.
-"""
-
-API_SERVICE_TEMPLATE = """
-Create an Axios service `{name}` handling these endpoints:
-{endpoints}
+# Templates keep instructions and project rules first and the per-call
+# content last, so every request shares the same prompt prefix.
+PROJECT_RULES = (
+    "Project rules: Vue 3 with strict TypeScript (no 'any'), Tailwind CSS, "
+    "<script> before <template>, types in ./types, avoid <style> blocks."
+)
+CODE_DELIMITER = "---USER CODE BELOW---"
+SPEC_DELIMITER = "---SPEC---"
+
+# Generation templates take a single JSON spec after the delimiter
+COMPONENT_TEMPLATE = f"""
+Create a Vue 3 component described by the JSON spec below using the Composition API.
+Emit events for user interactions and apply any tailwind_classes listed in the spec.
+{PROJECT_RULES}
+{SPEC_DELIMITER}
+{{spec}}
+"""
+
+NEW_COMPONENT_TEMPLATE = f"""
+Create a Vue 3 component described by the JSON spec below using <script setup lang='ts'>.
+The spec gives the component name, props, emits, slots and an optional description.
+{PROJECT_RULES}
+{SPEC_DELIMITER}
+{{spec}}
+"""
+
+PINIA_STORE_TEMPLATE = f"""
+Generate a Pinia store described by the JSON spec below, using the syntax named in store_type.
+The spec gives the store name, state definition, getters and actions. Output to src/stores.
+{PROJECT_RULES}
+{SPEC_DELIMITER}
+{{spec}}
+"""
+
+API_SERVICE_TEMPLATE = f"""
+Create an Axios service described by the JSON spec below, handling every listed endpoint.
 Use humps for camelCase conversion and TypeScript interfaces for requests and responses.
+{PROJECT_RULES}
+{SPEC_DELIMITER}
+{{spec}}
 """
 
-ROUTER_CONFIG_TEMPLATE = """
-Update Vue Router configuration with the following routes:
-{routes}
+ROUTER_CONFIG_TEMPLATE = f"""
+Update the Vue Router configuration with the routes in the JSON spec below.
 Use createWebHistory and strict TypeScript definitions.
+{PROJECT_RULES}
+{SPEC_DELIMITER}
+{{spec}}
+"""
+
+DEBUG_TEMPLATE = f"""
+Given the code and error below, suggest a clear fix.
+{PROJECT_RULES}
+{CODE_DELIMITER}
+Error:
+{{error}}
+{{context}}
+Code:
+{{code}}
+"""
+
+FIX_API_TEMPLATE = f"""
+Diagnose and fix the problem in the API service below. Provide a corrected version.
+{PROJECT_RULES}
+{CODE_DELIMITER}
+Problem:
+{{problem}}
+Code:
+{{code}}
+"""
+
+LINT_TEMPLATE = f"""
+Lint and fix the code below according to project ESLint rules.
+{PROJECT_RULES}
+{CODE_DELIMITER}
+{{code}}
+"""
+
+REFACTOR_TEMPLATE = f"""
+Refactor the code below toward the stated goal while keeping strict TypeScript.
+{PROJECT_RULES}
+{CODE_DELIMITER}
+Goal: {{goal}}
+Code:
+{{code}}
+"""
+
+STRICT_TYPESCRIPT_TEMPLATE = f"""
+Convert the code below to strict TypeScript without using 'any'.
+{PROJECT_RULES}
+{CODE_DELIMITER}
+{{code}}
+"""
+
+INLINE_COMMENTS_TEMPLATE = f"""
+Add concise inline comments to the code below.
+{PROJECT_RULES}
+{CODE_DELIMITER}
+{{code}}
+"""
+
+TSDOC_TEMPLATE = f"""
+Generate TSDoc comments for the code element below.
+{PROJECT_RULES}
+{CODE_DELIMITER}
+Element type: {{element_type}}
+Code:
+{{code}}
 """
 
-DEBUG_TEMPLATE = """
-Given this code:
-{code}
-And error:
-{error}
-{context}
-Suggest a clear fix.
+SUMMARIZE_TEMPLATE = f"""
+Summarize the code below for the stated purpose.
+{PROJECT_RULES}
+{CODE_DELIMITER}
+Purpose: {{purpose}}
+Code:
+{{code}}
 """
 
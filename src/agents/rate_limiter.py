@@ -0,0 +1,32 @@
+# Rate limiting for outbound LLM and API calls.
+# Combines an in-flight cap with request pacing so fan-out via asyncio.gather
+# stays under provider limits instead of hitting 429s and retrying.
+
+import asyncio
+
+
+class AsyncRateLimiter:
+    def __init__(self, rpm: float, max_concurrency: int):
+        """Allow at most max_concurrency calls in flight, started no faster than rpm per minute (0: unpaced)"""
+        self.sem = asyncio.Semaphore(max_concurrency)
+        self._interval = 60 / rpm if rpm > 0 else 0.0
+        self._next = 0.0
+
+    async def __aenter__(self):
+        await self.sem.acquire()
+        try:
+            # Reserve the next start slot before sleeping so waiters queue up in order
+            if not self._interval:
+                return self
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next)
+            self._next = start + self._interval
+            if start > now:
+                await asyncio.sleep(start - now)
+        except BaseException:
+            self.sem.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.sem.release()
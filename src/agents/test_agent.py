@@ -1,6 +1,7 @@
 import subprocess
 import ast
 import os
+import re
 import importlib
 import pytest
 
@@ -19,10 +20,13 @@ except ModuleNotFoundError:
 
         async def complete(self, *args, **kwargs):
             raise RuntimeError("Continue package is not installed")
-from langchain_community.document_loaders import TextLoader
+from file_cache import read_text
 from typing import List, Dict, Any
 import asyncio
 
+# Coverage table row: file name in the first column, line coverage in the second-to-last
+_COV_RE = re.compile(r'^[ \t]*([^|\n]+?)[ \t]*\|.*\|\s*(\d+(?:\.\d+)?)\s*%?\s*\|[^|]*$', re.MULTILINE)
+
 class TestAgent:
     def __init__(self):
         """Initialize test agent with Continue API"""
@@ -33,9 +37,7 @@ class TestAgent:
         print(f"Generating test for component: {component_path}")
 
         # Load component code
-        loader = TextLoader(component_path)
-        docs = loader.load()
-        component_code = docs[0].page_content
+        component_code = read_text(component_path)
 
         # Generate test using AI
         prompt = f"""
@@ -114,7 +116,7 @@ class TestAgent:
         {output}
 
         Current test code:
-        {open(test_path).read()}
+        {read_text(test_path)}
         """
         fixed_test = await self.c.complete(prompt, max_tokens=2000)
 
@@ -130,7 +132,7 @@ class TestAgent:
         print(f"Generating Storybook story for {component_path}")
 
         # Get component code
-        component_code = open(component_path).read()
+        component_code = read_text(component_path)
         component_name = os.path.basename(component_path).replace(".vue", "")
 
         # Generate story
@@ -184,29 +186,27 @@ class CoverageAgent:
     async def _improve_coverage(self, files: List[str]):
         """Generate additional tests to improve coverage"""
         test_agent = TestAgent()
-        for file_path in files:
-            print(f"Improving coverage for {file_path}")
-            await test_agent.generate_test(file_path)
+        semaphore = asyncio.Semaphore(int(os.getenv("COVERAGE_MAX_CONCURRENCY", "8")))
+
+        async def improve(file_path):
+            async with semaphore:
+                print(f"Improving coverage for {file_path}")
+                return await test_agent.generate_test(file_path)
+
+        # Each file is an independent completion, so one failure shouldn't stop the rest
+        results = await asyncio.gather(*(improve(p) for p in files), return_exceptions=True)
+        for file_path, result in zip(files, results):
+            if isinstance(result, Exception):
+                print(f"Failed to improve coverage for {file_path}: {result}")
+        return results
 
     def _parse_low_coverage_files(self, coverage_report: str) -> List[str]:
         """Parse coverage report for files with low coverage"""
-        low_coverage = []
-
-        # Simple parsing logic - would be more robust in production
-        lines = coverage_report.split("\n")
-        for line in lines:
-            if "|" in line and "%" in line:
-                parts = line.split("|")
-                if len(parts) >= 4:
-                    file_path = parts[0].strip()
-                    coverage_pct = parts[-2].strip().replace("%", "")
-                    try:
-                        if float(coverage_pct) < self.min_coverage:
-                            low_coverage.append(file_path)
-                    except ValueError:
-                        continue
-
-        return low_coverage
+        return [
+            m.group(1) for m in _COV_RE.finditer(coverage_report)
+            # The summary row isn't a file
+            if m.group(1) != "All files" and float(m.group(2)) < self.min_coverage
+        ]
 
 if __name__ == "__main__":
     import sys
@@ -1,19 +1,115 @@
-from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 import cv2
 import numpy as np
 import os
 from datetime import datetime
-from skimage.metrics import structural_similarity as ssim
+from collections import Counter
+from functools import lru_cache
+import hashlib
 import asyncio
 from agent_controller import AgentController
 
+# blake3 hashes screenshots with SIMD; blake2b keeps the exact-match check working without it
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:
+    _hasher = hashlib.blake2b
+
+
+def _digest(data):
+    return _hasher(data).digest()
+
+
+# Baselines are written as lossless WebP; older PNG baselines are still read
+BASELINE_EXTENSIONS = (".webp", ".png")
+# Capture format baselines were taken with; bump it whenever captures change shape so
+# old baselines are left behind and regenerated instead of failing SSIM
+# v2: clipped to #app with a transparent background (v1 was the full viewport)
+CAPTURE_FORMAT = "v2"
+
+
+@lru_cache(maxsize=128)
+def _load_baseline(path, mtime_ns):
+    """Decode a baseline once per file version"""
+    return cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+
+
+@lru_cache(maxsize=128)
+def _baseline_digest(path, mtime_ns):
+    """Hash a baseline's bytes once per file version"""
+    with open(path, "rb") as f:
+        return _digest(f.read())
+
+
+@lru_cache(maxsize=1)
+def _cuda_ssim_backend():
+    """(torch, kornia) when both are installed and a CUDA device is present, else None"""
+    try:
+        import torch
+        import kornia
+    except ImportError:
+        return None
+    if not torch.cuda.is_available():
+        return None
+    return torch, kornia
+
+
+# Generic screenshot harness; window.__mount swaps the rendered component in place
+HARNESS_HTML = """
+<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Component Test</title>
+  <script src="https://unpkg.com/vue@3/dist/vue.global.js"></script>
+  <link href="https://unpkg.com/tailwindcss@2.2.19/dist/tailwind.min.css" rel="stylesheet">
+  <script type="module">
+    import { createApp } from 'vue'
+
+    let app = null;
+
+    window.__mount = async (src, props) => {
+      if (app) {
+        app.unmount();
+      }
+      const { default: Component } = await import(src);
+
+      app = createApp({
+        template: `<div class="p-4">
+          <Component v-bind="props" />
+        </div>`,
+        components: { Component },
+        data() {
+          return {
+            props
+          }
+        }
+      });
+
+      app.mount('#app');
+      // Resolve once the mounted component has been painted
+      await new Promise(resolve => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+    };
+  </script>
+</head>
+<body>
+  <div id="app"></div>
+</body>
+</html>
+"""
+
+
 class VisualRegressionAgent:
+    # Diff regions at or below this many pixels are treated as noise
+    MIN_DIFF_AREA = 4
+
     def __init__(self):
         """Initialize visual regression testing agent"""
         self.c = AgentController()
         self.project_dir = os.getenv("VUE_PROJECT_DIR", os.path.expanduser("~/vue-project"))
         self.screenshot_dir = os.path.join(self.project_dir, "tests", "screenshots")
-        self.baseline_dir = os.path.join(self.screenshot_dir, "baseline")
+        self.baseline_dir = os.path.join(self.screenshot_dir, "baseline", CAPTURE_FORMAT)
         self.current_dir = os.path.join(self.screenshot_dir, "current")
         self.diff_dir = os.path.join(self.screenshot_dir, "diff")
 
@@ -21,77 +117,70 @@ class VisualRegressionAgent:
         for dir_path in [self.screenshot_dir, self.baseline_dir, self.current_dir, self.diff_dir]:
             os.makedirs(dir_path, exist_ok=True)
 
-    async def capture_component_screenshot(self, component_name, props=None, viewport=(1280, 720)):
-        """Capture screenshot of a Vue component"""
+        # Started on first capture and reused for every component
+        self._pw = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+        # Bound concurrent browser contexts during the pipeline
+        self._browser_semaphore = asyncio.Semaphore(os.cpu_count() or 4)
+        # component_name: (screenshot path, PNG bytes) not yet written to disk
+        self._last_shot = {}
+        # component_name: latest baseline path, built once per pipeline run
+        self._baseline_index = None
+
+        # One generic harness; components are mounted into it at capture time
+        self.harness_path = os.path.join(self.screenshot_dir, "harness.html")
+        with open(self.harness_path, "w") as f:
+            f.write(HARNESS_HTML)
+        self._idle_pages = []
+
+    async def _get_browser(self):
+        """Launch the shared browser on first use"""
+        async with self._browser_lock:
+            if self._browser is None:
+                self._pw = await async_playwright().start()
+                self._browser = await self._pw.chromium.launch()
+        return self._browser
+
+    async def _acquire_page(self):
+        """Reuse an idle harness page, or load the harness in a fresh context"""
+        if self._idle_pages:
+            return self._idle_pages.pop()
+        browser = await self._get_browser()
+        context = await browser.new_context()
+        page = await context.new_page()
+        await page.goto(f"file://{self.harness_path}")
+        await page.wait_for_function("() => window.__mount !== undefined")
+        return page
+
+    async def close(self):
+        """Shut down the shared browser"""
+        self._idle_pages = []
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._pw is not None:
+            await self._pw.stop()
+            self._pw = None
+
+    async def capture_component_screenshot(self, component_name, props=None, viewport=(1280, 720), persist=True):
+        """Capture screenshot of a Vue component; with persist=False it stays in memory until compared"""
         print(f"Capturing screenshot for component: {component_name}")
 
-        with sync_playwright() as p:
-            # Launch browser
-            browser = p.chromium.launch()
-            context = browser.new_context(
-                viewport={"width": viewport[0], "height": viewport[1]}
+        # Component module, imported relative to the harness page
+        component_file = f"src/components/{component_name}.vue"
+
+        # Swap the component into an already-loaded harness page instead of navigating
+        page = await self._acquire_page()
+        try:
+            await page.set_viewport_size({"width": viewport[0], "height": viewport[1]})
+            await page.evaluate(
+                "([src, props]) => window.__mount(src, props)",
+                [f"./{component_file}", props or {}]
             )
-            page = context.new_page()
-
-            # Create a simple HTML page to render the component
-            component_file = f"src/components/{component_name}.vue"
-
-            # Generate component props
-            props_str = "{}"
-            if props:
-                props_str = "{"
-                for key, value in props.items():
-                    if isinstance(value, str):
-                        props_str += f"{key}: '{value}', "
-                    else:
-                        props_str += f"{key}: {value}, "
-                props_str += "}"
-
-            # Create test harness HTML
-            test_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-              <meta charset="UTF-8">
-              <meta name="viewport" content="width=device-width, initial-scale=1.0">
-              <title>{component_name} Test</title>
-              <script src="https://unpkg.com/vue@3/dist/vue.global.js"></script>
-              <link href="https://unpkg.com/tailwindcss@2.2.19/dist/tailwind.min.css" rel="stylesheet">
-              <script type="module">
-                import {{ createApp }} from 'vue'
-                import Component from './{component_file}'
-
-                const app = createApp({{
-                  template: `<div class="p-4">
-                    <Component v-bind="props" />
-                  </div>`,
-                  components: {{ Component }},
-                  data() {{
-                    return {{
-                      props: {props_str}
-                    }}
-                  }}
-                }})
-
-                app.mount('#app')
-              </script>
-            </head>
-            <body>
-              <div id="app"></div>
-            </body>
-            </html>
-            """
-
-            # Write test HTML to temporary file
-            temp_html = os.path.join(self.screenshot_dir, f"{component_name}_test.html")
-            with open(temp_html, "w") as f:
-                f.write(test_html)
-
-            # Navigate to the file
-            page.goto(f"file://{temp_html}")
 
             # Wait for component to render
-            page.wait_for_selector("#app")
+            await page.wait_for_selector("#app")
 
             # Take screenshot
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -99,58 +188,109 @@ class VisualRegressionAgent:
                 self.current_dir,
                 f"{component_name}_{timestamp}.png"
             )
-            page.screenshot(path=screenshot_path)
+            # Clip to the component's box so viewport padding stays out of the image and the diff
+            png = await page.locator("#app").screenshot(type="png", omit_background=True)
+        finally:
+            # Hand the page back; its context and the browser stay up for the next component
+            self._idle_pages.append(page)
+
+        if persist:
+            self._write_png(screenshot_path, png)
+        else:
+            self._last_shot[component_name] = (screenshot_path, png)
 
-            # Close browser
-            browser.close()
+        print(f"Screenshot captured: {screenshot_path}")
+        return screenshot_path
 
-            print(f"Screenshot captured: {screenshot_path}")
-            return screenshot_path
+    def _latest_baseline(self, component_name):
+        """Most recent baseline for one component, or None"""
+        baseline_files = [
+            f for f in os.listdir(self.baseline_dir)
+            if f.startswith(f"{component_name}_") and f.endswith(BASELINE_EXTENSIONS)
+        ]
+        if not baseline_files:
+            return None
+        baseline_files.sort(reverse=True)  # Most recent first; .webp before .png of the same run
+        return os.path.join(self.baseline_dir, baseline_files[0])
+
+    def _index_baselines(self):
+        """Map each component to its most recent baseline with a single directory scan"""
+        index = {}
+        # Names are {component}_{date}_{time}.{png,webp}, so sorted order ends on the newest
+        for f in sorted(os.listdir(self.baseline_dir)):
+            if f.endswith(BASELINE_EXTENSIONS) and f.count("_") >= 2:
+                index[f.rsplit("_", 2)[0]] = os.path.join(self.baseline_dir, f)
+        return index
+
+    def _write_png(self, path, png):
+        with open(path, "wb") as f:
+            f.write(png)
+
+    def _decode_png(self, png, flags):
+        return cv2.imdecode(np.frombuffer(png, np.uint8), flags)
 
     async def compare_with_baseline(self, component_name, threshold=0.01):
         """Compare current component with baseline"""
         print(f"Comparing {component_name} with baseline")
 
-        # Find most recent current screenshot
-        current_screenshots = [
-            f for f in os.listdir(self.current_dir)
-            if f.startswith(f"{component_name}_")
-        ]
+        # Prefer the in-memory capture; otherwise find the most recent current screenshot
+        current_path, current_png = self._last_shot.pop(component_name, (None, None))
+        if current_png is None:
+            current_screenshots = [
+                f for f in os.listdir(self.current_dir)
+                if f.startswith(f"{component_name}_")
+            ]
 
-        if not current_screenshots:
-            print(f"No current screenshots found for {component_name}")
-            return {"status": "error", "message": "No current screenshots found"}
+            if not current_screenshots:
+                print(f"No current screenshots found for {component_name}")
+                return {"status": "error", "message": "No current screenshots found"}
 
-        current_screenshots.sort(reverse=True)  # Most recent first
-        current_path = os.path.join(self.current_dir, current_screenshots[0])
+            current_screenshots.sort(reverse=True)  # Most recent first
+            current_path = os.path.join(self.current_dir, current_screenshots[0])
 
         # Find baseline screenshot
-        baseline_files = [
-            f for f in os.listdir(self.baseline_dir)
-            if f.startswith(f"{component_name}_")
-        ]
+        if self._baseline_index is not None:
+            baseline_path = self._baseline_index.get(component_name)
+        else:
+            baseline_path = self._latest_baseline(component_name)
 
-        # If no baseline exists, copy current as baseline
-        if not baseline_files:
+        current_bytes = current_png
+        if current_bytes is None:
+            with open(current_path, "rb") as f:
+                current_bytes = f.read()
+
+        # If no baseline exists, store current as baseline
+        if baseline_path is None:
             print(f"No baseline found for {component_name}, creating one")
             baseline_path = os.path.join(
                 self.baseline_dir,
-                os.path.basename(current_path)
+                os.path.splitext(os.path.basename(current_path))[0] + ".webp"
             )
-            import shutil
-            shutil.copy(current_path, baseline_path)
+            # Lossless WebP: smaller than the PNG and quicker to decode on every later comparison
+            cv2.imwrite(
+                baseline_path,
+                self._decode_png(current_bytes, cv2.IMREAD_COLOR),
+                [cv2.IMWRITE_WEBP_QUALITY, 101]
+            )
+            if self._baseline_index is not None:
+                self._baseline_index[component_name] = baseline_path
             return {"status": "baseline_created", "baseline": baseline_path}
 
-        baseline_files.sort(reverse=True)  # Most recent first
-        baseline_path = os.path.join(self.baseline_dir, baseline_files[0])
+        # Byte-identical screenshots can't differ, so skip decoding and SSIM entirely
+        baseline_mtime = os.stat(baseline_path).st_mtime_ns
+        if baseline_path.endswith(".png") and \
+                _digest(current_bytes) == _baseline_digest(baseline_path, baseline_mtime):
+            print("Similarity score: 1.0 (identical to baseline)")
+            return {"status": "match", "score": 1.0}
 
-        # Compare images
-        baseline_img = cv2.imread(baseline_path)
-        current_img = cv2.imread(current_path)
+        # Compare images; SSIM only needs luminance, so decode straight to grayscale
+        baseline_gray = _load_baseline(baseline_path, baseline_mtime)
+        current_gray = self._decode_png(current_bytes, cv2.IMREAD_GRAYSCALE)
 
-        # Convert to grayscale
-        baseline_gray = cv2.cvtColor(baseline_img, cv2.COLOR_BGR2GRAY)
-        current_gray = cv2.cvtColor(current_img, cv2.COLOR_BGR2GRAY)
+        # WebP baselines can't be byte-compared with a PNG capture; identical pixels still skip SSIM
+        if np.array_equal(baseline_gray, current_gray):
+            print("Similarity score: 1.0 (identical to baseline)")
+            return {"status": "match", "score": 1.0}
 
         # Compute SSIM between the two images
         score, diff = self._structural_similarity(baseline_gray, current_gray)
@@ -169,15 +309,20 @@ class VisualRegressionAgent:
             diff = (diff * 255).astype("uint8")
             thresh = cv2.threshold(diff, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)[1]
 
-            # Highlight differences
-            cnts = cv2.findContours(thresh.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            cnts = cnts[0] if len(cnts) == 2 else cnts[1]
-
-            # Create highlight image
-            highlight_img = current_img.copy()
-            for c in cnts:
-                x, y, w, h = cv2.boundingRect(c)
-                cv2.rectangle(highlight_img, (x, y), (x + w, y + h), (0, 0, 255), 2)
+            # Bounding boxes of the differing regions in one pass; row 0 is the background
+            _, _, stats, _ = cv2.connectedComponentsWithStats(thresh, connectivity=8)
+            boxes = stats[1:]
+            boxes = boxes[boxes[:, cv2.CC_STAT_AREA] > self.MIN_DIFF_AREA]
+
+            # Create highlight image; color is only needed for the overlay
+            if current_png is not None:
+                # Keep the screenshot that produced the diff
+                self._write_png(current_path, current_png)
+                highlight_img = self._decode_png(current_png, cv2.IMREAD_COLOR)
+            else:
+                highlight_img = cv2.imread(current_path)
+            for x, y, w, h, _ in boxes:
+                cv2.rectangle(highlight_img, (int(x), int(y)), (int(x + w), int(y + h)), (0, 0, 255), 2)
 
             cv2.imwrite(diff_path, highlight_img)
 
@@ -203,8 +348,53 @@ class VisualRegressionAgent:
             # Resize if needed
             img2 = cv2.resize(img2, (w1, h1))
 
-        # Compute SSIM
-        return ssim(img1, img2, full=True)
+        # Block-average down to ~256px on the short side before SSIM, as in the reference ssim.m
+        F = max(1, round(min(h1, w1) / 256))
+        if F > 1:
+            img1 = cv2.resize(img1, (w1 // F, h1 // F), interpolation=cv2.INTER_AREA)
+            img2 = cv2.resize(img2, (w1 // F, h1 // F), interpolation=cv2.INTER_AREA)
+
+        # Compute SSIM, on the GPU when one is available
+        if _cuda_ssim_backend() is not None:
+            score, ssim_map = self._ssim_cuda(img1, img2)
+        else:
+            score, ssim_map = self._ssim_cv2(img1, img2)
+        if F > 1:
+            # Scale the map back so diff boxes line up with the full-size screenshot
+            ssim_map = cv2.resize(ssim_map, (w1, h1), interpolation=cv2.INTER_LINEAR)
+        return score, ssim_map
+
+    def _ssim_cuda(self, img1, img2):
+        """Same 11x11 Gaussian SSIM via kornia on a CUDA device"""
+        torch, kornia = _cuda_ssim_backend()
+        t1 = torch.from_numpy(img1).to("cuda", non_blocking=True)[None, None].float() / 255.0
+        t2 = torch.from_numpy(img2).to("cuda", non_blocking=True)[None, None].float() / 255.0
+        with torch.no_grad():
+            ssim_map = kornia.metrics.ssim(t1, t2, window_size=11, max_val=1.0)
+        return ssim_map.mean().item(), ssim_map.squeeze().cpu().numpy()
+
+    def _ssim_cv2(self, img1, img2):
+        """SSIM over an 11x11 Gaussian window (sigma 1.5) using OpenCV filters"""
+        C1 = (0.01 * 255) ** 2
+        C2 = (0.03 * 255) ** 2
+
+        I1 = img1.astype(np.float32)
+        I2 = img2.astype(np.float32)
+
+        mu1 = cv2.GaussianBlur(I1, (11, 11), 1.5)
+        mu2 = cv2.GaussianBlur(I2, (11, 11), 1.5)
+        mu1_sq = mu1 * mu1
+        mu2_sq = mu2 * mu2
+        mu1_mu2 = mu1 * mu2
+
+        sigma1_sq = cv2.GaussianBlur(I1 * I1, (11, 11), 1.5) - mu1_sq
+        sigma2_sq = cv2.GaussianBlur(I2 * I2, (11, 11), 1.5) - mu2_sq
+        sigma12 = cv2.GaussianBlur(I1 * I2, (11, 11), 1.5) - mu1_mu2
+
+        ssim_map = ((2 * mu1_mu2 + C1) * (2 * sigma12 + C2)) / (
+            (mu1_sq + mu2_sq + C1) * (sigma1_sq + sigma2_sq + C2)
+        )
+        return float(ssim_map.mean()), ssim_map
 
     async def _generate_visual_diff_report(self, component_name, score, diff_path):
         """Generate AI analysis of visual differences"""
@@ -243,13 +433,26 @@ class VisualRegressionAgent:
             if f.endswith(".vue")
         ]
 
-        # Test each component
+        async def run_one(component):
+            async with self._browser_semaphore:
+                print(f"Testing component: {component}")
+                await self.capture_component_screenshot(component, persist=False)
+            return await self.compare_with_baseline(component)
+
+        # Test components concurrently, each in its own browser context
+        self._baseline_index = self._index_baselines()
+        try:
+            outcomes = await asyncio.gather(*(run_one(c) for c in components), return_exceptions=True)
+        finally:
+            self._baseline_index = None
+            await self.close()
+
         results = {}
-        for component in components:
-            print(f"Testing component: {component}")
-            await self.capture_component_screenshot(component)
-            result = await self.compare_with_baseline(component)
-            results[component] = result
+        for component, outcome in zip(components, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"Visual test failed for {component}: {outcome}")
+                outcome = {"status": "error", "message": str(outcome)}
+            results[component] = outcome
 
         # Generate summary report
         summary = await self._generate_summary_report(results)
@@ -265,17 +468,13 @@ class VisualRegressionAgent:
         print("Generating summary report")
 
         # Count results by status
-        status_counts = {}
-        for component, result in results.items():
-            status = result.get("status", "unknown")
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = Counter(result.get("status", "unknown") for result in results.values())
 
         # Format results for prompt
-        results_summary = "\n".join([
-            f"- {component}: {result.get('status', 'unknown')} " +
-            f"(score: {result.get('score', 'N/A')})"
+        results_summary = "\n".join(
+            f"- {component}: {result.get('status', 'unknown')} (score: {result.get('score', 'N/A')})"
             for component, result in results.items()
-        ])
+        )
 
         prompt = f"""
         Generate a summary report for visual regression test results:
@@ -317,6 +516,7 @@ if __name__ == "__main__":
                 print("Usage: python visual_test_agent.py capture [component_name]")
                 sys.exit(1)
             await agent.capture_component_screenshot(sys.argv[2])
+            await agent.close()
 
         elif command == "compare":
             if len(sys.argv) < 3:
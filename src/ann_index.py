@@ -0,0 +1,178 @@
+import os
+import json
+import sqlite3
+import numpy as np
+
+# usearch is optional; callers fall back to Chroma's own HNSW when it's missing
+try:
+    from usearch.index import Index, MetricKind, ScalarKind
+except ImportError:
+    Index = None
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+
+class AnnIndex:
+    """usearch HNSW over chunk embeddings, with chunk text and metadata in a SQLite sidecar"""
+
+    available = Index is not None
+
+    def __init__(self, path):
+        self.path = path
+        self.index = Index.restore(path) if os.path.exists(path) else None
+        self._db = sqlite3.connect(f"{path}.sqlite", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS chunks (key INTEGER PRIMARY KEY, document TEXT, metadata TEXT)"
+        )
+
+    def __len__(self):
+        return len(self.index) if self.index is not None else 0
+
+    def _new_index(self, ndim):
+        return Index(
+            ndim=ndim,
+            metric=MetricKind.Cos,
+            dtype=ScalarKind.F16,
+            connectivity=16,
+            expansion_add=64,
+            expansion_search=100
+        )
+
+    def rebuild(self, documents, metadatas, embeddings):
+        """Replace the index contents with the given chunks and persist both files"""
+        self._db.execute("DELETE FROM chunks")
+        if len(embeddings) == 0:
+            # Nothing to index; an empty corpus leaves no vectors to size the index by
+            self.index = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._db.commit()
+            return
+
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        self.index = self._new_index(vectors.shape[1])
+        self.index.add(np.arange(len(vectors)), vectors)
+        self.index.save(self.path)
+
+        self._db.executemany(
+            "INSERT INTO chunks (key, document, metadata) VALUES (?, ?, ?)",
+            [(i, doc, json.dumps(meta)) for i, (doc, meta) in enumerate(zip(documents, metadatas))]
+        )
+        self._db.commit()
+
+    def search(self, vector, n_results):
+        """Return (documents, metadatas) of the nearest chunks"""
+        matches = self.index.search(np.asarray(vector, dtype=np.float32), n_results)
+        keys = [int(key) for key in matches.keys]
+        if not keys:
+            return [], []
+
+        placeholders = ",".join("?" * len(keys))
+        rows = dict((key, (doc, meta)) for key, doc, meta in self._db.execute(
+            f"SELECT key, document, metadata FROM chunks WHERE key IN ({placeholders})", keys
+        ))
+        hits = [rows[key] for key in keys if key in rows]
+        return [doc for doc, _ in hits], [json.loads(meta) for _, meta in hits]
+
+
+class ExactIndex:
+    """Brute-force cosine search with a single BLAS matrix-vector product"""
+
+    # Above this a full scan per query stops being cheaper than HNSW
+    MAX_SIZE = 50_000
+
+    def __init__(self, documents, metadatas, embeddings):
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if len(vectors) == 0:
+            # Empty corpus comes in as shape (0,); search returns before touching the matrix
+            vectors = np.empty((0, 0), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.embeddings = vectors / np.where(norms == 0, 1.0, norms)
+        self.documents = list(documents)
+        self.metadatas = list(metadatas)
+
+    def __len__(self):
+        return len(self.documents)
+
+    def search(self, vector, n_results):
+        """Return (documents, metadatas) of the nearest chunks"""
+        n = min(n_results, len(self.documents))
+        if n == 0:
+            return [], []
+
+        query = np.array(vector, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        scores = self.embeddings @ query
+
+        top = np.argpartition(-scores, n - 1)[:n]
+        top = top[np.argsort(-scores[top])]
+        return [self.documents[i] for i in top], [self.metadatas[i] for i in top]
+
+
+class PQIndex:
+    """faiss product-quantized index: one byte per subquantizer, searched with ADC lookup tables"""
+
+    available = faiss is not None
+    # 8-bit codebooks have 256 centroids; faiss wants ~39 training points per centroid
+    MIN_TRAIN = 10_000
+    TRAIN_SAMPLE = 100_000
+
+    def __init__(self, path, subquantizers=96, bits=8):
+        self.path = path
+        self.ids_path = f"{path}.ids.json"
+        # Marker file rather than a flag, so every process sees writes made since the last build
+        self.stale_path = f"{path}.stale"
+        self.subquantizers = subquantizers
+        self.bits = bits
+        self.index = None
+        self.ids = []
+        if os.path.exists(path) and os.path.exists(self.ids_path):
+            self.index = faiss.read_index(path)
+            with open(self.ids_path, "r") as f:
+                self.ids = json.load(f)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def stale(self):
+        """True once vectors were added to the source collection after the last build"""
+        return os.path.exists(self.stale_path)
+
+    def mark_stale(self):
+        with open(self.stale_path, "a"):
+            pass
+
+    def build(self, ids, embeddings):
+        """Train codebooks on a sample, encode every vector and persist; False if too few vectors"""
+        # Also covers an empty corpus, which has no dimension to build an IndexPQ with
+        if len(ids) == 0 or len(ids) < self.MIN_TRAIN:
+            return False
+
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        # Unit vectors make the L2 ranking match cosine similarity
+        faiss.normalize_L2(vectors)
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(len(vectors), min(len(vectors), self.TRAIN_SAMPLE), replace=False)]
+
+        index = faiss.IndexPQ(vectors.shape[1], self.subquantizers, self.bits)
+        index.train(sample)
+        index.add(vectors)
+
+        faiss.write_index(index, self.path)
+        with open(self.ids_path, "w") as f:
+            json.dump(list(ids), f)
+        self.index, self.ids = index, list(ids)
+        if os.path.exists(self.stale_path):
+            os.remove(self.stale_path)
+        return True
+
+    def search(self, vector, n_results):
+        """Return the ids of the nearest vectors, nearest first"""
+        query = np.array([vector], dtype=np.float32)
+        faiss.normalize_L2(query)
+        _, neighbors = self.index.search(query, n_results)
+        return [self.ids[i] for i in neighbors[0] if i >= 0]
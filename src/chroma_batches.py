@@ -0,0 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor
+
+# Rows per collection.add request; one giant add serializes everything into a single payload
+ADD_BATCH_SIZE = 5000
+# Batches in flight at once; the Chroma server handles concurrent adds
+ADD_WORKERS = 4
+
+
+def add_in_batches(collection, documents, metadatas, ids, embeddings, batch_size=ADD_BATCH_SIZE):
+    """Add precomputed chunks to a collection in fixed-size batches, several at a time"""
+    def add(start):
+        end = start + batch_size
+        collection.add(
+            documents=documents[start:end],
+            embeddings=embeddings[start:end],
+            metadatas=metadatas[start:end],
+            ids=ids[start:end]
+        )
+
+    with ThreadPoolExecutor(max_workers=ADD_WORKERS) as executor:
+        # list() re-raises the first failed batch
+        list(executor.map(add, range(0, len(ids), batch_size)))
+
+
+def delete_stale_chunks(collection, metadatas, ids):
+    """Delete stored chunks of the given sources whose ids aren't in the current set; returns the count"""
+    current = set(ids)
+    sources = sorted({meta.get("source") for meta in metadatas if meta.get("source")})
+    if not sources:
+        return 0
+
+    # Content-hash ids change with the content, so a re-indexed file leaves its old chunks behind
+    stored = collection.get(where={"source": {"$in": sources}}, include=[])
+    stale = [chunk_id for chunk_id in stored["ids"] if chunk_id not in current]
+    for start in range(0, len(stale), ADD_BATCH_SIZE):
+        collection.delete(ids=stale[start:start + ADD_BATCH_SIZE])
+    return len(stale)
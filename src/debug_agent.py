@@ -1,4 +1,5 @@
 import sys
+import re
 import traceback
 import importlib
 
@@ -34,19 +35,24 @@ class DebugAgent:
         return await self.c.complete(prompt)
 
     def _identify_error_type(self, traceback_str):
-        for pattern, error_type in self.error_patterns.items():
-            if pattern in traceback_str:
-                return error_type
-        return "unknown_error"
+        match = self.error_patterns.match(traceback_str)
+        # Groups are in priority order, so the first one that matched wins, wherever it appears
+        return next((error_type for error_type, found in match.groupdict().items() if found is not None),
+                    "unknown_error")
 
     def _load_error_patterns(self):
-        return {
+        patterns = {
             "Cannot read properties of undefined": "null_pointer",
             "is not a function": "type_error",
             "Unexpected token": "syntax_error",
             "Failed to resolve component": "vue_component_error",
             "404 (Not Found)": "api_error"
         }
+        # One optional lookahead per pattern, anchored at the start: a single match call
+        # reports every error type present, not just the one that occurs first in the text
+        return re.compile("".join(
+            f"(?=.*?(?P<{error_type}>{re.escape(pattern)}))?" for pattern, error_type in patterns.items()
+        ), re.DOTALL)
 
     def watch_console(self):
         original_error = console.error
@@ -2,13 +2,32 @@ import requests
 from bs4 import BeautifulSoup
 import markdown
 import platform
-from langchain.document_loaders import WebBaseLoader, PDFMinerLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.document_loaders import PDFMinerLoader
+from text_splitter import make_text_splitter
+from langchain.docstore.document import Document
 import chromadb
 import os
+import hashlib
+import mmap
 import argparse
+import asyncio
+import httpx
+
+# selectolax is much faster at HTML-to-text; fall back to BeautifulSoup (lxml if present)
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+    try:
+        import lxml  # noqa: F401
+        BS4_PARSER = "lxml"
+    except ImportError:
+        BS4_PARSER = "html.parser"
 
 class ExternalDocIndexer:
+    # Upper bound on chunks sent to Chroma in one add() call
+    ADD_BATCH_SIZE = 1000
+
     def __init__(self):
         """Initialize document indexer"""
         # Configure for different platforms
@@ -16,79 +35,134 @@ class ExternalDocIndexer:
 
         self.client = chromadb.HttpClient(host=CHROMA_HOST, port=8000)
         self.collection = self.client.get_or_create_collection("external_docs")
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            separators=["\n\n", "\n", " ", ""]
-        )
+        self.splitter = make_text_splitter(chunk_size=1000, chunk_overlap=200)
 
     def index_vue_docs(self):
         """Index Vue.js documentation"""
         print("Indexing Vue.js documentation...")
-        loader = WebBaseLoader([
+        docs = self._load_urls([
             "https://vuejs.org/guide/introduction",
             "https://vuejs.org/guide/typescript/overview",
             "https://vuejs.org/api/composition-api",
             "https://vuejs.org/guide/components/props"
         ])
-        docs = loader.load()
-        chunks = self.splitter.split_documents(docs)
-        self._add_to_collection(chunks, "vue")
-        print(f"Added {len(chunks)} Vue.js documentation chunks")
+        added = self._index_documents(docs, "vue")
+        print(f"Added {added} Vue.js documentation chunks")
 
     def index_tailwind_docs(self):
         """Index Tailwind CSS documentation"""
         print("Indexing Tailwind CSS documentation...")
-        loader = WebBaseLoader([
+        docs = self._load_urls([
             "https://tailwindcss.com/docs/installation",
             "https://tailwindcss.com/docs/responsive-design",
             "https://tailwindcss.com/docs/flex",
             "https://tailwindcss.com/docs/grid-template-columns"
         ])
-        docs = loader.load()
-        chunks = self.splitter.split_documents(docs)
-        self._add_to_collection(chunks, "tailwind")
-        print(f"Added {len(chunks)} Tailwind CSS documentation chunks")
+        added = self._index_documents(docs, "tailwind")
+        print(f"Added {added} Tailwind CSS documentation chunks")
+
+    def _load_urls(self, urls):
+        """Fetch doc pages concurrently and return them as documents"""
+        return asyncio.run(self._fetch_all(urls))
+
+    async def _fetch_all(self, urls):
+        semaphore = asyncio.Semaphore(8)
+
+        async with httpx.AsyncClient(http2=True, follow_redirects=True, timeout=30) as client:
+            async def fetch(url):
+                async with semaphore:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    return response.text
+
+            pages = await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+
+        docs = []
+        for url, page in zip(urls, pages):
+            if isinstance(page, Exception):
+                print(f"Error fetching {url}: {page}")
+                continue
+            docs.append(Document(page_content=self._html_to_text(page), metadata={"source": url}))
+        return docs
 
     def index_custom_docs(self, paths):
         """Index local documentation files"""
         print("Indexing custom documentation...")
         for path in paths:
             if path.endswith(".md"):
-                with open(path, 'r') as f:
-                    content = f.read()
-                    html = markdown.markdown(content)
-                    soup = BeautifulSoup(html, 'html.parser')
-                    text = soup.get_text()
-                    chunks = self.splitter.split_text(text)
-                    self._add_to_collection(
-                        [{"page_content": chunk, "metadata": {"source": path}} for chunk in chunks],
-                        "custom"
-                    )
+                content = self._read_text_mmap(path)
+                html = markdown.markdown(content)
+                text = self._html_to_text(html)
+                self._index_documents([Document(page_content=text, metadata={"source": path})], "custom")
             elif path.endswith(".pdf"):
                 loader = PDFMinerLoader(path)
                 docs = loader.load()
-                chunks = self.splitter.split_documents(docs)
-                self._add_to_collection(chunks, "custom")
+                self._index_documents(docs, "custom")
         print("Custom documentation indexed")
 
-    def _add_to_collection(self, chunks, doc_type):
-        """Add chunks to collection"""
+    def _html_to_text(self, html):
+        """Extract plain text from rendered markdown"""
+        if HTMLParser is not None:
+            return HTMLParser(html).text(separator=' ')
+        return BeautifulSoup(html, BS4_PARSER).get_text()
+
+    def _read_text_mmap(self, path):
+        """Read a UTF-8 file through a read-only mmap so pages come from the OS cache"""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""  # mmap can't map an empty file
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm[:].decode('utf-8')
+
+    def _index_documents(self, docs, doc_type):
+        """Split and add documents whose content isn't indexed yet; returns the number of new chunks"""
+        added = 0
+        for doc in docs:
+            content_hash = hashlib.blake2b(doc.page_content.encode("utf-8")).hexdigest()[:16]
+            if self.collection.get(where={"content_hash": content_hash}, limit=1)["ids"]:
+                print(f"Skipping unchanged {doc.metadata.get('source', 'document')}")
+                continue
+            source = doc.metadata.get("source")
+            if source:
+                # The content changed, so the chunks of its previous version are stale
+                self.collection.delete(where={"source": source})
+            chunks = self.splitter.split_documents([doc])
+            self._add_to_collection(chunks, doc_type, content_hash)
+            added += len(chunks)
+        return added
+
+    def _add_to_collection(self, chunks, doc_type, content_hash):
+        """Add chunks to collection in batches"""
+        documents, metadatas, ids = [], [], []
         for i, chunk in enumerate(chunks):
-            try:
-                if isinstance(chunk, dict):
-                    self.collection.add(
-                        documents=[chunk["page_content"]],
-                        metadatas=[{"source": chunk["metadata"].get("source", "unknown"), "type": doc_type}],
-                        ids=[f"{doc_type}_{i}"]
-                    )
-                else:
-                    self.collection.add(
-                        documents=[chunk.page_content],
-                        metadatas=[{"source": chunk.metadata.get("source", "unknown"), "type": doc_type}],
-                        ids=[f"{doc_type}_{i}"]
-                    )
-            except Exception as e:
-                print(f"Error adding document: {e}")
+            if isinstance(chunk, dict):
+                content, metadata = chunk["page_content"], chunk["metadata"]
+            else:
+                content, metadata = chunk.page_content, chunk.metadata
+            documents.append(content)
+            metadatas.append({
+                "source": metadata.get("source", "unknown"),
+                "type": doc_type,
+                "content_hash": content_hash
+            })
+            # Ids include the content hash so different sources never overwrite each other
+            ids.append(f"{doc_type}_{content_hash}_{i}")
+
+        for start in range(0, len(ids), self.ADD_BATCH_SIZE):
+            end = start + self.ADD_BATCH_SIZE
+            self._add_batch(documents[start:end], metadatas[start:end], ids[start:end])
+
+    def _add_batch(self, documents, metadatas, ids):
+        """Add one batch; on failure, split it in half to isolate the bad chunk"""
+        try:
+            self.collection.add(documents=documents, metadatas=metadatas, ids=ids)
+        except Exception as e:
+            if len(ids) == 1:
+                print(f"Error adding document {ids[0]}: {e}")
+                return
+            mid = len(ids) // 2
+            self._add_batch(documents[:mid], metadatas[:mid], ids[:mid])
+            self._add_batch(documents[mid:], metadatas[mid:], ids[mid:])
 
     def query_docs(self, question, n_results=3):
         """Query documentation"""
@@ -0,0 +1,69 @@
+import os
+import msgpack
+import zmq
+import zmq.asyncio
+from ollama_embeddings import get_embedding_function
+
+EMBED_WORKER_ADDRESS = os.getenv("EMBED_WORKER_ADDRESS", "ipc:///tmp/aleph-embed.sock")
+# How long a query waits for others to share its batch
+BATCH_WINDOW_MS = 2
+MAX_BATCH = 64
+
+
+def serve(address=EMBED_WORKER_ADDRESS):
+    """Answer embedding requests, folding queries that arrive together into one batch"""
+    embedding_fn = get_embedding_function()
+    socket = zmq.Context.instance().socket(zmq.ROUTER)
+    socket.bind(address)
+    poller = zmq.Poller()
+    poller.register(socket, zmq.POLLIN)
+    print(f"Embedding worker listening on {address}")
+
+    while True:
+        # Frames are [identity, empty delimiter, payload] from a REQ client
+        pending = [socket.recv_multipart()]
+        while len(pending) < MAX_BATCH and poller.poll(BATCH_WINDOW_MS):
+            pending.append(socket.recv_multipart())
+
+        texts = [msgpack.unpackb(frames[-1]) for frames in pending]
+        try:
+            vectors = embedding_fn(texts)
+        except Exception as e:
+            print(f"Embedding batch of {len(texts)} failed: {e}")
+            vectors = [None] * len(texts)
+
+        for frames, vector in zip(pending, vectors):
+            socket.send_multipart(frames[:-1] + [msgpack.packb(vector)])
+
+
+class EmbeddingWorkerClient:
+    """Async client for the embedding worker; REQ sockets are pooled, one per in-flight query"""
+
+    def __init__(self, address=EMBED_WORKER_ADDRESS, timeout_ms=5000):
+        self.address = address
+        self.timeout_ms = timeout_ms
+        self.context = zmq.asyncio.Context.instance()
+        self._idle = []
+
+    def _connect(self):
+        socket = self.context.socket(zmq.REQ)
+        socket.connect(self.address)
+        return socket
+
+    async def embed(self, text):
+        socket = self._idle.pop() if self._idle else self._connect()
+        await socket.send(msgpack.packb(text))
+        if not await socket.poll(self.timeout_ms):
+            # A REQ socket stuck waiting for a reply can't be reused
+            socket.close(linger=0)
+            raise TimeoutError(f"Embedding worker at {self.address} did not answer")
+
+        vector = msgpack.unpackb(await socket.recv())
+        self._idle.append(socket)
+        if vector is None:
+            raise RuntimeError("Embedding worker failed to embed the query")
+        return vector
+
+
+if __name__ == "__main__":
+    serve()
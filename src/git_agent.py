@@ -2,6 +2,7 @@ import subprocess
 import os
 import json
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import importlib
 
 try:
@@ -10,6 +11,11 @@ except ModuleNotFoundError:
     class Continue:
         async def complete(self, *args, **kwargs):
             raise RuntimeError("Continue package is not installed")
+# pygit2 runs status/diff/add/commit in-process; without it every call shells out to git
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
 from agents.agent_controller import AgentController
 from verification.orchestrator import VerificationPipeline
 
@@ -23,6 +29,7 @@ class GitAgent:
         self.c = Continue()
         self.agent = AgentController()
         self.verifier = VerificationPipeline()
+        self._repo = None  # pygit2.Repository once the clone exists
 
         # Credential handling
         self.git_user = os.getenv("GIT_USER", "ai-dev-bot")
@@ -34,12 +41,13 @@ class GitAgent:
             return self.repo_url.split("/")[-1][:-4]
         return self.repo_url.split("/")[-1]
 
-    def _run_git_command(self, command):
+    def _run_git_command(self, command, input=None):
         """Execute git command with error handling"""
         try:
             result = subprocess.run(
                 ["git"] + command,
                 cwd=self.repo_path,
+                input=input,
                 capture_output=True,
                 text=True,
                 check=True
@@ -61,8 +69,13 @@ class GitAgent:
             self.c.log_info(f"Updated repository: {self.repo_name}")
 
         # Configure git identity
-        self._run_git_command(["config", "user.name", self.git_user])
-        self._run_git_command(["config", "user.email", self.git_email])
+        if pygit2 is not None:
+            self._repo = pygit2.Repository(str(self.repo_path))
+            self._repo.config["user.name"] = self.git_user
+            self._repo.config["user.email"] = self.git_email
+        else:
+            self._run_git_command(["config", "user.name", self.git_user])
+            self._run_git_command(["config", "user.email", self.git_email])
 
         return self.repo_path
 
@@ -73,13 +86,37 @@ class GitAgent:
 
     def get_changed_files(self):
         """Get list of modified files"""
-        status = self._run_git_command(["status", "--porcelain"])
-        return [line[3:] for line in status.split("\n") if line]
-
-    def generate_commit_message(self):
+        return list(self._changed_status())
+
+    def _changed_status(self):
+        """Changed paths mapped to their pygit2 status flags, or to None without pygit2"""
+        if self._repo is not None:
+            # pygit2 < 1.14 reports ignored paths (node_modules/, .env) unless filtered out
+            return {
+                path: flags for path, flags in self._repo.status().items()
+                if not flags & pygit2.GIT_STATUS_IGNORED
+            }
+        # NUL-separated v2 output keeps paths with spaces or quotes intact
+        status = self._run_git_command(["status", "--porcelain=v2", "-z"])
+        entries = iter(status.split("\0"))
+        files = {}
+        for entry in entries:
+            if entry.startswith("1 "):
+                files[entry.split(" ", 8)[8]] = None
+            elif entry.startswith("2 "):
+                files[entry.split(" ", 9)[9]] = None
+                next(entries, None)  # Rename/copy source path
+            elif entry.startswith("u "):
+                files[entry.split(" ", 10)[10]] = None
+            elif entry.startswith("? "):
+                files[entry[2:]] = None
+        return files
+
+    def generate_commit_message(self, changed_files=None):
         """AI-generated commit message based on changes"""
-        changed_files = self.get_changed_files()
-        diff = self._run_git_command(["diff", "--staged"])
+        if changed_files is None:
+            changed_files = self.get_changed_files()
+        diff = self._staged_diff()
 
         prompt = f"""
         Write a professional Git commit message based on these changes:
@@ -106,17 +143,52 @@ class GitAgent:
 
     def commit_changes(self, message=None):
         """Commit changes with AI-generated message"""
-        # Stage all changes
-        self._run_git_command(["add", "."])
+        # Stage all changes; one status scan serves staging and the message
+        status = self._changed_status()
+        self._stage_changes(status)
 
         # Generate message if not provided
         if not message:
-            message = self.generate_commit_message()
+            message = self.generate_commit_message(list(status))
 
         # Commit
-        self._run_git_command(["commit", "-m", message])
+        if self._repo is not None:
+            signature = pygit2.Signature(self.git_user, self.git_email)
+            tree = self._repo.index.write_tree()
+            parents = [] if self._repo.head_is_unborn else [self._repo.head.target]
+            self._repo.create_commit("HEAD", signature, signature, message, tree, parents)
+        else:
+            self._run_git_command(["commit", "-m", message])
         return message
 
+    def _staged_diff(self):
+        """Diff of the index against HEAD"""
+        if self._repo is not None and not self._repo.head_is_unborn:
+            return self._repo.diff("HEAD", cached=True).patch or ""
+        return self._run_git_command(["diff", "--staged"])
+
+    def _stage_changes(self, status):
+        """Stage just the changed paths from a _changed_status scan, deletions included"""
+        if not status:
+            return
+        if self._repo is None:
+            self._run_git_command(
+                ["add", "-A", "--pathspec-from-file=-", "--pathspec-file-nul"],
+                input="\0".join(status)
+            )
+            return
+        index = self._repo.index
+        for path, flags in status.items():
+            if flags & pygit2.GIT_STATUS_WT_DELETED:
+                if path in index:
+                    index.remove(path)
+            elif flags & pygit2.GIT_STATUS_INDEX_DELETED and not flags & pygit2.GIT_STATUS_WT_NEW:
+                # Deletion is already staged and there's no file to add
+                continue
+            else:
+                index.add(path)
+        index.write()
+
     def push_changes(self, branch=None):
         """Push changes to remote repository"""
         branch = branch or self.branch
@@ -184,41 +256,65 @@ class GitAgent:
 
     def verify_changes(self):
         """Run verification on all changed files"""
-        changed_files = self.get_changed_files()
         verification_results = {}
 
-        for file in changed_files:
+        # pygit2 handles aren't safe to share across threads, so read everything here
+        jobs = []
+        for file, flags in self._changed_status().items():
             file_path = self.repo_path / file
-            if file_path.exists():
-                with open(file_path, "r") as f:
-                    content = f.read()
-
-                # Determine file type
-                if file.endswith(".vue"):
-                    file_type = "vue"
-                    requirements = self._get_vue_requirements(file)
-                elif file.endswith(".ts"):
-                    file_type = "typescript"
-                    requirements = self._get_ts_requirements(file)
-                else:
-                    continue
-
-                # Verify file
-                result = self.verifier.verify(
-                    content,
-                    requirements,
-                    context=self.agent.knowledge.query_codebase(file)
-                )
-                verification_results[file] = result
-
-                # Correct if needed
-                if not result["verified"]:
-                    corrected = self.verifier.generate_corrections(result)
-                    with open(file_path, "w") as f:
-                        f.write(corrected)
+            if not file_path.exists():
+                continue
+
+            # Determine file type
+            if file.endswith(".vue"):
+                requirements = self._get_vue_requirements(file)
+            elif file.endswith(".ts"):
+                requirements = self._get_ts_requirements(file)
+            else:
+                continue
+
+            jobs.append((file, file_path, self._read_changed_file(file, file_path, flags), requirements))
+
+        # Verification is LLM-bound, so overlap the requests
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {executor.submit(self._verify_one, *job): job[0] for job in jobs}
+            for future in as_completed(futures):
+                verification_results[futures[future]] = future.result()
 
         return verification_results
 
+    def _verify_one(self, file, file_path, content, requirements):
+        """Verify one changed file and write corrections"""
+        # Verify file
+        # Runs on a worker thread, so each file's pipeline gets its own event loop
+        result = self.verifier.verify(
+            content,
+            requirements,
+            context=self.agent.knowledge.query_codebase(file)
+        )
+
+        # Correct if needed
+        if not result["verified"]:
+            corrected = self.verifier.generate_corrections(result)
+            with open(file_path, "w") as f:
+                f.write(corrected)
+
+        return result
+
+    def _read_changed_file(self, file, file_path, flags=None):
+        """Read staged content from the object database, falling back to disk"""
+        if self._repo is not None and file in self._repo.index:
+            if flags is None:
+                flags = self._repo.status_file(file)
+            unstaged = pygit2.GIT_STATUS_WT_NEW | pygit2.GIT_STATUS_WT_MODIFIED | pygit2.GIT_STATUS_WT_TYPECHANGE
+            # Only when the working tree matches the index, otherwise we'd verify stale content
+            if not flags & unstaged:
+                blob = self._repo[self._repo.index[file].id]
+                return blob.data.decode("utf-8", errors="replace")
+
+        with open(file_path, "r") as f:
+            return f.read()
+
     def _get_vue_requirements(self, file_path):
         """Extract requirements from Vue file context"""
         # In a real implementation, this would parse component metadata
@@ -1,13 +1,24 @@
 import chromadb
 from chromadb.utils.embedding_functions import MultiModalEmbeddingFunction
-import requests
+from ollama_embeddings import get_embedding_function
+from ann_index import PQIndex
+import asyncio
+import httpx
+import numpy as np
 from PIL import Image
 import io
+import mmap
+import os
+
+# Short side of the image embedder's input; larger images are shrunk before embedding
+IMAGE_EMBED_SIZE = 224
+# Image downloads in flight at once
+IMAGE_FETCH_CONCURRENCY = 8
 
 class KnowledgeHub:
     def __init__(self):
         self.client = chromadb.PersistentClient(path="./knowledge_db")
-        self.text_embedder = OllamaEmbeddingFunction(model="nomic-embed-text")
+        self.text_embedder = get_embedding_function()
         self.image_embedder = MultiModalEmbeddingFunction()
 
         self.collections = {
@@ -16,6 +27,8 @@ class KnowledgeHub:
             "designs": self.client.get_or_create_collection("designs", embedding_function=self.image_embedder),
             "decisions": self.client.get_or_create_collection("decisions", embedding_function=self.text_embedder)
         }
+        # Compressed search copy of the code collection; queries fall back to Chroma until it's built
+        self.pq_index = PQIndex("./knowledge_db/pq.codebook") if PQIndex.available else None
 
     def index_resource(self, resource_path, resource_type):
         if resource_type == "code":
@@ -28,41 +41,99 @@ class KnowledgeHub:
             self._index_meeting_transcript(resource_path)
 
     def _index_code(self, file_path):
-        with open(file_path, "r") as f:
-            content = f.read()
+        content = self._read_source(file_path)
         self.collections["code"].add(
             documents=[content],
             metadatas=[{"path": file_path, "language": file_path.split(".")[-1]}],
             ids=[file_path]
         )
+        if self.pq_index is not None:
+            # The codebook doesn't know this file; query Chroma until it's rebuilt
+            self.pq_index.mark_stale()
+
+    @staticmethod
+    def _read_source(file_path):
+        """Decode a source file straight from its page-cache mapping"""
+        with open(file_path, "rb") as f:
+            # Zero-length files can't be mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as mm:
+                return str(mm, "utf-8", "replace")
 
     def _index_markdown(self, file_path):
         pass
 
     def _index_image(self, image_path):
-        if image_path.startswith("http"):
-            response = requests.get(image_path)
-            image = Image.open(io.BytesIO(response.content))
-        else:
-            image = Image.open(image_path)
+        image_paths = [image_path] if isinstance(image_path, str) else list(image_path)
+        images = asyncio.run(self._load_images(image_paths))
 
         self.collections["designs"].add(
-            images=[image],
-            metadatas=[{"source": image_path}],
-            ids=[image_path]
+            images=images,
+            metadatas=[{"source": path} for path in image_paths],
+            ids=image_paths
         )
 
+    async def _load_images(self, image_paths):
+        """Download concurrently and decode in worker threads so both overlap"""
+        semaphore = asyncio.Semaphore(IMAGE_FETCH_CONCURRENCY)
+
+        async with httpx.AsyncClient(timeout=60, follow_redirects=True) as client:
+            async def load(path):
+                if not path.startswith("http"):
+                    return await asyncio.to_thread(self._prepare_image, path)
+                async with semaphore:
+                    response = await client.get(path)
+                response.raise_for_status()
+                return await asyncio.to_thread(self._prepare_image, io.BytesIO(response.content))
+
+            return await asyncio.gather(*(load(path) for path in image_paths))
+
+    @staticmethod
+    def _prepare_image(source):
+        image = Image.open(source)
+        # Let the JPEG decoder downscale in the DCT domain instead of decoding full size
+        image.draft("RGB", (IMAGE_EMBED_SIZE, IMAGE_EMBED_SIZE))
+        image = image.convert("RGB")
+
+        scale = IMAGE_EMBED_SIZE / min(image.size)
+        if scale < 1:
+            size = (round(image.width * scale), round(image.height * scale))
+            image = image.resize(size, Image.BICUBIC)
+        return np.asarray(image)
+
     def _index_meeting_transcript(self, transcript_path):
         pass
 
+    def build_quantized_index(self):
+        """Product-quantize the code collection's embeddings for text queries"""
+        if self.pq_index is None:
+            return False
+        records = self.collections["code"].get(include=["embeddings"])
+        return self.pq_index.build(records["ids"], records["embeddings"])
+
     def query(self, query, modality="text", n_results=5):
         if modality == "text":
+            if self.pq_index is not None and len(self.pq_index) and not self.pq_index.stale:
+                return self._query_quantized(query, n_results)
             return self.collections["code"].query(query_texts=[query], n_results=n_results)
         elif modality == "image":
             return self.collections["designs"].query(query_images=[query], n_results=n_results)
         elif modality == "multimodal":
             pass
 
+    def _query_quantized(self, query, n_results):
+        ids = self.pq_index.search(self.text_embedder([query])[0], n_results)
+        records = self.collections["code"].get(ids=ids, include=["documents", "metadatas"])
+        by_id = dict(zip(records["ids"], zip(records["documents"], records["metadatas"])))
+        ids = [i for i in ids if i in by_id]
+        # Same nested shape as collection.query results
+        return {
+            "ids": [ids],
+            "documents": [[by_id[i][0] for i in ids]],
+            "metadatas": [[by_id[i][1] for i in ids]]
+        }
+
     def generate_knowledge_graph(self):
         pass
 
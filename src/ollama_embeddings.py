@@ -0,0 +1,124 @@
+import os
+import asyncio
+import functools
+import weakref
+import platform
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from chromadb.utils.embedding_functions import OllamaEmbeddingFunction
+
+# Texts per /api/embed request; raise to 128 on CUDA hosts
+EMBED_BATCH_SIZE = int(os.getenv("OLLAMA_EMBED_BATCH_SIZE", "32"))
+# Batches in flight at once when embedding asynchronously
+EMBED_CONCURRENCY = int(os.getenv("OLLAMA_EMBED_CONCURRENCY", "8"))
+OLLAMA_URL = os.getenv(
+    "OLLAMA_URL",
+    "http://localhost:11434" if platform.system() == "Darwin" else "http://ollama:11434"
+)
+
+
+class BatchedOllamaEmbeddingFunction(OllamaEmbeddingFunction):
+    """Chroma embedding function that sends whole batches to Ollama's /api/embed"""
+
+    def __init__(self, model_name="nomic-embed-text", url="http://localhost:11434",
+                 batch_size=EMBED_BATCH_SIZE, timeout=60):
+        self.base_url = url.rstrip("/")
+        super().__init__(url=f"{self.base_url}/api/embeddings", model_name=model_name)
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+        # Persistent keep-alive connections shared by every batch
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # httpx clients are bound to the loop that opened their connections, so one per loop
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def _async_client(self):
+        """The running loop's keep-alive AsyncClient, created on first use"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = self._async_clients[loop] = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=EMBED_CONCURRENCY),
+                timeout=self.timeout
+            )
+        return client
+
+    async def aclose(self):
+        """Close the running loop's AsyncClient, if one was opened"""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def __call__(self, input):
+        texts = input if isinstance(input, list) else [input]
+        embeddings = []
+        for start in range(0, len(texts), self.batch_size):
+            embeddings.extend(self._embed_batch(texts[start:start + self.batch_size]))
+        return embeddings
+
+    async def aembed(self, texts, concurrency=EMBED_CONCURRENCY):
+        """Embed texts with several /api/embed batches in flight; order matches the input"""
+        semaphore = asyncio.Semaphore(concurrency)
+        # Reused across calls, so per-query embeds don't pay for a new connection each time
+        client = self._async_client()
+
+        async def embed(batch):
+            async with semaphore:
+                response = await client.post(
+                    f"{self.base_url}/api/embed",
+                    json={"model": self.model_name, "input": batch}
+                )
+                data = response.json() if response.is_success else {}
+            if "embeddings" in data:
+                return data["embeddings"]
+            # Older Ollama server; fall back to the blocking per-text endpoint
+            return await asyncio.to_thread(lambda: [self._embed_one(text) for text in batch])
+
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(embed(batch) for batch in batches))
+
+        return [embedding for batch in results for embedding in batch]
+
+    def embed_concurrently(self, texts):
+        """Synchronous entry point for aembed"""
+        async def run():
+            try:
+                return await self.aembed(texts)
+            finally:
+                # asyncio.run's loop ends here, and its client with it
+                await self.aclose()
+
+        return asyncio.run(run())
+
+    def _embed_batch(self, batch):
+        response = self.session.post(
+            f"{self.base_url}/api/embed",
+            json={"model": self.model_name, "input": batch},
+            timeout=self.timeout
+        )
+        data = response.json() if response.ok else {}
+        if "embeddings" in data:
+            return data["embeddings"]
+
+        # Older Ollama servers only have the one-text-per-request endpoint
+        return [self._embed_one(text) for text in batch]
+
+    def _embed_one(self, text):
+        response = self.session.post(
+            f"{self.base_url}/api/embeddings",
+            json={"model": self.model_name, "prompt": text},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()["embedding"]
+
+
+@functools.cache
+def get_embedding_function(model_name="nomic-embed-text", url=OLLAMA_URL):
+    """Process-wide embedding function, so every collection shares one session and connection pool"""
+    return BatchedOllamaEmbeddingFunction(model_name=model_name, url=url)
@@ -2,7 +2,8 @@ from fastapi import FastAPI, Security, HTTPException, Request
 from fastapi.security import APIKeyHeader
 import uvicorn
 import os
-from rag_server import collection  # Import collection from main RAG server
+import asyncio
+from rag_server import get_collection, embed_query  # Shared collection from the main RAG server
 
 app = FastAPI()
 API_KEY_NAME = "X-API-KEY"
@@ -27,8 +28,10 @@ async def rag_query(
     query = data.get("query", "")
     n_results = data.get("n_results", 5)
 
-    results = collection.query(
-        query_texts=[query],
+    query_embedding = await embed_query(query)
+    results = await asyncio.to_thread(
+        get_collection().query,
+        query_embeddings=[query_embedding],
         n_results=n_results
     )
 
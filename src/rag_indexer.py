@@ -1,10 +1,11 @@
 import os
-import platform
 import chromadb
 from langchain_community.document_loaders import DirectoryLoader
 from langchain_community.embeddings import OllamaEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from chromadb.utils.embedding_functions import OllamaEmbeddingFunction
+from text_splitter import make_text_splitter
+from ollama_embeddings import get_embedding_function
+from chroma_batches import add_in_batches, delete_stale_chunks
+from split_cache import split_documents_cached
 import argparse
 from knowledge_manager import knowledge_hub
 
@@ -20,10 +21,7 @@ def index_codebase(include_docs=None, include_external=None, reindex=False):
     print(f"Indexing codebase{'with docs' if include_docs else ''}...")
 
     # Platform-adaptive embedding function
-    embedding_fn = OllamaEmbeddingFunction(
-        model_name="nomic-embed-text",
-        url="http://localhost:11434" if platform.system() == "Darwin" else "http://ollama:11434"
-    )
+    embedding_fn = get_embedding_function()
 
     client = chromadb.PersistentClient(path="./chroma_db")
 
@@ -63,24 +61,31 @@ def index_codebase(include_docs=None, include_external=None, reindex=False):
         docs.extend(web_loader.load())
 
     # Split text into chunks
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200
-    )
-
-    chunks = text_splitter.split_documents(docs)
-
-    # Add to collection
-    collection.add(
-        documents=[doc.page_content for doc in chunks],
-        metadatas=[doc.metadata for doc in chunks],
-        ids=[f"id_{i}" for i in range(len(chunks))]
-    )
+    text_splitter = make_text_splitter(chunk_size=1000, chunk_overlap=200)
+
+    chunks, ids = split_documents_cached(text_splitter, docs)
+    stale = delete_stale_chunks(collection, [chunk.metadata for chunk in chunks], ids)
+
+    # Ids are content hashes, so chunks already in the collection are unchanged
+    present = set(collection.get(ids=ids, include=[])["ids"]) if ids else set()
+    new_chunks = [(chunk, chunk_id) for chunk, chunk_id in zip(chunks, ids) if chunk_id not in present]
+
+    if new_chunks:
+        # Embed concurrently and hand Chroma the vectors so it skips its own embedding pass
+        documents = [chunk.page_content for chunk, _ in new_chunks]
+        add_in_batches(
+            collection,
+            documents,
+            [chunk.metadata for chunk, _ in new_chunks],
+            [chunk_id for _, chunk_id in new_chunks],
+            embedding_fn.embed_concurrently(documents)
+        )
 
     # Index resources using KnowledgeHub
     knowledge_hub.index_resource(project_src, "code")
+    knowledge_hub.build_quantized_index()
 
-    print(f"Indexed {len(chunks)} code/documentation chunks")
+    print(f"Indexed {len(chunks)} code/documentation chunks ({len(new_chunks)} new, {stale} stale removed)")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Index codebase for RAG system')
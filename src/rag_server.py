@@ -1,27 +1,55 @@
 import chromadb
-from chromadb.utils.embedding_functions import OllamaEmbeddingFunction
+from ollama_embeddings import get_embedding_function
+from ann_index import AnnIndex, ExactIndex
+from chroma_batches import add_in_batches, delete_stale_chunks
+from split_cache import split_documents_cached
 from langchain_community.document_loaders import DirectoryLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from text_splitter import make_text_splitter
 from fastapi import FastAPI, Request
 import uvicorn
 import os
+import json
+import functools
+import hashlib
+import asyncio
 from knowledge_manager import knowledge_hub
 from debug_agent import DebugAgent
 from security_agent import SecurityAgent
 
 app = FastAPI()
 
-# Initialize ChromaDB client
-client = chromadb.HttpClient(host="chromadb", port=8000)
-embedding_fn = OllamaEmbeddingFunction(
-    model_name="nomic-embed-text",
-    url="http://ollama:11434"
-)
+embedding_fn = get_embedding_function(url="http://ollama:11434")
 
-collection = client.get_or_create_collection(
-    "codebase",
-    embedding_function=embedding_fn
-)
+@functools.cache
+def get_client():
+    """Process-wide ChromaDB client, created on first use"""
+    return chromadb.HttpClient(host="chromadb", port=8000)
+
+@functools.cache
+def get_collection():
+    """The codebase collection, shared by every handler and by rag_auth"""
+    return get_client().get_or_create_collection(
+        "codebase",
+        embedding_function=embedding_fn
+    )
+
+# Query-side ANN index; Chroma keeps the canonical copy of the chunks
+ann_index = AnnIndex(os.getenv("ANN_INDEX_PATH", "./codebase.usearch")) if AnnIndex.available else None
+# In-memory exact search for small collections when usearch isn't installed
+exact_index = None
+
+# Optional hot embedding worker reached over ZeroMQ instead of per-query HTTP
+embed_worker = None
+if os.getenv("EMBED_WORKER_ADDRESS"):
+    from embedding_worker import EmbeddingWorkerClient
+    embed_worker = EmbeddingWorkerClient(os.getenv("EMBED_WORKER_ADDRESS"))
+
+APP_DIR = "/app"
+# Digest of the indexed files and chunk count at the last index, so restarts can skip it
+INDEX_SENTINEL = "./.chroma_indexed"
+# Extensions of APP_DIR_GLOB, for fingerprinting the files it would load
+APP_DIR_GLOB = "**/*.{vue,ts,js,md,pdf}"
+INDEXED_EXTENSIONS = (".vue", ".ts", ".js", ".md", ".pdf")
 
 # Initialize agents
 debug_agent = DebugAgent()
@@ -29,23 +57,101 @@ security_agent = SecurityAgent()
 
 def index_documents():
     """Index documents from /app directory"""
-    loader = DirectoryLoader("/app", glob="**/*.{vue,ts,js,md,pdf}")
+    global exact_index
+    # Taken before loading, so edits made while indexing still trigger the next run
+    digest = _tree_digest()
+    loader = DirectoryLoader(APP_DIR, glob=APP_DIR_GLOB)
     docs = loader.load()
 
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200
-    )
-
-    chunks = text_splitter.split_documents(docs)
-
-    collection.add(
-        documents=[doc.page_content for doc in chunks],
-        metadatas=[doc.metadata for doc in chunks],
-        ids=[f"id_{i}" for i in range(len(chunks))]
-    )
-
-    print(f"Indexed {len(chunks)} chunks")
+    text_splitter = make_text_splitter(chunk_size=1000, chunk_overlap=200)
+
+    chunks, ids = split_documents_cached(text_splitter, docs)
+    documents = [doc.page_content for doc in chunks]
+    metadatas = [doc.metadata for doc in chunks]
+    stale = delete_stale_chunks(get_collection(), metadatas, ids)
+
+    # Ids are content hashes: only chunks Chroma doesn't have yet need embedding
+    stored = get_collection().get(ids=ids, include=["embeddings"]) if ids else {"ids": [], "embeddings": []}
+    embedding_by_id = dict(zip(stored["ids"], stored["embeddings"]))
+    new = [i for i, chunk_id in enumerate(ids) if chunk_id not in embedding_by_id]
+    if new:
+        # Embed concurrently and hand Chroma the vectors so it skips its own embedding pass
+        new_embeddings = embedding_fn.embed_concurrently([documents[i] for i in new])
+        add_in_batches(
+            get_collection(),
+            [documents[i] for i in new],
+            [metadatas[i] for i in new],
+            [ids[i] for i in new],
+            new_embeddings
+        )
+        embedding_by_id.update((ids[i], embedding) for i, embedding in zip(new, new_embeddings))
+
+    embeddings = [embedding_by_id[chunk_id] for chunk_id in ids]
+    if ann_index is not None:
+        ann_index.rebuild(documents, metadatas, embeddings)
+    elif len(chunks) < ExactIndex.MAX_SIZE:
+        exact_index = ExactIndex(documents, metadatas, embeddings)
+
+    _write_sentinel(digest, len(chunks))
+    print(f"Indexed {len(chunks)} chunks ({len(new)} new, {stale} stale removed)")
+
+def _tree_digest():
+    """Digest of (path, size, mtime_ns) for every file under APP_DIR that indexing loads"""
+    # A directory's own mtime misses edits to existing files and anything nested
+    entries = []
+    for root, dirs, files in os.walk(APP_DIR):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(INDEXED_EXTENSIONS):
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append(f"{path}\0{st.st_size}\0{st.st_mtime_ns}")
+    return hashlib.blake2b("\n".join(entries).encode("utf-8"), digest_size=16).hexdigest()
+
+def _read_sentinel():
+    """Chunk count from the last index if the files and the collection still match it, else None"""
+    try:
+        with open(INDEX_SENTINEL, "r") as f:
+            sentinel = json.load(f)
+        if sentinel["digest"] != _tree_digest():
+            return None
+        # A fresh or wiped Chroma volume next to a leftover sentinel still needs indexing
+        if get_collection().count() != sentinel["count"]:
+            return None
+        return sentinel["count"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def _write_sentinel(digest, count):
+    with open(INDEX_SENTINEL, "w") as f:
+        json.dump({"digest": digest, "count": count}, f)
+
+def _local_index():
+    """In-process index to query instead of Chroma, if one is loaded"""
+    if ann_index is not None and len(ann_index):
+        return ann_index
+    if exact_index is not None and len(exact_index):
+        return exact_index
+    return None
+
+def _load_exact_index():
+    """Pull a small existing collection into memory for exact search"""
+    global exact_index
+    records = get_collection().get(include=["documents", "metadatas", "embeddings"])
+    if records["ids"]:
+        exact_index = ExactIndex(records["documents"], records["metadatas"], records["embeddings"])
+
+async def embed_query(query):
+    """Embed one query through the worker if configured, else straight from Ollama"""
+    if embed_worker is not None:
+        try:
+            return await embed_worker.embed(query)
+        except (TimeoutError, RuntimeError) as e:
+            print(f"Embedding worker unavailable, falling back to Ollama: {e}")
+    return (await embedding_fn.aembed([query]))[0]
 
 @app.post("/query")
 async def query_documents(request: Request):
@@ -54,8 +160,17 @@ async def query_documents(request: Request):
     query = data.get("query", "")
     n_results = data.get("n_results", 5)
 
-    results = collection.query(
-        query_texts=[query],
+    # Embed on the event loop instead of letting Chroma block on a sync HTTP call
+    query_embedding = await embed_query(query)
+
+    index = _local_index()
+    if index is not None:
+        documents, metadatas = index.search(query_embedding, n_results)
+        return {"documents": documents, "metadatas": metadatas}
+
+    results = await asyncio.to_thread(
+        get_collection().query,
+        query_embeddings=[query_embedding],
         n_results=n_results
     )
 
@@ -70,26 +185,30 @@ async def health_check():
     return {"status": "healthy"}
 
 @app.get("/task-logs")
-def get_task_logs():
+async def get_task_logs():
     """Fetch task logs."""
     return {"logs": ["Task 1 completed", "Task 2 in progress"]}
 
 @app.get("/performance-metrics")
-def get_performance_metrics():
+async def get_performance_metrics():
     """Fetch performance metrics."""
     return {"metrics": {"CPU": "75%", "Memory": "60%"}}
 
 @app.get("/audit-results")
-def get_audit_results():
+async def get_audit_results():
     """Fetch audit results."""
     return {"results": ["Audit 1 passed", "Audit 2 failed"]}
 
 @app.on_event("startup")
 async def startup_event():
     """Run on startup"""
-    # Only index if collection is empty
-    if collection.count() == 0:
-        index_documents()
+    # Only (re)index if /app or the collection changed since the last index
+    count = await asyncio.to_thread(_read_sentinel)
+    if count is None:
+        # index_documents drives its own event loop, so keep it off the server's
+        await asyncio.to_thread(index_documents)
+    elif ann_index is None and count < ExactIndex.MAX_SIZE:
+        await asyncio.to_thread(_load_exact_index)
 
 def initialize_knowledge_hub():
     """Initialize Knowledge Hub on server startup"""
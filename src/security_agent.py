@@ -1,7 +1,18 @@
 import ast
+import io
+import os
+import re
+import json
+import shutil
 import subprocess
 import importlib
 
+# ijson is optional; without it the audit report is parsed whole
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 try:
     Continue = importlib.import_module("continue.api").Continue
 except ModuleNotFoundError:
@@ -10,14 +21,29 @@ except ModuleNotFoundError:
             raise RuntimeError("Continue package is not installed")
 
 class SecurityAgent:
+    SECRET_PATTERN = r"api[_-]?key|password|secret|token"
+    SECRET_GLOBS = ["*.{env,config,json}", ".env*", "!node_modules", "!.git"]
+
+    # Audit severities worth spending prompt tokens on
+    REPORTED_SEVERITIES = {"critical", "high"}
+
     COMPLIANCE_STANDARDS = {
         "GDPR": ["user_data", "consent_management"],
         "HIPAA": ["medical_data", "access_controls"],
         "PCI_DSS": ["payment_processing", "encryption"]
     }
 
-    def __init__(self):
+    def __init__(self, root="."):
         self.c = Continue()
+        self.root = root
+        self._secret_re = re.compile(self.SECRET_PATTERN, re.IGNORECASE)
+        # Built once; ripgrep's literal prefilter does the matching when it's installed
+        self._secret_scan_cmd = None
+        if shutil.which("rg"):
+            self._secret_scan_cmd = ["rg", "--files-with-matches", "--null", "--ignore-case",
+                                     "--hidden", "--no-ignore", "-e", self.SECRET_PATTERN]
+            for glob in self.SECRET_GLOBS:
+                self._secret_scan_cmd += ["--glob", glob]
         self.scanners = {
             "secret_detection": self.scan_for_secrets,
             "vulnerability": self.scan_vulnerabilities,
@@ -35,13 +61,11 @@ class SecurityAgent:
         return results
 
     async def scan_for_secrets(self):
-        secrets = []
-        for file in self._code_files():
-            if any(ext in file for ext in [".env", ".config", ".json"]):
-                with open(file, "r") as f:
-                    content = f.read()
-                    if "api_key" in content or "password" in content:
-                        secrets.append(file)
+        if self._secret_scan_cmd is not None:
+            result = subprocess.run(self._secret_scan_cmd + [self.root], capture_output=True)
+            secrets = [path for path in result.stdout.decode("utf-8", "replace").split("\0") if path]
+        else:
+            secrets = self._scan_for_secrets_python()
 
         report = await self.c.complete(
             f"Found potential secrets in {len(secrets)} files. "
@@ -49,13 +73,26 @@ class SecurityAgent:
         )
         return {"secrets_found": secrets, "report": report}
 
+    def _scan_for_secrets_python(self):
+        secrets = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in ("node_modules", ".git")]
+            for filename in filenames:
+                if not (filename.startswith(".env") or filename.endswith((".env", ".config", ".json"))):
+                    continue
+                path = os.path.join(dirpath, filename)
+                with open(path, "r", errors="replace") as f:
+                    if self._secret_re.search(f.read()):
+                        secrets.append(path)
+        return secrets
+
     async def scan_vulnerabilities(self):
         result = subprocess.run(["npm", "audit", "--json"], capture_output=True)
-        vulnerabilities = json.loads(result.stdout)
+        total, severe = self._parse_audit(result.stdout)
 
         prompt = f"""
-        Found {vulnerabilities['metadata']['vulnerabilities']['total']} vulnerabilities:
-        {json.dumps(vulnerabilities, indent=2)}
+        Found {total} vulnerabilities, {len(severe)} of them critical or high:
+        {json.dumps(severe, indent=2)}
 
         Create a prioritized remediation plan:
         1. Critical vulnerabilities
@@ -64,6 +101,23 @@ class SecurityAgent:
         """
         return await self.c.complete(prompt)
 
+    def _parse_audit(self, output):
+        """Return the total vulnerability count and the critical/high advisories by package"""
+        if ijson is None:
+            report = json.loads(output)
+            total = report["metadata"]["vulnerabilities"]["total"]
+            advisories = report.get("vulnerabilities", {}).items()
+        else:
+            # Two streaming passes: metadata comes after vulnerabilities in npm's output
+            total = next(ijson.items(io.BytesIO(output), "metadata.vulnerabilities.total", use_float=True), 0)
+            advisories = ijson.kvitems(io.BytesIO(output), "vulnerabilities", use_float=True)
+
+        severe = {
+            name: advisory for name, advisory in advisories
+            if advisory.get("severity") in self.REPORTED_SEVERITIES
+        }
+        return total, severe
+
     async def check_compliance(self, standard="GDPR"):
         checks = self.COMPLIANCE_STANDARDS[standard]
         report = []
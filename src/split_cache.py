@@ -0,0 +1,45 @@
+import os
+import pickle
+import hashlib
+
+# xxhash is optional; blake2b is the stdlib fallback
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+CHUNK_CACHE_DIR = "./chroma_db/chunks"
+
+
+def _content_hash(doc, splitter_name):
+    # The splitter is part of the key, so switching splitters doesn't reuse stale chunks
+    data = f"{splitter_name}\0{doc.metadata.get('source', '')}\0{doc.page_content}".encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh64(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def split_documents_cached(text_splitter, docs, cache_dir=CHUNK_CACHE_DIR):
+    """Split documents, reusing pickled chunks for unchanged ones; returns (chunks, ids)"""
+    os.makedirs(cache_dir, exist_ok=True)
+    chunks, ids = [], []
+    splitter_name = type(text_splitter).__name__
+
+    for doc in docs:
+        digest = _content_hash(doc, splitter_name)
+        cache_path = os.path.join(cache_dir, f"{digest}.pkl")
+        if os.path.exists(cache_path):
+            with open(cache_path, "rb") as f:
+                doc_chunks = pickle.load(f)
+        else:
+            doc_chunks = text_splitter.split_documents([doc])
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(doc_chunks, f)
+            os.replace(tmp_path, cache_path)
+
+        chunks.extend(doc_chunks)
+        # Content-derived ids, so unchanged chunks keep the same id across runs
+        ids.extend(f"{digest}_{i}" for i in range(len(doc_chunks)))
+
+    return chunks, ids
@@ -0,0 +1,51 @@
+import os
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.docstore.document import Document
+
+# semantic-text-splitter is optional; LangChain's recursive splitter is the fallback
+try:
+    from semantic_text_splitter import MarkdownSplitter, TextSplitter
+except ImportError:
+    TextSplitter = None
+
+# Hugging Face tokenizer to size chunks in tokens instead of characters, e.g. bert-base-uncased
+SPLITTER_TOKENIZER = os.getenv("SPLITTER_TOKENIZER")
+# Token capacity and overlap when SPLITTER_TOKENIZER is set; nomic-embed-text reads 512 tokens
+TOKEN_CHUNK_SIZE = 512
+TOKEN_CHUNK_OVERLAP = 64
+
+
+class FastTextSplitter:
+    """split_documents() over the Rust semantic-text-splitter, with Markdown split on its structure"""
+
+    def __init__(self, chunk_size=1000, chunk_overlap=200):
+        if SPLITTER_TOKENIZER:
+            from tokenizers import Tokenizer
+            tokenizer = Tokenizer.from_pretrained(SPLITTER_TOKENIZER)
+            self.text = TextSplitter.from_huggingface_tokenizer(
+                tokenizer, TOKEN_CHUNK_SIZE, overlap=TOKEN_CHUNK_OVERLAP
+            )
+            self.markdown = MarkdownSplitter.from_huggingface_tokenizer(
+                tokenizer, TOKEN_CHUNK_SIZE, overlap=TOKEN_CHUNK_OVERLAP
+            )
+        else:
+            self.text = TextSplitter(chunk_size, overlap=chunk_overlap)
+            self.markdown = MarkdownSplitter(chunk_size, overlap=chunk_overlap)
+
+    def split_documents(self, docs):
+        chunks = []
+        for doc in docs:
+            # Keeps code fences and headings intact in Markdown sources
+            splitter = self.markdown if str(doc.metadata.get("source", "")).endswith(".md") else self.text
+            chunks.extend(
+                Document(page_content=chunk, metadata=dict(doc.metadata))
+                for chunk in splitter.chunks(doc.page_content)
+            )
+        return chunks
+
+
+def make_text_splitter(chunk_size=1000, chunk_overlap=200):
+    """Rust-backed splitter when installed, else RecursiveCharacterTextSplitter with the same sizes"""
+    if TextSplitter is not None:
+        return FastTextSplitter(chunk_size, chunk_overlap)
+    return RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
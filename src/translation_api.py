@@ -1,23 +1,119 @@
-from flask import Flask, jsonify, request
-import json
+from flask import Flask, Response, jsonify, request
+import atexit
+import contextlib
+import fcntl
+import orjson
 import os
+import threading
+import time
 
 app = Flask(__name__)
 
 TRANSLATION_FILE = './translations/translations.json'
+# Updates since the last snapshot, one JSON object per line
+JOURNAL_FILE = './translations/translations.journal'
+# Seconds between folding the journal back into the snapshot
+COMPACT_INTERVAL = 60
+
+# flock target shared by every worker process around reads, appends and compaction
+LOCK_FILE = './translations/translations.lock'
+
+os.makedirs(os.path.dirname(TRANSLATION_FILE), exist_ok=True)
+TRANS = {}
+# Snapshot identity and journal offset TRANS reflects; gunicorn workers each hold a copy
+_snapshot_id = None
+_journal_offset = 0
+_journal = open(JOURNAL_FILE, 'ab')
+_lock_file = open(LOCK_FILE, 'ab')
+_lock = threading.Lock()
+
+@contextlib.contextmanager
+def _locked():
+    """Serialize against other threads and, through flock, other worker processes."""
+    with _lock:
+        fcntl.flock(_lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(_lock_file, fcntl.LOCK_UN)
+
+def _stat_id(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+def _refresh():
+    """Catch TRANS up with the files: reload after another worker's compaction, else replay new journal lines."""
+    global _snapshot_id, _journal_offset
+    snapshot_id = _stat_id(TRANSLATION_FILE)
+    journal_size = os.fstat(_journal.fileno()).st_size
+    if snapshot_id != _snapshot_id or journal_size < _journal_offset:
+        TRANS.clear()
+        if snapshot_id is not None:
+            with open(TRANSLATION_FILE, 'rb') as f:
+                TRANS.update(orjson.loads(f.read()))
+        _snapshot_id = snapshot_id
+        _journal_offset = 0
+
+    if journal_size > _journal_offset:
+        with open(JOURNAL_FILE, 'rb') as f:
+            f.seek(_journal_offset)
+            for line in f:
+                try:
+                    TRANS.update(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    # Torn final line from a crash mid-write
+                    break
+                _journal_offset += len(line)
+
+def _write_snapshot(translations):
+    """Atomically replace the snapshot file."""
+    global _snapshot_id, _journal_offset
+    tmp_file = f"{TRANSLATION_FILE}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(orjson.dumps(translations, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, TRANSLATION_FILE)
+    # Every journaled update is in the new snapshot, so the journal starts over
+    _journal.truncate(0)
+    _snapshot_id = _stat_id(TRANSLATION_FILE)
+    _journal_offset = 0
+
+def compact():
+    """Fold every worker's journaled updates into a new snapshot and empty the journal."""
+    with _locked():
+        _refresh()
+        if os.fstat(_journal.fileno()).st_size == 0:
+            return
+        _write_snapshot(TRANS)
+
+def _compact_every(interval):
+    while True:
+        time.sleep(interval)
+        compact()
+
+with _locked():
+    _refresh()
+threading.Thread(target=_compact_every, args=(COMPACT_INTERVAL,), daemon=True).start()
+atexit.register(compact)
+
+def _current_translations():
+    with _locked():
+        _refresh()
+        return orjson.dumps(TRANS)
 
 @app.route('/translations', methods=['GET'])
 def get_translations():
     """Fetch all translations."""
-    if os.path.exists(TRANSLATION_FILE):
-        with open(TRANSLATION_FILE, 'r', encoding='utf-8') as f:
-            translations = json.load(f)
-        return jsonify(translations)
-    return jsonify({}), 200
+    return Response(_current_translations(), mimetype='application/json')
 
 @app.route('/translations', methods=['POST'])
 def update_translation():
     """Update a translation key."""
+    global _journal_offset
     data = request.json
     key = data.get('key')
     value = data.get('value')
@@ -25,15 +121,13 @@ def update_translation():
     if not key or not value:
         return jsonify({'error': 'Key and value are required'}), 400
 
-    translations = {}
-    if os.path.exists(TRANSLATION_FILE):
-        with open(TRANSLATION_FILE, 'r', encoding='utf-8') as f:
-            translations = json.load(f)
-
-    translations[key] = value
-
-    with open(TRANSLATION_FILE, 'w', encoding='utf-8') as f:
-        json.dump(translations, f, indent=4, ensure_ascii=False)
+    with _locked():
+        _refresh()
+        TRANS[key] = value
+        _journal.write(orjson.dumps({key: value}) + b"\n")
+        _journal.flush()
+        # Caught up before the append, so the journal's end is exactly what TRANS holds
+        _journal_offset = _journal.tell()
 
     return jsonify({'message': 'Translation updated successfully'}), 200
 
@@ -44,20 +138,18 @@ def import_translations():
     if not file:
         return jsonify({'error': 'No file provided'}), 400
 
-    translations = json.load(file)
-    with open(TRANSLATION_FILE, 'w', encoding='utf-8') as f:
-        json.dump(translations, f, indent=4, ensure_ascii=False)
+    translations = orjson.loads(file.read())
+    with _locked():
+        TRANS.clear()
+        TRANS.update(translations)
+        _write_snapshot(TRANS)
 
     return jsonify({'message': 'Translations imported successfully'}), 200
 
 @app.route('/translations/export', methods=['GET'])
 def export_translations():
     """Export translations to a file."""
-    if os.path.exists(TRANSLATION_FILE):
-        with open(TRANSLATION_FILE, 'r', encoding='utf-8') as f:
-            translations = json.load(f)
-        return jsonify(translations)
-    return jsonify({}), 200
+    return Response(_current_translations(), mimetype='application/json')
 
 if __name__ == '__main__':
     app.run(debug=True)
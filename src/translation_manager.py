@@ -1,30 +1,124 @@
 import os
 import re
+import ast
 import json
+import mmap
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 
+# Hyperscan is optional; without it keys are matched with the stdlib re engine
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Matches _("key"); a key never contains a double quote
+KEY_PATTERN = rb'_\("([^"]*)"\)'
+# Length of the _(" prefix and ") suffix around a key in a match span
+KEY_PREFIX, KEY_SUFFIX = 3, 2
+# A whole _("key") call, to hold the AST to the same calls the pattern finds
+KEY_CALL = re.compile(KEY_PATTERN.decode('ascii'))
+
+# Parsed files remembered; each edit adds a new (path, mtime) entry, so the watcher needs a bound
+AST_CACHE_SIZE = 1024
+
+@functools.lru_cache(maxsize=AST_CACHE_SIZE)
+def _ast_keys(file_path: str, mtime_ns: int) -> tuple:
+    """Raw key text of every _("...") call, in source order; mtime_ns keys the cache."""
+    with open(file_path, 'rb') as f:
+        source = f.read().decode('utf-8')
+    tree = ast.parse(source, filename=file_path)
+
+    calls = [
+        (node, match) for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        and getattr(node.func, 'id', None) == '_'
+        and node.args
+        and isinstance(node.args[0], ast.Constant)
+        and isinstance(node.args[0].value, str)
+        # Same call shape as KEY_PATTERN, so a file's keys don't depend on which quotes it mixes
+        and (match := KEY_CALL.fullmatch(ast.get_source_segment(source, node) or ''))
+    ]
+    calls.sort(key=lambda call: (call[0].lineno, call[0].col_offset))
+    # The source text, not the decoded constant, so escapes compare equal to the regex keys
+    return tuple(match.group(1) for node, match in calls)
+
 class TranslationManager:
+    # Files scanned at once; both the scan and the reads release the GIL
+    MAX_SCAN_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
     def __init__(self, source_dir: str, output_file: str):
         self.source_dir = source_dir
         self.output_file = output_file
+        self._pattern = re.compile(KEY_PATTERN)
+        self._database = None
+        self._scratch = threading.local()
+        if hyperscan is not None:
+            self._database = hyperscan.Database()
+            self._database.compile(
+                expressions=[KEY_PATTERN],
+                ids=[0],
+                flags=[hyperscan.HS_FLAG_SOM_LEFTMOST]
+            )
 
     def extract_translation_keys(self) -> Dict[str, List[str]]:
         """Extract translation keys from Python files."""
+        # Empty files can't be mapped and hold no keys anyway
+        files = [(path, stat.st_mtime_ns) for path, stat in self._python_files(self.source_dir) if stat.st_size]
+
         keys = {}
-        pattern = re.compile(r'_\("(.*?)"\)')  # Matches _("key")
-
-        for root, _, files in os.walk(self.source_dir):
-            for file in files:
-                if file.endswith('.py'):
-                    file_path = os.path.join(root, file)
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        matches = pattern.findall(content)
-                        if matches:
-                            keys[file_path] = matches
+        with ThreadPoolExecutor(max_workers=self.MAX_SCAN_WORKERS) as executor:
+            for (file_path, _), matches in zip(files, executor.map(lambda file: self._scan_file(*file), files)):
+                if matches:
+                    keys[file_path] = matches
 
         return keys
 
+    def _python_files(self, directory: str):
+        """Yield (path, stat) for every .py file under directory, using scandir's cached stat."""
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._python_files(entry.path)
+                elif entry.name.endswith('.py') and entry.is_file():
+                    yield entry.path, entry.stat()
+
+    def _scan_file(self, file_path: str, mtime_ns: int) -> List[str]:
+        """Return the translation keys in one file, in source order."""
+        matches = self._match_keys(file_path)
+        if not matches:
+            return []
+
+        # The pattern scan only prefilters; the AST drops look-alikes such as _("a" + b)
+        try:
+            return list(_ast_keys(file_path, mtime_ns))
+        except (SyntaxError, ValueError):
+            # Not parseable by this interpreter; trust the pattern matches
+            return matches
+
+    def _match_keys(self, file_path: str) -> List[str]:
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as buf:
+                if self._database is None:
+                    return [match.decode('utf-8') for match in self._pattern.findall(buf)]
+                return self._hyperscan_keys(buf)
+
+    def _hyperscan_keys(self, buf) -> List[str]:
+        # Hyperscan has no capture groups, so the key is cut out of the match span
+        spans = []
+
+        def on_match(_id, start, end, _flags, _context):
+            spans.append((start, end))
+
+        # Scratch space can't be shared between concurrent scans
+        scratch = getattr(self._scratch, 'value', None)
+        if scratch is None:
+            scratch = self._scratch.value = hyperscan.Scratch(self._database)
+        self._database.scan(buf, match_event_handler=on_match, scratch=scratch)
+        return [buf[start + KEY_PREFIX:end - KEY_SUFFIX].decode('utf-8') for start, end in spans]
+
     def save_keys_to_file(self, keys: Dict[str, List[str]]):
         """Save extracted keys to a JSON file."""
         with open(self.output_file, 'w', encoding='utf-8') as f:
@@ -0,0 +1,107 @@
+import re
+import json
+import functools
+
+# Ends tagged output, so the model stops instead of padding the completion
+STOP_SEQUENCE = "<stop/>"
+TAG_PATTERN = re.compile(r"<(\w+)>(.*?)</\1>", re.DOTALL)
+# Outermost JSON object or array, for models that answer in JSON anyway
+JSON_PATTERN = re.compile(r"[\[{].*[\]}]", re.DOTALL)
+# Leading number of a value, so "0.9." or "90%" still read as scores
+NUMBER_PATTERN = re.compile(r"[-+]?\d*\.?\d+(%?)")
+
+
+@functools.lru_cache(maxsize=None)
+def _pair_pattern(keys):
+    """key=value pairs for the given keys; a value runs until the next known key or end of line"""
+    names = "|".join(re.escape(key) for key in keys)
+    return re.compile(rf"(?:^|\s)({names})=(.*?)(?=\s+(?:{names})=|$)", re.MULTILINE)
+
+
+def _convert(value, kind):
+    value = value.strip()
+    if kind is bool:
+        return value.lower() in ("true", "yes", "y", "1")
+    if kind is float:
+        match = NUMBER_PATTERN.match(value)
+        if match is None:
+            raise ValueError(f"not a number: {value!r}")
+        number = float(match.group(0).rstrip("%"))
+        return number / 100 if match.group(1) else number
+    if kind is list:
+        return [item.strip() for item in value.split(";") if item.strip()]
+    return value
+
+
+def _parse_fields(text, fields):
+    """Short-key output mapped onto full field names; only the keys that were present"""
+    tags = dict(TAG_PATTERN.findall(text))
+    # Tag bodies can hold code, so look for pairs only outside them
+    found = dict(_pair_pattern(tuple(fields)).findall(TAG_PATTERN.sub("", text)))
+    found.update(tags)
+    parsed = {}
+    for key, (name, kind) in fields.items():
+        if key in found:
+            # One malformed value only loses that field
+            try:
+                parsed[name] = _convert(found[key], kind)
+            except ValueError:
+                pass
+    return parsed
+
+
+def _parse_json(text):
+    match = JSON_PATTERN.search(text)
+    if match is None:
+        return None
+    try:
+        return json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+
+
+def parse_compact(text, fields):
+    """Parse `key=value` / `<key>...</key>` output; fields maps short key -> (field name, type)"""
+    if not isinstance(text, str):
+        return text
+
+    parsed = _parse_fields(text, fields)
+    if len(parsed) == len(fields):
+        return parsed
+
+    # Cheap parser came up short; accept JSON before settling for a partial result
+    fallback = _parse_json(text)
+    return fallback if isinstance(fallback, dict) else parsed
+
+
+def parse_compact_records(text, record_tag, fields):
+    """Parse repeated <record_tag>...</record_tag> blocks into a list of dicts"""
+    if not isinstance(text, str):
+        return text
+
+    records = [
+        _parse_fields(body, fields)
+        for tag, body in TAG_PATTERN.findall(text)
+        if tag == record_tag
+    ]
+    if records:
+        return records
+
+    fallback = _parse_json(text)
+    return fallback if isinstance(fallback, list) else []
+
+
+def parse_compact_groups(text, record_tag, fields):
+    """Parse <group>...records...</group> sections into {group: [records]}"""
+    if not isinstance(text, str):
+        return text
+
+    groups = {
+        group: parse_compact_records(body, record_tag, fields)
+        for group, body in TAG_PATTERN.findall(text)
+    }
+    if groups:
+        return groups
+
+    fallback = _parse_json(text)
+    return fallback if isinstance(fallback, dict) else {}
@@ -1,20 +1,55 @@
+import os
+import json
+import atexit
 import chromadb
-from chromadb.utils.embedding_functions import OllamaEmbeddingFunction
+import numpy as np
+from ollama_embeddings import get_embedding_function
+
+# usearch is optional; similarity search falls back to Chroma's own index
+try:
+    from usearch.index import Index, MetricKind, ScalarKind
+except ImportError:
+    Index = None
+
+FEEDBACK_INDEX_PATH = "./verification_db/feedback.usearch"
+# New records between index saves; the rest are written on flush/exit
+FEEDBACK_SAVE_EVERY = 64
+
+
+def _quantize(vector):
+    """Scale a vector into int8; cosine similarity ignores the per-vector scale"""
+    vector = np.asarray(vector, dtype=np.float32)
+    peak = np.abs(vector).max() or 1.0
+    return np.clip(np.rint(vector * (127 / peak)), -127, 127).astype(np.int8)
+
 
 class VerificationFeedback:
     def __init__(self):
         self.client = chromadb.PersistentClient(path="./verification_db")
-        self.embedding_fn = OllamaEmbeddingFunction(model="nomic-embed-text")
+        self.embedding_fn = get_embedding_function()
         self.collection = self.client.get_or_create_collection(
             "verification_feedback",
             embedding_function=self.embedding_fn
         )
+        # int8 search copy of the embeddings; position in feedback_ids is the usearch key
+        self.index = None
+        self.feedback_ids = []
+        if Index is not None and os.path.exists(FEEDBACK_INDEX_PATH):
+            self.index = Index.restore(FEEDBACK_INDEX_PATH)
+            with open(f"{FEEDBACK_INDEX_PATH}.ids.json", "r") as f:
+                self.feedback_ids = json.load(f)
+        self._indexed = set(self.feedback_ids)
+        self._unsaved = 0
+        atexit.register(self.flush)
 
     def record_verification(self, report):
         """Store verification results for learning"""
         feedback_id = f"feedback_{report['id']}"
+        document = json.dumps(report)
+        embedding = self.embedding_fn([document])[0]
         self.collection.add(
-            documents=[json.dumps(report)],
+            documents=[document],
+            embeddings=[embedding],
             ids=[feedback_id],
             metadatas={
                 "score": report["verification_score"],
@@ -22,9 +57,36 @@ class VerificationFeedback:
                 "timestamp": report["timestamp"]
             }
         )
+        if Index is not None and feedback_id not in self._indexed:
+            self._add_to_index(feedback_id, embedding)
+
+    def _add_to_index(self, feedback_id, embedding):
+        quantized = _quantize(embedding)
+        if self.index is None:
+            self.index = Index(ndim=len(quantized), metric=MetricKind.Cos, dtype=ScalarKind.I8)
+        self.index.add(len(self.feedback_ids), quantized)
+        self.feedback_ids.append(feedback_id)
+        self._indexed.add(feedback_id)
+
+        # Saving rewrites the whole index, so do it in batches rather than per record
+        self._unsaved += 1
+        if self._unsaved >= FEEDBACK_SAVE_EVERY:
+            self.flush()
+
+    def flush(self):
+        """Persist index additions not saved yet"""
+        if self.index is None or not self._unsaved:
+            return
+        self.index.save(FEEDBACK_INDEX_PATH)
+        with open(f"{FEEDBACK_INDEX_PATH}.ids.json", "w") as f:
+            json.dump(self.feedback_ids, f)
+        self._unsaved = 0
 
     def get_similar_feedback(self, requirements, n=3):
         """Find similar verification cases"""
+        if self.index is not None and len(self.index):
+            return self._search_index(requirements, n)
+
         results = self.collection.query(
             query_texts=[json.dumps(requirements)],
             n_results=n
@@ -34,6 +96,18 @@ class VerificationFeedback:
             for m, d in zip(results["metadatas"][0], results["documents"][0])
         ]
 
+    def _search_index(self, requirements, n):
+        query = _quantize(self.embedding_fn([json.dumps(requirements)])[0])
+        matches = self.index.search(query, n)
+        ids = [self.feedback_ids[int(key)] for key in matches.keys]
+
+        records = self.collection.get(ids=ids, include=["documents", "metadatas"])
+        by_id = dict(zip(records["ids"], zip(records["metadatas"], records["documents"])))
+        return [
+            {"metadata": by_id[i][0], "document": by_id[i][1]}
+            for i in ids if i in by_id
+        ]
+
     def improve_generation(self, requirements):
         """Use historical feedback to improve generation"""
         similar = self.get_similar_feedback(requirements)
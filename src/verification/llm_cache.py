@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import hashlib
+import inspect
+import threading
+import contextlib
+from collections import OrderedDict
+
+# diskcache is optional; set VERIFY_LLM_CACHE_DIR to keep completions across runs
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# Seconds a cached completion stays valid
+LLM_CACHE_TTL = int(os.getenv("VERIFY_LLM_CACHE_TTL", "3600"))
+LLM_CACHE_SIZE = 1024
+
+
+class LLMCache:
+    """Completion cache keyed by a SHA-256 of the model and every request field"""
+
+    def __init__(self, maxsize=LLM_CACHE_SIZE, ttl=LLM_CACHE_TTL, directory=os.getenv("VERIFY_LLM_CACHE_DIR")):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = diskcache.Cache(directory) if diskcache is not None and directory else None
+        self.stats = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(model, args, kwargs):
+        payload = {"model": model, "args": args, "kwargs": kwargs}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return True, entry[1]
+            self._entries.pop(key, None)
+
+        if self._disk is not None:
+            value = self._disk.get(key, default=self._disk)
+            if value is not self._disk:
+                self._remember(key, value)
+                with self._lock:
+                    self.stats["hits"] += 1
+                return True, value
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return False, None
+
+    def set(self, key, value):
+        self._remember(key, value)
+        if self._disk is not None:
+            self._disk.set(key, value, expire=self.ttl)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self._disk is not None:
+            self._disk.delete(key)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class CachedCompletions:
+    """Continue client wrapper that answers repeated completions from an LLMCache"""
+
+    def __init__(self, client, cache):
+        self.client = client
+        self.cache = cache
+        self._model = None
+
+    @contextlib.contextmanager
+    def switch_model(self, model):
+        previous, self._model = self._model, model
+        try:
+            with self.client.switch_model(model):
+                yield self
+        finally:
+            self._model = previous
+
+    async def complete(self, *args, **kwargs):
+        key = self.cache.key(self._model, args, kwargs)
+        hit, value = self.cache.get(key)
+        if hit:
+            return value
+
+        value = self.client.complete(*args, **kwargs)
+        # Works with both the async client and blocking ones
+        if inspect.isawaitable(value):
+            value = await value
+        self.cache.set(key, value)
+        return value
+
+    def forget(self, *args, **kwargs):
+        """Drop a cached completion, e.g. one whose answer couldn't be parsed"""
+        self.cache.delete(self.cache.key(self._model, args, kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+# One cache for every verifier in the process
+llm_cache = LLMCache()
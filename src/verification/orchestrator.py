@@ -2,17 +2,74 @@ from .static_analyzer import StaticVerifier
 from .runtime_validator import RuntimeValidator
 from .spec_matcher import SpecMatcher
 from .peer_review import PeerReviewer
+from .llm_cache import llm_cache
+import os
+import json
+import atexit
+import mmap
+import hashlib
 import time
+import asyncio
+import threading
+from collections import deque
 
 class VerificationPipeline:
-    def __init__(self):
+    # Below this spec score the code is failing anyway, so peer review and consensus are skipped
+    MIN_SPEC_SCORE_FOR_REVIEW = 0.3
+    VERIFIED_THRESHOLD = 0.85
+    # Smallest score gain between correction attempts that counts as progress
+    MIN_SCORE_GAIN = 0.01
+    # Phase weights of the verification score, in the order the phases run; phases that
+    # report "applicable": False drop out and the rest are renormalized
+    WEIGHTS = {
+        "static": 0.2,
+        "spec": 0.3,
+        "runtime": 0.3,
+        "peer": 0.15,
+        "consensus": 0.05
+    }
+
+    # Recent reports kept in memory; the full history lives in the JSONL log
+    HISTORY_SIZE = 256
+
+    def __init__(self, history_path="./verification_db/history.jsonl"):
         self.static = StaticVerifier()
         self.runtime = RuntimeValidator()
         self.spec = SpecMatcher()
         self.peer = PeerReviewer()
-        self.verification_history = []
+        self.verification_history = deque(maxlen=self.HISTORY_SIZE)
+        self.history_path = history_path
+        os.makedirs(os.path.dirname(history_path) or ".", exist_ok=True)
+        self._history_file = open(history_path, "a", encoding="utf-8")
+        self._history_lock = threading.Lock()
+        if self._history_file.tell() and not self._ends_with_newline(history_path):
+            # A crash left a torn last line; start on a fresh line so the next record stays readable
+            self._history_file.write("\n")
+            self._history_file.flush()
+        atexit.register(self.close)
+
+    @staticmethod
+    def _ends_with_newline(path):
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def close(self):
+        """Close the history log"""
+        with self._history_lock:
+            if not self._history_file.closed:
+                self._history_file.close()
+
+    @property
+    def stats(self):
+        """Hit/miss counts of the completion cache shared by all verifiers"""
+        return llm_cache.stats
 
     def verify(self, generated_code, requirements, context):
+        """Execute full verification pipeline from synchronous code"""
+        return asyncio.run(self.averify(generated_code, requirements, context))
+
+    async def averify(self, generated_code, requirements, context):
         """Execute full verification pipeline"""
         verification_id = f"verify_{int(time.time())}"
         report = {
@@ -23,67 +80,106 @@ class VerificationPipeline:
             "results": {}
         }
 
-        # Phase 1: Static verification
-        report["results"]["static"] = self.static.full_static_check(
+        static_task = asyncio.create_task(asyncio.to_thread(
+            self.static.full_static_check,
             generated_code,
             requirements
-        )
-
-        # Phase 2: Specification compliance
-        report["results"]["spec"] = self.spec.full_spec_check(
+        ))
+        spec_task = asyncio.create_task(self.spec.full_spec_check(
             generated_code,
             requirements,
             requirements.get("design_url")
-        )
+        ))
 
-        # Phase 3: Runtime validation
-        if report["results"]["static"]["valid"]:
-            report["results"]["runtime"] = self.runtime.validate_component(
+        # Phase 3: runtime validation starts as soon as static passes
+        async def runtime_after_static():
+            if not (await static_task)["valid"]:
+                return {"skipped": "Static validation failed"}
+            return await self.runtime.validate_component(
                 generated_code,
                 requirements
             )
-        else:
-            report["results"]["runtime"] = {"skipped": "Static validation failed"}
 
-        # Phase 4: Peer review
-        report["results"]["peer"] = self.peer.review_code(
-            generated_code,
-            requirements,
-            context
-        )
+        runtime_task = asyncio.create_task(runtime_after_static())
+        static, spec = await asyncio.gather(static_task, spec_task)
+        results = report["results"]
+        results.update({"static": static, "spec": spec})
 
-        # Phase 5: Multi-model consensus
-        report["results"]["consensus"] = self.peer.cross_model_verification(
-            generated_code,
-            requirements
-        )
+        # Phases run cheapest first; once even perfect scores on the rest can't reach the
+        # threshold, the remaining phases are skipped
+        pruned = {"skipped": "pruned by bound"}
+        if self._score(results) < self.VERIFIED_THRESHOLD:
+            runtime_task.cancel()
+            results.update({"runtime": pruned, "peer": pruned, "consensus": pruned})
+        else:
+            results["runtime"] = await runtime_task
 
-        # Calculate overall verification score
-        weights = {
-            "static": 0.2,
-            "spec": 0.3,
-            "runtime": 0.3,
-            "peer": 0.15,
-            "consensus": 0.05
-        }
+            # Phases 4 + 5: the model reviews are only worth paying for if the cheap checks didn't fail
+            if self._score(results) < self.VERIFIED_THRESHOLD:
+                results.update({"peer": pruned, "consensus": pruned})
+            elif spec["overall_score"] < self.MIN_SPEC_SCORE_FOR_REVIEW:
+                results.update({"peer": {"skipped": "Specification score too low"},
+                                "consensus": {"skipped": "Specification score too low"}})
+            else:
+                results["peer"], results["consensus"] = await asyncio.gather(
+                    self.peer.review_code(generated_code, requirements, context),
+                    self.peer.cross_model_verification(generated_code, requirements)
+                )
 
-        score = 0
-        for key, weight in weights.items():
-            if "score" in report["results"][key]:
-                score += report["results"][key]["score"] * weight
-            elif "confidence" in report["results"][key]:
-                score += report["results"][key]["confidence"] * weight
-            elif report["results"][key].get("passed", False):
-                score += weight
+        # Calculate overall verification score
+        score = self._score(results)
 
         report["verification_score"] = score
-        report["verified"] = score >= 0.85
+        report["verified"] = score >= self.VERIFIED_THRESHOLD
 
         # Store in history
-        self.verification_history.append(report)
+        self._record(report)
 
         return report
 
+    def _record(self, report):
+        line = json.dumps(report, default=str) + "\n"
+        with self._history_lock:
+            self.verification_history.append(report)
+            self._history_file.write(line)
+            self._history_file.flush()
+
+    def iter_history(self):
+        """Yield every logged report, oldest first, without loading the whole log"""
+        with open(self.history_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as mm:
+                for line in iter(mm.readline, b""):
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn line from a crash mid-write; later runs appended past it
+                        continue
+
+    @staticmethod
+    def _phase_score(result):
+        """Score of one phase result between 0 and 1; unreadable scores count as 0"""
+        for key in ("score", "confidence"):
+            if key in result:
+                try:
+                    return float(result[key])
+                except (TypeError, ValueError):
+                    return 0.0
+        return 1.0 if result.get("passed", False) else 0.0
+
+    def _score(self, results):
+        """Weighted verification score; phases not yet in results count as perfect"""
+        score = total_weight = 0.0
+        for key, weight in self.WEIGHTS.items():
+            result = results.get(key)
+            if result is not None and not result.get("applicable", True):
+                continue
+            score += weight * (1.0 if result is None else self._phase_score(result))
+            total_weight += weight
+        # A perfect result never scores below dropping the phase, so this stays an upper bound for pruning
+        return score / total_weight if total_weight else 0.0
+
     def generate_corrections(self, report):
         """Generate corrected code based on verification results"""
         if report["verified"]:
@@ -93,7 +189,7 @@ class VerificationPipeline:
         feedback = "\n".join([
             f"Static Analysis: {report['results']['static'].get('error', '')}",
             f"Spec Compliance: {report['results']['spec'].get('discrepancies', '')}",
-            f"Runtime Issues: {[t for t in report['results']['runtime']['test_cases'] if not t['passed']]}",
+            f"Runtime Issues: {[t for t in report['results']['runtime'].get('test_cases', []) if not t['passed']]}",
             f"Peer Review: {report['results']['peer'].get('issues', '')}"
         ])
 
@@ -113,25 +209,40 @@ class VerificationPipeline:
         """
         return self.c.complete(prompt, max_tokens=2000)
 
-    def iterative_correction(self, generated_code, requirements, context, max_attempts=3):
+    async def iterative_correction(self, generated_code, requirements, context, max_attempts=3):
         """Self-correcting verification loop"""
+        previous_digest = previous_score = None
+        attempts = 0
         for attempt in range(max_attempts):
-            report = self.verify(generated_code, requirements, context)
+            # Corrections that come back unchanged would only reproduce the last report
+            digest = hashlib.blake2b(generated_code.encode("utf-8"), digest_size=16).digest()
+            if digest == previous_digest:
+                break
+            previous_digest = digest
+
+            report = await self.averify(generated_code, requirements, context)
+            attempts = attempt + 1
             if report["verified"]:
                 return {
                     "code": generated_code,
                     "verified": True,
-                    "attempts": attempt + 1,
+                    "attempts": attempts,
                     "report": report
                 }
 
+            # Stop once a correction round no longer moves the score
+            score = report["verification_score"]
+            if previous_score is not None and score - previous_score < self.MIN_SCORE_GAIN:
+                break
+            previous_score = score
+
             # Generate corrections
-            generated_code = self.generate_corrections(report)
+            generated_code = await asyncio.to_thread(self.generate_corrections, report)
 
         return {
             "code": generated_code,
             "verified": False,
-            "attempts": max_attempts,
+            "attempts": attempts,
             "report": report
         }
 
@@ -1,4 +1,9 @@
+import os
+import json
+import asyncio
 import importlib
+from .llm_cache import CachedCompletions, llm_cache
+from .compact_output import STOP_SEQUENCE, parse_compact
 
 try:
     Continue = importlib.import_module("continue.api").Continue
@@ -7,7 +12,15 @@ except ModuleNotFoundError:
         async def complete(self, *args, **kwargs):
             raise RuntimeError("Continue package is not installed")
 
+# Per requirement type consensus model lists, cheapest first, e.g. {"form": ["llama3.1:8b", "phind-coder:34b"]}
+MODEL_ROUTES_PATH = "./verification_db/model_routes.json"
+
 class PeerReviewer:
+    # Cheapest first: the first model screens the candidate before the larger models are asked
+    CONSENSUS_MODELS = ["deepseek-coder:6.7b", "llama3.1:8b", "phind-coder:34b"]
+    # Share of yes votes needed for consensus
+    CONSENSUS_THRESHOLD = 0.7
+
     REVIEW_SYSTEM_PROMPT = """
     You are a senior code reviewer specialized in Vue and TypeScript.
     Your task is to verify AI-generated code for:
@@ -18,14 +31,57 @@ class PeerReviewer:
     Provide detailed feedback and corrections when needed.
     """
 
+    # Static instructions travel with the system prompt so every review shares one cacheable prefix
+    REVIEW_GUIDELINES = """
+    [REVIEW GUIDELINES]
+    1. Check for hallucinations (incorrect APIs, imaginary methods)
+    2. Verify requirement implementation
+    3. Identify outdated patterns
+    4. Suggest improvements
+    5. Provide corrected code if needed
+
+    Answer in exactly this format:
+    OUT: v=<true|false> conf=<0-1> issues=<issue; issue>
+    <fix>corrected code, empty if none</fix><stop/>
+    """
+
+    # Short output keys -> report fields
+    REVIEW_FIELDS = {
+        "v": ("verified", bool),
+        "conf": ("confidence", float),
+        "issues": ("issues", list),
+        "fix": ("corrections", str)
+    }
+
     def __init__(self):
-        self.c = Continue()
         self.review_model = "deepseek-coder:6.7b"  # Conservative model
+        self.review_system_prompt = self.REVIEW_SYSTEM_PROMPT + self.REVIEW_GUIDELINES
+        self.model_routes = {}
+        if os.path.exists(MODEL_ROUTES_PATH):
+            with open(MODEL_ROUTES_PATH, "r") as f:
+                self.model_routes = self._valid_routes(json.load(f))
+
+    @staticmethod
+    def _valid_routes(routes):
+        """Keep only routes that map a requirement type to a non-empty list of model names"""
+        if not isinstance(routes, dict):
+            print(f"Ignoring {MODEL_ROUTES_PATH}: expected an object of model lists")
+            return {}
+        valid = {}
+        for requirement_type, models in routes.items():
+            if isinstance(models, list) and models and all(isinstance(m, str) and m for m in models):
+                valid[requirement_type] = models
+            else:
+                print(f"Ignoring model route {requirement_type!r}: expected a non-empty list of model names")
+        return valid
 
-    def review_code(self, generated_code, requirements, context):
+    async def review_code(self, generated_code, requirements, context):
         """Conduct AI peer review"""
-        with self.c.switch_model(self.review_model):
-            return self.c.complete(
+        # Only the per-review material is left in the prompt, after the shared prefix
+        # switch_model mutates the client, and reviews run concurrently from several threads
+        client = CachedCompletions(Continue(), llm_cache)
+        with client.switch_model(self.review_model):
+            result = await client.complete(
                 prompt=f"""
                 [REVIEW TASK]
                 Verify this AI-generated code against requirements:
@@ -38,43 +94,36 @@ class PeerReviewer:
 
                 Generated Code:
                 {generated_code}
-
-                [REVIEW GUIDELINES]
-                1. Check for hallucinations (incorrect APIs, imaginary methods)
-                2. Verify requirement implementation
-                3. Identify outdated patterns
-                4. Suggest improvements
-                5. Provide corrected code if needed
-
-                Return JSON:
-                {{
-                    "verified": bool,
-                    "issues": [str],
-                    "corrections": str,
-                    "confidence": 0-1
-                }}
                 """,
-                system_prompt=self.REVIEW_SYSTEM_PROMPT,
-                format="json"
+                system_prompt=self.review_system_prompt,
+                stop=[STOP_SEQUENCE]
             )
+        return parse_compact(result, self.REVIEW_FIELDS)
 
-    def cross_model_verification(self, generated_code, requirements):
+    async def cross_model_verification(self, generated_code, requirements):
         """Verify with multiple models"""
-        models = ["deepseek-coder:6.7b", "llama3.1:8b", "phind-coder:34b"]
-        results = []
+        requirement_type = requirements.get("type") if isinstance(requirements, dict) else None
+        models = self.model_routes.get(requirement_type, self.CONSENSUS_MODELS)
 
-        for model in models:
-            with self.c.switch_model(model):
-                result = self.c.complete(
+        async def vote(model):
+            # switch_model mutates the client, so each concurrent vote gets its own
+            client = CachedCompletions(Continue(), llm_cache)
+            with client.switch_model(model):
+                result = await client.complete(
                     f"Does this code correctly implement: {requirements}?\nCode: {generated_code}\nAnswer:",
                     max_tokens=1
                 )
-                results.append("yes" in result.lower())
+            return "yes" in result.lower()
+
+        # The cheap model votes first; a "no" decides it when the rest voting yes couldn't pass
+        results = [await vote(models[0])]
+        if results[0] or (len(models) - 1) / len(models) >= self.CONSENSUS_THRESHOLD:
+            results += await asyncio.gather(*(vote(model) for model in models[1:]))
 
-        # Consensus-based verification
-        confidence = sum(results) / len(results)
+        # Consensus-based verification; models that weren't asked count as not voting yes
+        confidence = sum(results) / len(models)
         return {
-            "verified": confidence >= 0.7,
+            "verified": confidence >= self.CONSENSUS_THRESHOLD,
             "confidence": confidence,
-            "votes": results
+            "votes": results + [None] * (len(models) - len(results))
         }
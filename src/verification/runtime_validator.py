@@ -1,11 +1,51 @@
+import os
+import json
+import hashlib
 import subprocess
 import time
-from pathlib import Path
+import math
+import string
+import asyncio
+import atexit
+import threading
+import contextlib
+import importlib
+import orjson
+from collections import OrderedDict
+from .llm_cache import CachedCompletions, llm_cache
+from .compact_output import STOP_SEQUENCE, parse_compact_groups
+
+try:
+    Continue = importlib.import_module("continue.api").Continue
+except ModuleNotFoundError:
+    class Continue:
+        async def complete(self, *args, **kwargs):
+            raise RuntimeError("Continue package is not installed")
 
 class RuntimeValidator:
+    # Generated test suites remembered per requirements
+    TEST_CASE_CACHE_SIZE = 256
+    # Output tags of one generated test case
+    TEST_CASE_FIELDS = {
+        "name": ("name", str),
+        "test": ("test", str),
+        "expected": ("expected", str)
+    }
+
     def __init__(self, work_dir="."):
         self.work_dir = work_dir
-        self.test_harness = """
+        self.c = CachedCompletions(Continue(), llm_cache)
+        # Playwright objects belong to the loop that started them, so one long-lived loop thread
+        # owns the browser and every caller's loop hands its sandbox runs to it
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._launch_task = None
+        self._playwright = None
+        # Requirements don't change across correction attempts, so neither do their tests
+        self._test_cases = OrderedDict()
+        # Shared by every thread verifying against this pipeline; never held across an await
+        self._test_cases_lock = threading.Lock()
+        self.test_harness = string.Template("""
         <!DOCTYPE html>
         <html>
         <head>
@@ -14,72 +54,208 @@ class RuntimeValidator:
         <body>
             <div id="app"></div>
             <script>
-                // {component_code}
-                const app = Vue.createApp({{ template: `<div>TEST ENV</div>` }});
+                // $component_code
+                const app = Vue.createApp({ template: `<div>TEST ENV</div>` });
                 app.component('TestComponent', TestComponent);
                 app.mount('#app');
             </script>
         </body>
         </html>
-        """
+        """)
+
+    def _browser_loop(self):
+        """The loop thread that owns Playwright, started on first use"""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="playwright", daemon=True).start()
+                self._loop = loop
+                atexit.register(self._shutdown)
+            return self._loop
+
+    async def _on_browser_loop(self, coro):
+        """Run coro on the browser loop and await its result from the caller's loop"""
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self._browser_loop()))
+
+    async def _browser(self):
+        """Chromium, launched once on first use; runs on the browser loop"""
+        # Store the launch task itself so concurrent first callers share one browser
+        launch = self._launch_task
+        if launch is not None and launch.done() and (launch.cancelled() or launch.exception() is not None):
+            # A failed launch would otherwise fail every later run
+            launch = None
+        if launch is None:
+            launch = self._launch_task = asyncio.ensure_future(self._launch())
+        # Shielded, so a pruned run being cancelled doesn't cancel the launch every run shares
+        return await asyncio.shield(launch)
+
+    async def _launch(self):
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch()
+
+    async def _close(self):
+        launch, self._launch_task = self._launch_task, None
+        if launch is not None:
+            with contextlib.suppress(Exception):
+                await (await launch).close()
+        if self._playwright is not None:
+            playwright, self._playwright = self._playwright, None
+            await playwright.stop()
+
+    async def close(self):
+        """Close the browser, if one was launched"""
+        if self._loop is not None:
+            await self._on_browser_loop(self._close())
 
-    def execute_in_sandbox(self, code, test_cases):
+    def _shutdown(self):
+        # Exit-time close, so the Playwright driver and Chromium don't outlive the process
+        loop = self._loop
+        with contextlib.suppress(Exception):
+            asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout=10)
+        loop.call_soon_threadsafe(loop.stop)
+
+    async def execute_in_sandbox(self, code, test_cases):
         """Run code in isolated environment"""
-        # Create test harness
-        harness = self.test_harness.format(component_code=code)
-        with open(Path(self.work_dir) / "test_harness.html", "w") as f:
-            f.write(harness)
+        return await self._on_browser_loop(self._execute_in_sandbox(code, test_cases))
 
-        # Execute with Playwright
-        from playwright.sync_api import sync_playwright
+    async def _execute_in_sandbox(self, code, test_cases):
+        harness = self.test_harness.substitute(component_code=code)
+        results = [None] * len(test_cases)
+        if not test_cases:
+            return results
 
-        results = []
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page()
-            page.goto(f"file://{Path(self.work_dir).absolute()}/test_harness.html")
+        browser = await self._browser()
+        # Test cases are independent; each worker context runs its share on its own page
+        workers = min(os.cpu_count() or 1, len(test_cases))
+        contexts = await asyncio.gather(*(browser.new_context() for _ in range(workers)))
 
-            for case in test_cases:
+        async def run_cases(context, indices):
+            page = await context.new_page()
+            await page.set_content(harness)
+            for i in indices:
+                case = test_cases[i]
                 try:
                     # Execute test case
-                    result = page.evaluate(case["test"])
-                    results.append({
+                    result = await page.evaluate(case["test"])
+                    expected = case.get("expected_canonical")
+                    if expected is None:
+                        expected = self._canonical_expected(case.get("expected"))
+                    results[i] = {
                         "test": case["name"],
-                        "passed": result == case["expected"],
+                        "passed": self._result_matches(result, expected),
                         "result": result
-                    })
+                    }
                 except Exception as e:
-                    results.append({
+                    results[i] = {
                         "test": case["name"],
                         "passed": False,
                         "error": str(e)
-                    })
+                    }
 
-            browser.close()
+        try:
+            await asyncio.gather(*(
+                run_cases(context, range(k, len(test_cases), workers))
+                for k, context in enumerate(contexts)
+            ))
+        finally:
+            await asyncio.gather(*(context.close() for context in contexts))
 
         return results
 
-    def generate_test_cases(self, requirements):
+    @staticmethod
+    def _canonical_expected(expected):
+        """Comparison form of an expected value: a float for numbers, sorted-key JSON bytes otherwise"""
+        # Tagged output carries text, so "3" or "[1, 2]" should compare as the values they spell
+        if isinstance(expected, str):
+            try:
+                expected = orjson.loads(expected)
+            except orjson.JSONDecodeError:
+                pass
+        if isinstance(expected, (int, float)) and not isinstance(expected, bool):
+            return float(expected)
+        return orjson.dumps(expected, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+
+    @staticmethod
+    def _result_matches(result, expected_canonical):
+        if isinstance(expected_canonical, float):
+            # Numbers cross the page boundary as JS doubles; allow float drift
+            return (isinstance(result, (int, float)) and not isinstance(result, bool)
+                    and math.isclose(result, expected_canonical, rel_tol=1e-6))
+        return orjson.dumps(result, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) == expected_canonical
+
+    @staticmethod
+    def _requirements_key(requirements):
+        payload = json.dumps(requirements, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    async def generate_test_cases(self, requirements):
         """AI-generated test cases from requirements"""
-        prompt = f"""
-        Generate test cases for a Vue component with these requirements:
-        {requirements}
-
-        Return as JSON array:
-        [
-          {{
-            "name": "Test case description",
-            "test": "JavaScript test code",
-            "expected": "Expected result"
-          }}
+        return (await self.generate_test_cases_batch([requirements]))[0]
+
+    async def generate_test_cases_batch(self, requirements_list):
+        """Test cases for several requirement sets from one completion, in input order"""
+        keys = [self._requirements_key(requirements) for requirements in requirements_list]
+        pending = {}
+        suites = {}
+        with self._test_cases_lock:
+            for key, requirements in zip(keys, requirements_list):
+                if key in self._test_cases:
+                    self._test_cases.move_to_end(key)
+                    suites[key] = self._test_cases[key]
+                else:
+                    pending.setdefault(key, requirements)
+
+        if pending:
+            # Tags must start with a letter, so requirement ids are r0, r1, ...
+            ids = {f"r{i}": key for i, key in enumerate(pending)}
+            listing = "\n".join(f"[{req_id}] {pending[key]}" for req_id, key in ids.items())
+            prompt = f"""
+            Generate test cases for Vue components with these requirements:
+            {listing}
+
+            Answer with one section per requirement id, each holding one block per test case, then <stop/>:
+            <r0><case><name>description</name><test>JavaScript test code</test><expected>result</expected></case></r0>
+            """
+            result = await self.c.complete(prompt, stop=[STOP_SEQUENCE])
+            groups = parse_compact_groups(result, "case", self.TEST_CASE_FIELDS)
+            if not isinstance(groups, dict):
+                groups = {}
+            if any(not self._valid_cases(groups.get(req_id)) for req_id in ids):
+                # Don't let the completion cache replay an answer we couldn't use
+                self.c.forget(prompt, stop=[STOP_SEQUENCE])
+            for req_id, key in ids.items():
+                cases = self._valid_cases(groups.get(req_id))
+                # Canonicalize once per suite rather than once per run
+                for case in cases:
+                    case["expected_canonical"] = self._canonical_expected(case.get("expected"))
+                suites[key] = cases
+            with self._test_cases_lock:
+                # Malformed or failed output stays uncached so the next run asks again
+                self._test_cases.update((key, suites[key]) for key in ids.values() if suites[key])
+                while len(self._test_cases) > self.TEST_CASE_CACHE_SIZE:
+                    self._test_cases.popitem(last=False)
+
+        return [suites[key] for key in keys]
+
+    @staticmethod
+    def _valid_cases(cases):
+        """Only the cases that are dicts with a name and test code"""
+        if not isinstance(cases, list):
+            return []
+        return [
+            case for case in cases
+            if isinstance(case, dict) and isinstance(case.get("name"), str) and isinstance(case.get("test"), str)
         ]
-        """
-        return self.c.complete(prompt, format="json")
 
-    def validate_component(self, code, requirements):
+    async def validate_component(self, code, requirements):
         """Full runtime validation"""
-        test_cases = self.generate_test_cases(requirements)
-        results = self.execute_in_sandbox(code, test_cases)
+        test_cases = await self.generate_test_cases(requirements)
+        if not test_cases:
+            # Nothing to run says nothing about the code; leave runtime out of the score
+            return {"skipped": "No test cases generated", "applicable": False, "test_cases": []}
+        results = await self.execute_in_sandbox(code, test_cases)
 
         passed = all(t["passed"] for t in results)
         return {
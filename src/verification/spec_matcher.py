@@ -1,5 +1,16 @@
+import asyncio
 import difflib
+import hashlib
+import functools
 import importlib
+import threading
+from collections import OrderedDict
+
+# rapidfuzz is optional; difflib gives close to the same ratio in pure Python
+try:
+    from rapidfuzz.distance import Indel
+except ImportError:
+    Indel = None
 
 try:
     Continue = importlib.import_module("continue.api").Continue
@@ -8,21 +19,55 @@ except ModuleNotFoundError:
         async def complete(self, *args, **kwargs):
             raise RuntimeError("Continue package is not installed")
 from knowledge_manager import KnowledgeHub
+from .llm_cache import CachedCompletions, llm_cache
+from .compact_output import parse_compact
 
 class SpecMatcher:
+    # Design specs and design comparisons remembered per matcher
+    DESIGN_CACHE_SIZE = 256
+    # Short output keys -> report fields
+    COVERAGE_FIELDS = {
+        "covered": ("covered", list),
+        "missing": ("missing", list),
+        "score": ("score", float)
+    }
+    DESIGN_FIELDS = {
+        "match": ("matches", bool),
+        "diff": ("discrepancies", list),
+        "sim": ("similarity_score", float)
+    }
+
     def __init__(self):
-        self.c = Continue()
+        self.c = CachedCompletions(Continue(), llm_cache)
         self.knowledge = KnowledgeHub()
+        self._design_spec = functools.lru_cache(maxsize=self.DESIGN_CACHE_SIZE)(self._load_design_spec)
+        self._design_matches = OrderedDict()
+        # git_agent verifies files from several threads against one pipeline
+        self._design_lock = threading.Lock()
+
+    def _load_design_spec(self, design_url):
+        return self.knowledge.query_design(design_url)
+
+    def invalidate(self, design_url):
+        """Forget cached specs and comparisons after a design changes"""
+        self._design_spec.cache_clear()
+        with self._design_lock:
+            for key in [key for key in self._design_matches if key[0] == design_url]:
+                del self._design_matches[key]
 
     def structural_similarity(self, generated, reference):
         """Compare code structure"""
         gen_lines = generated.splitlines()
         ref_lines = reference.splitlines()
 
+        if Indel is not None:
+            # 2 * LCS / total lines, like SequenceMatcher.ratio but computed in C
+            return Indel.normalized_similarity(gen_lines, ref_lines)
+
         sm = difflib.SequenceMatcher(None, gen_lines, ref_lines)
         return sm.ratio()
 
-    def requirement_coverage(self, generated, requirements):
+    async def requirement_coverage(self, generated, requirements):
         """Check requirement coverage"""
         prompt = f"""
         Verify if this code meets all requirements:
@@ -33,18 +78,27 @@ class SpecMatcher:
         Code:
         {generated}
 
-        Return JSON:
-        {{
-            "covered": ["requirement1", "requirement2"],
-            "missing": ["requirement3"],
-            "score": 0.85
-        }}
+        Answer with one line:
+        OUT: covered=<req; req> missing=<req; req> score=<0-1>
         """
-        return self.c.complete(prompt, format="json")
+        return parse_compact(await self.c.complete(prompt), self.COVERAGE_FIELDS)
 
-    def check_against_design(self, generated, design_url):
+    async def check_against_design(self, generated, design_url):
         """Compare with design specification"""
-        design_spec = self.knowledge.query_design(design_url)
+        key = (design_url, hashlib.blake2b(generated.encode("utf-8"), digest_size=16).hexdigest())
+        with self._design_lock:
+            if key in self._design_matches:
+                self._design_matches.move_to_end(key)
+                return self._design_matches[key]
+
+        result = await self._compare_with_design(generated, self._design_spec(design_url))
+        with self._design_lock:
+            self._design_matches[key] = result
+            if len(self._design_matches) > self.DESIGN_CACHE_SIZE:
+                self._design_matches.popitem(last=False)
+        return result
+
+    async def _compare_with_design(self, generated, design_spec):
         prompt = f"""
         Compare this Vue component code with its design specification:
 
@@ -54,25 +108,33 @@ class SpecMatcher:
         Generated Code:
         {generated}
 
-        Identify discrepancies and return JSON:
-        {{
-            "matches": true/false,
-            "discrepancies": ["Element X missing", "Color mismatch"],
-            "similarity_score": 0.92
-        }}
+        Identify discrepancies and answer with one line:
+        OUT: match=<true|false> diff=<discrepancy; discrepancy> sim=<0-1>
         """
-        return self.c.complete(prompt, format="json")
+        return parse_compact(await self.c.complete(prompt), self.DESIGN_FIELDS)
+
+    @staticmethod
+    def _score_of(result, key):
+        try:
+            return float(result.get(key, 0.0)) if isinstance(result, dict) else 0.0
+        except (TypeError, ValueError):
+            return 0.0
 
-    def full_spec_check(self, generated, requirements, design_url=None):
+    async def full_spec_check(self, generated, requirements, design_url=None):
         """Comprehensive specification check"""
+        coverage, design_match = await asyncio.gather(
+            self.requirement_coverage(generated, requirements),
+            self.check_against_design(generated, design_url) if design_url else asyncio.sleep(0)
+        )
         report = {
-            "requirement_coverage": self.requirement_coverage(generated, requirements),
-            "design_match": self.check_against_design(generated, design_url) if design_url else None
+            "requirement_coverage": coverage,
+            "design_match": design_match
         }
 
         # Calculate overall score
-        req_score = report["requirement_coverage"]["score"]
-        design_score = report["design_match"]["similarity_score"] if design_url else 1.0
+        # A score the parser couldn't read counts as a failed check rather than crashing the pipeline
+        req_score = self._score_of(coverage, "score")
+        design_score = self._score_of(design_match, "similarity_score") if design_url else 1.0
         report["overall_score"] = (req_score + design_score) / (2 if design_url else 1)
 
         report["passed"] = report["overall_score"] >= 0.85
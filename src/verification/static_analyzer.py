@@ -1,8 +1,15 @@
+import io
+import os
 import ast
-import astunparse
+import shutil
+import tempfile
+import threading
+import functools
 import subprocess
 import importlib
+from concurrent.futures import ThreadPoolExecutor
 from security_agent import SecurityAgent
+from .llm_cache import CachedCompletions, llm_cache
 
 try:
     Continue = importlib.import_module("continue.api").Continue
@@ -11,32 +18,80 @@ except ModuleNotFoundError:
         async def complete(self, *args, **kwargs):
             raise RuntimeError("Continue package is not installed")
 
+# In-process pylint avoids paying its import cost on every lint
+try:
+    from pylint.lint import Run as PylintRun
+    from pylint.reporters.text import TextReporter
+except ImportError:
+    PylintRun = None
+
+# pylint keeps global state, so in-process runs can't overlap
+_PYLINT_LOCK = threading.Lock()
+# Scratch files for linters that can't read stdin
+SCRATCH_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+# pyahocorasick is optional; without it each pattern is a separate substring search
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+@functools.lru_cache(maxsize=64)
+def _pattern_automaton(patterns):
+    """Aho-Corasick automaton over a requirements pattern set, built once per set"""
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+@functools.lru_cache(maxsize=128)
+def _syntax_error(source):
+    """None if source parses, else (message, line); returning the error lets retries hit the cache"""
+    try:
+        ast.parse(source)
+    except SyntaxError as e:
+        return str(e), e.lineno
+    return None
+
 class StaticVerifier:
     def __init__(self):
-        self.c = Continue()
+        self.c = CachedCompletions(Continue(), llm_cache)
         self.security = SecurityAgent()
+        # eslint_d keeps a warm eslint server between calls
+        self.eslint = shutil.which("eslint_d") or "eslint"
 
     def verify_syntax(self, code, language="vue"):
         """Check for syntax errors"""
-        try:
-            if language == "vue":
-                # Extract script content
-                script_start = code.find("<script>") + 8
-                script_end = code.find("</script>")
-                script_content = code[script_start:script_end]
-                ast.parse(script_content)
-            elif language == "python":
-                ast.parse(code)
+        if language == "vue":
+            # Extract script content
+            _, _, script_content = code.partition("<script>")
+            if "</script>" in script_content:
+                script_content = script_content.rpartition("</script>")[0]
+            error = _syntax_error(script_content)
+        elif language == "python":
+            error = _syntax_error(code)
+        else:
+            error = None
+
+        if error is None:
             return True
-        except SyntaxError as e:
-            return {
-                "valid": False,
-                "error": f"Syntax error: {str(e)}",
-                "line": e.lineno
-            }
+        message, line = error
+        return {
+            "valid": False,
+            "error": f"Syntax error: {message}",
+            "line": line
+        }
 
     def verify_patterns(self, code, patterns):
         """Check for required patterns"""
+        # The empty string is in every text and can't be added to an automaton
+        patterns = tuple(pattern for pattern in patterns if pattern)
+        if ahocorasick is not None and patterns:
+            # One pass over the code finds every pattern at once
+            found = {pattern for _, pattern in _pattern_automaton(patterns).iter(code)}
+            return [pattern for pattern in patterns if pattern not in found]
+
         missing = []
         for pattern in patterns:
             if pattern not in code:
@@ -49,33 +104,46 @@ class StaticVerifier:
 
     def lint_code(self, code, language="vue"):
         """Run language-specific linter"""
-        temp_file = f"temp_verify.{language}"
-        with open(temp_file, "w") as f:
-            f.write(code)
-
         if language == "vue":
-            result = subprocess.run(
-                ["eslint", temp_file],
-                capture_output=True,
-                text=True
-            )
+            # Source goes over stdin; the filename only selects eslint's .vue config
+            command = [self.eslint, "--stdin", "--stdin-filename", "verify.vue"]
+        elif language == "python" and PylintRun is not None:
+            return self._pylint_in_process(code)
         elif language == "python":
-            result = subprocess.run(
-                ["pylint", temp_file],
-                capture_output=True,
-                text=True
-            )
+            command = ["pylint", "--from-stdin", "verify.py"]
+        else:
+            return None
 
+        result = subprocess.run(command, input=code, capture_output=True, text=True)
         return result.stdout if result.returncode != 0 else None
 
+    def _pylint_in_process(self, code):
+        # In-process pylint needs a real path; keep it in RAM where tmpfs is available
+        with tempfile.NamedTemporaryFile("w", suffix=".py", dir=SCRATCH_DIR, delete=False) as f:
+            f.write(code)
+            temp_file = f.name
+
+        output = io.StringIO()
+        try:
+            with _PYLINT_LOCK:
+                run = PylintRun([temp_file], reporter=TextReporter(output), exit=False)
+        finally:
+            os.unlink(temp_file)
+        return output.getvalue() if run.linter.msg_status != 0 else None
+
     def full_static_check(self, code, requirements):
         """Comprehensive static verification"""
-        report = {
-            "syntax": self.verify_syntax(code, requirements.get("language", "vue")),
-            "patterns": self.verify_patterns(code, requirements.get("patterns", [])),
-            "security": self.verify_security(code),
-            "linting": self.lint_code(code, requirements.get("language", "vue"))
-        }
+        language = requirements.get("language", "vue")
+
+        # The checks are independent; the linter and security scan mostly wait on I/O
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            checks = {
+                "syntax": executor.submit(self.verify_syntax, code, language),
+                "patterns": executor.submit(self.verify_patterns, code, requirements.get("patterns", [])),
+                "security": executor.submit(self.verify_security, code),
+                "linting": executor.submit(self.lint_code, code, language)
+            }
+            report = {name: check.result() for name, check in checks.items()}
 
         report["valid"] = (
             report["syntax"] is True and
@@ -83,5 +151,7 @@ class StaticVerifier:
             report["security"]["issues"] == 0 and
             report["linting"] is None
         )
+        # Read by the pipeline's weighted score
+        report["passed"] = report["valid"]
 
         return report